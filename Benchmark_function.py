@@ -0,0 +1,716 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+This is the benchmark function to measure the speed of the package functions.
+Every benchmark can be started on its own by passing its name, e.g.:
+
+    python Benchmark_function.py touchstone
+
+Without argument, all benchmarks are executed.
+"""
+
+import sys
+import time
+
+import numpy as np
+import network_manipulations as netman
+
+path_ntwk = 'Examples/Touchstone/'
+
+
+'''
+    This function measures the mean runtime of a function call.
+
+    Input Parameters:
+        func: function to measure (called without arguments)
+        repeat: number of repetitions
+
+    Output Parameters:
+        runtime: mean runtime in seconds
+'''
+def timeit(func, repeat=5):
+
+    func() # warm-up
+    start = time.perf_counter()
+    for cnt in range(repeat):
+        func()
+
+    return (time.perf_counter() - start) / repeat
+
+
+
+'''
+    Benchmark: native Touchstone reader vs. rf.Network + extract_Sparam
+'''
+def bench_touchstone():
+
+    import skrf as rf
+
+    filename = path_ntwk + 'exam_1.s4p'
+
+    t_skrf = timeit(lambda: netman.extract_Sparam(rf.Network(filename)))
+    t_native = timeit(lambda: netman.read_touchstone(filename))
+
+    print('### Touchstone reader (exam_1.s4p) ###')
+    print(f'rf.Network + extract_Sparam: {1e3*t_skrf:8.1f} ms')
+    print(f'read_touchstone:             {1e3*t_native:8.1f} ms')
+    print(f'speedup:                     {t_skrf/t_native:8.1f} x\n')
+
+
+
+'''
+    Benchmark: binary sidecar cache (miss = parse + write, hit = memory-map)
+'''
+def bench_cache():
+
+    import tempfile
+
+    filenames = [path_ntwk + name for name in ['exam_1.s4p', 'exam_2.s4p', 'exam_3.s4p', 'exam_4.s2p']]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = netman.TouchstoneCache(cache_dir)
+        for repeat in range(10):
+            for filename in filenames:
+                netman.load_touchstone_cached(filename, cache)
+
+        stats = cache.stats
+        print('### Touchstone cache (4 files, 10 passes) ###')
+        print(f"misses: {stats['misses']:4d}   mean load time: {1e3*stats['time_miss']/stats['misses']:8.2f} ms")
+        print(f"hits:   {stats['hits']:4d}   mean load time: {1e3*stats['time_hit']/stats['hits']:8.2f} ms")
+        print(f"cache size: {cache.size()/2**20:.1f} MiB\n")
+
+
+
+'''
+    Benchmark: batch NMSE vs. per-pair calc_Sparam_NMSE loop
+'''
+def bench_nmse(K=50):
+
+    import contextlib
+    import io
+    import skrf as rf
+
+    golden = rf.Network(path_ntwk + 'exam_1.s4p')
+    rng = np.random.default_rng(0)
+    noise = 1e-2 * (rng.standard_normal((K,) + golden.s.shape) + 1j*rng.standard_normal((K,) + golden.s.shape))
+    SStack = golden.s + noise
+    ntwks = [rf.Network(frequency=golden.frequency, s=s) for s in SStack]
+
+    def loop_golden():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return [netman.calc_Sparam_NMSE(ntwk, golden) for ntwk in ntwks]
+
+    def loop_pairwise():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return [[netman.calc_Sparam_NMSE(ntwk_i, ntwk_j) for ntwk_j in ntwks] for ntwk_i in ntwks]
+
+    t_loop = timeit(loop_golden, repeat=3)
+    t_batch = timeit(lambda: netman.calc_Sparam_NMSE_batch(SStack, golden.s), repeat=3)
+    t_loop_pair = timeit(loop_pairwise, repeat=1)
+    t_batch_pair = timeit(lambda: netman.calc_Sparam_NMSE_batch(SStack, golden.s, pairwise=True), repeat=3)
+
+    print(f'### NMSE of {K} networks (4-port, 4001 pnt) ###')
+    print(f'vs. golden - loop:  {1e3*t_loop:8.1f} ms   batch: {1e3*t_batch:8.1f} ms   speedup: {t_loop/t_batch:6.1f} x')
+    print(f'pairwise   - loop:  {1e3*t_loop_pair:8.1f} ms   batch: {1e3*t_batch_pair:8.1f} ms   speedup: {t_loop_pair/t_batch_pair:6.1f} x\n')
+
+
+
+'''
+    Benchmark: array-backed MixedModeParameter vs. the former list-based
+    storage (16 lists of Python complex objects)
+'''
+def bench_mixedmode():
+
+    import tracemalloc
+
+    [NumPorts, fLen, f, SParams] = netman.read_touchstone(path_ntwk + 'exam_1.s4p')
+    args = []
+    for name in netman.MixedModeParameter._legacy_order:
+        args += [SParams.s[:, 0, 0].real.tolist(), SParams.s[:, 0, 0].imag.tolist()]
+
+    def legacy():
+        return [[complex(r, i) for r, i in zip(args[2*idx], args[2*idx + 1])] for idx in range(16)]
+
+    def current():
+        return netman.MixedModeParameter(f, *args)
+
+    results = []
+    for func in (legacy, current):
+        tracemalloc.start()
+        obj = func()
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del obj
+        results.append([timeit(func, repeat=3), memory])
+
+    t_array = timeit(lambda: netman.MixedModeParameter.from_array(f, SParams.s))
+
+    print(f'### MixedModeParameter ({fLen} pnt) ###')
+    print(f'list-based (32 vectors):  {1e3*results[0][0]:8.2f} ms  {results[0][1]/2**20:8.2f} MiB')
+    print(f'array-based (32 vectors): {1e3*results[1][0]:8.2f} ms  {results[1][1]/2**20:8.2f} MiB')
+    print(f'from_array (no copy):     {1e3*t_array:8.4f} ms\n')
+
+
+
+'''
+    Benchmark: parallel directory loading vs. serial rf.Network loop
+'''
+def bench_bulk(copies=8, workers=4):
+
+    import os
+    import shutil
+    import tempfile
+    import skrf as rf
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for cnt in range(copies):
+            for name in ['exam_1.s4p', 'exam_2.s4p', 'exam_3.s4p', 'exam_4.s2p', 'exam_5.s4p']:
+                shutil.copy(path_ntwk + name, os.path.join(tmp_dir, f"{cnt}_{name}"))
+        filenames = netman.find_touchstone_files(tmp_dir)
+        valid = [filename for filename in filenames if not filename.endswith('exam_5.s4p')]
+
+        t_serial = timeit(lambda: [rf.Network(filename) for filename in valid], repeat=1)
+        with tempfile.TemporaryDirectory() as out_dir:
+            t_bulk = timeit(lambda: netman.load_touchstone_dir(tmp_dir, workers=workers, out_dir=out_dir), repeat=1)
+            [SParamSets, failed] = netman.load_touchstone_dir(tmp_dir, workers=workers, out_dir=out_dir)
+
+    print(f'### Directory loading ({len(filenames)} files, {workers} workers) ###')
+    print(f'serial rf.Network:   {1e3*t_serial:8.1f} ms')
+    print(f'load_touchstone_dir: {1e3*t_bulk:8.1f} ms   ({len(SParamSets)} loaded, {len(failed)} failed)')
+    print(f'speedup:             {t_serial/t_bulk:8.1f} x\n')
+
+
+
+'''
+    Benchmark: bulk oscilloscope csv reader vs. the former line-by-line
+    reader (lists of Python floats) on a generated file
+'''
+def bench_osci(rows=10_000_000):
+
+    import os
+    import tempfile
+    import tracemalloc
+
+    def legacy(filename, header_num):
+        data = []
+        time = []
+        yval = []
+        with open(filename, 'r') as file:
+            for cnt in range(header_num):
+                file.readline()
+            for line in file:
+                data.append([float(x) for x in line.split(',')])
+        for cnt in range(len(data)):
+            time.append(data[cnt][0])
+            yval.append(data[cnt][1])
+        return [time, yval]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filename = os.path.join(tmp_dir, 'osci.csv')
+        time_vec = np.linspace(-6e-5, 6e-5, rows)
+        with open(filename, 'w') as file:
+            file.write('s,CH1[V]\n')
+            np.savetxt(file, np.column_stack([time_vec, np.sin(1e6*time_vec)]), fmt='%.4E', delimiter=',')
+
+        t_legacy = timeit(lambda: legacy(filename, 1), repeat=1)
+        t_fast = timeit(lambda: netman.read_csv_traces(filename), repeat=1)
+        tracemalloc.start()
+        netman.read_csv_traces(filename)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    print(f'### Oscilloscope csv ({rows} rows) ###')
+    print(f'line-by-line (lists): {t_legacy:8.2f} s   result ~{rows*2*(24+8)/2**20:8.1f} MiB (+ row lists)')
+    print(f'read_csv_traces:      {t_fast:8.2f} s   peak   {peak/2**20:8.1f} MiB')
+    print(f'speedup:              {t_legacy/t_fast:8.1f} x\n')
+
+
+
+'''
+    Benchmark: batch plotting (one reused Agg figure) vs. plot_Sparam with
+    how='subplot' for every network
+'''
+def bench_plot(K=5):
+
+    import os
+    import tempfile
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    [NumPorts, fLen, f, SParams] = netman.read_touchstone(path_ntwk + 'exam_1.s4p')
+    rng = np.random.default_rng(0)
+    SParams_list = [netman.SParameterSet(f, SParams.s * (1 + 0.01*rng.standard_normal())) for cnt in range(K)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        savenames = [os.path.join(tmp_dir, f"dut_{cnt}.png") for cnt in range(K)]
+
+        def legacy():
+            for SP, savename in zip(SParams_list, savenames):
+                netman.plot_Sparam(f, SP, NumPorts, how='subplot', spacing='log', valuetype='dB',
+                                   save='on', savename=savename)
+                plt.close('all')
+
+        t_legacy = timeit(legacy, repeat=1)
+        size_legacy = np.mean([os.path.getsize(name) for name in savenames])
+        t_batch_600 = timeit(lambda: netman.plot_Sparam_batch(f, SParams_list, NumPorts, savenames,
+                                                              spacing='log', valuetype='dB', dpi=600), repeat=1)
+        t_batch = timeit(lambda: netman.plot_Sparam_batch(f, SParams_list, NumPorts, savenames,
+                                                          spacing='log', valuetype='dB', dpi=100), repeat=1)
+        size_batch = np.mean([os.path.getsize(name) for name in savenames])
+        t_batch_shared = timeit(lambda: netman.plot_Sparam_batch(f, SParams_list, NumPorts, savenames,
+                                                                 spacing='log', valuetype='dB', dpi=100,
+                                                                 shared_ylim=True), repeat=1)
+
+    print(f'### Subplot figures ({K} networks, 4-port, 4001 pnt) ###')
+    print(f'plot_Sparam (dpi=600):       {K/t_legacy:6.2f} figures/s   {size_legacy/2**20:5.2f} MiB/figure')
+    print(f'plot_Sparam_batch (dpi=600): {K/t_batch_600:6.2f} figures/s')
+    print(f'plot_Sparam_batch (dpi=100): {K/t_batch:6.2f} figures/s   {size_batch/2**20:5.2f} MiB/figure')
+    print(f'shared_ylim (dpi=100):       {K/t_batch_shared:6.2f} figures/s\n')
+
+
+
+'''
+    Benchmark: min/max decimation of long traces before drawing
+'''
+def bench_decimate(points=2_000_000):
+
+    import os
+    import tempfile
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    f = np.geomspace(1e5, 1e10, points)
+    s = (0.5 + 0.4*np.sin(f/1e7) + 1e-3*np.random.default_rng(0).standard_normal(points)).reshape(-1, 1, 1)
+    SParams = netman.SParameterSet(f, s.astype(complex))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results = []
+        for decimate in (None, 'auto'):
+            savename = os.path.join(tmp_dir, f"decimate_{decimate}.svg")
+            def plot():
+                netman.plot_Sparam(f, SParams, 1, how='allinone', spacing='log', valuetype='dB',
+                                   save='on', savename=savename, decimate=decimate)
+                plt.close('all')
+            results.append([timeit(plot, repeat=1), os.path.getsize(savename)])
+
+    print(f'### Decimation ({points} pnt, log-x, svg) ###')
+    print(f'no decimation:   {results[0][0]:8.2f} s   {results[0][1]/2**20:8.2f} MiB')
+    print(f"decimate='auto': {results[1][0]:8.2f} s   {results[1][1]/2**20:8.2f} MiB")
+    print(f'speedup:         {results[0][0]/results[1][0]:8.1f} x\n')
+
+
+
+'''
+    Benchmark: cached grid interpolation vs. rf.Network.interpolate
+'''
+def bench_interp(K=20):
+
+    import skrf as rf
+
+    ntwk = rf.Network(path_ntwk + 'exam_1.s4p')
+    ntwk.renumber([0, 1, 2, 3], [0, 2, 1, 3])
+    f_new = netman.read_touchstone(path_ntwk + 'exam_3.s4p')[2]
+    frequency = rf.Frequency.from_f(f_new, unit='hz')
+    SParams = netman.SParameterSet(ntwk.f, ntwk.s)
+
+    t_skrf = timeit(lambda: [ntwk.interpolate(frequency, kind='linear') for cnt in range(K)], repeat=1)
+    t_native = timeit(lambda: [netman.interp_Sparam(SParams, f_new) for cnt in range(K)], repeat=3)
+
+    print(f'### Interpolation onto the golden grid ({K} x 4-port, 4001 -> {len(f_new)} pnt) ###')
+    print(f'rf.Network.interpolate: {1e3*t_skrf/K:8.2f} ms/network')
+    print(f'interp_Sparam (cached): {1e3*t_native/K:8.2f} ms/network')
+    print(f'speedup:                {t_skrf/t_native:8.1f} x\n')
+
+
+
+'''
+    Benchmark: batch impedance calculation vs. calc_imp_* + dict merging.
+    The formulas of the single DUTs are already vectorized over the
+    frequency, so expect about 1x for complex128 (the complex division and
+    the singularity check dominate); the batch saves the temporaries and the
+    dict merging, with np.complex64 the half memory traffic gives about 1.5x.
+'''
+def bench_impedance(K=500):
+
+    [NumPorts, fLen, f, SParams] = netman.read_touchstone(path_ntwk + 'exam_4.s2p')
+    rng = np.random.default_rng(0)
+    SStack = SParams.s * (1 + 0.01*rng.standard_normal((K, 1, 1, 1)))
+
+    def legacy():
+        impedance = {}
+        for cnt in range(K):
+            impedance = {**impedance, **netman.calc_imp_seriesthru(f, SStack[cnt, :, 1, 0], f"imp_{cnt}")}
+        return impedance
+
+    out = np.empty((K, fLen), dtype=np.complex128)
+    t_legacy = timeit(legacy, repeat=3)
+    t_batch = timeit(lambda: netman.calc_imp_batch(SStack, 'seriesthru'), repeat=3)
+    t_out = timeit(lambda: netman.calc_imp_batch(SStack, 'seriesthru', out=out), repeat=3)
+    t_32 = timeit(lambda: netman.calc_imp_batch(SStack, 'seriesthru', dtype=np.complex64), repeat=3)
+
+    print(f'### Series-thru impedance of {K} DUTs ({fLen} pnt) ###')
+    print(f'calc_imp_seriesthru + dict: {1e3*t_legacy:8.1f} ms')
+    print(f'calc_imp_batch:             {1e3*t_batch:8.1f} ms   speedup: {t_legacy/t_batch:6.1f} x')
+    print(f'calc_imp_batch (out=):      {1e3*t_out:8.1f} ms   speedup: {t_legacy/t_out:6.1f} x')
+    print(f'calc_imp_batch (complex64): {1e3*t_32:8.1f} ms   speedup: {t_legacy/t_32:6.1f} x\n')
+
+
+
+'''
+    Benchmark: batch RLC fit on synthetic capacitor curves with known values
+'''
+def bench_fitting(K=10_000, fLen=401):
+
+    rng = np.random.default_rng(0)
+    f = np.geomspace(1e5, 1e10, fLen)
+    ESR = rng.uniform(1e-3, 0.1, K)
+    ESL = rng.uniform(0.2e-9, 2e-9, K)
+    C = 10**rng.uniform(-9, -6, K)
+    Z = netman.eval_series_RLC(f, ESR, ESL, C)
+    Z *= 1 + 0.01 * (rng.standard_normal(Z.shape) + 1j*rng.standard_normal(Z.shape))
+
+    t_fit = timeit(lambda: netman.fit_capacitor(f, Z), repeat=3)
+    [C_fit, ESR_fit, ESL_fit, SRF_fit] = netman.fit_capacitor(f, Z)
+
+    print(f'### Capacitor fit ({K} parts, {fLen} pnt, 1 % noise) ###')
+    print(f'fit_capacitor: {1e3*t_fit:8.1f} ms   {K/t_fit:10.0f} parts/s')
+    for name, fit, true in (('C', C_fit, C), ('ESR', ESR_fit, ESR), ('ESL', ESL_fit, ESL)):
+        print(f'{name:4s} median rel. error: {np.median(np.abs(fit/true - 1)):8.2e}')
+    print()
+
+
+
+'''
+    Benchmark: vector fitting model (storage size, evaluation speed, NMSE)
+    vs. the raw Touchstone data
+'''
+def bench_vectorfit(NumPoles=40):
+
+    import os
+    import tempfile
+
+    filename = path_ntwk + 'exam_1.s4p'
+    [NumPorts, fLen, f, SParams] = netman.read_touchstone(filename)
+
+    t_fit = timeit(lambda: netman.vector_fit(SParams, NumPoles, calc_NMSE=False), repeat=1)
+    model = netman.vector_fit(SParams, NumPoles)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        savename = os.path.join(tmp_dir, 'model.npz')
+        netman.save_model(model, savename)
+        size_model = os.path.getsize(savename)
+        t_load = timeit(lambda: netman.eval_model(netman.load_model(savename), f))
+
+    t_read = timeit(lambda: netman.read_touchstone(filename))
+    t_eval = timeit(lambda: netman.eval_model(model, f))
+
+    print(f'### Vector fitting (exam_1.s4p, {NumPoles} poles) ###')
+    print(f"fit: {t_fit:6.2f} s   NMSE reflect: {10*np.log10(model['NMSERef']):6.1f} dB   transm.: {10*np.log10(model['NMSETrans']):6.1f} dB")
+    print(f'.s4p file:   {os.path.getsize(filename)/2**10:10.1f} KiB   read_touchstone:   {1e3*t_read:8.2f} ms')
+    print(f'model (.npz):{size_model/2**10:10.1f} KiB   load + eval_model: {1e3*t_load:8.2f} ms   eval_model only: {1e3*t_eval:8.2f} ms\n')
+
+
+
+'''
+    Benchmark: batched cascading / de-embedding vs. a loop over frequency
+    and rf.network.connect
+'''
+def bench_network_ops():
+
+    import skrf as rf
+
+    ports = (1, 3) # thru paths 1 -> 2 and 3 -> 4
+    [NumPorts, fLen, f, SParams] = netman.read_touchstone(path_ntwk + 'exam_1.s4p')
+    ntwk = rf.Network(path_ntwk + 'exam_1.s4p')
+    ntwk.renumber([0, 1, 2, 3], [0, 2, 1, 3])
+
+    def loop():
+        s = SParams.s[:, [0, 2, 1, 3]][:, :, [0, 2, 1, 3]]
+        result = np.empty(s.shape, dtype=complex)
+        for cnt in range(fLen):
+            T = netman.s2t(s[cnt:cnt+1])
+            result[cnt] = netman.t2s(T @ T)[0]
+        return result
+
+    t_loop = timeit(loop, repeat=1)
+    t_skrf = timeit(lambda: rf.network.connect(ntwk, 2, ntwk, 0, num=2), repeat=3)
+    t_cascade = timeit(lambda: netman.cascade(SParams, SParams, ports=ports))
+    t_deembed = timeit(lambda: netman.deembed(SParams, SParams, SParams, ports=ports))
+    t_z = timeit(lambda: netman.s2z(SParams))
+
+    print(f'### Cascading / de-embedding (4-port, {fLen} pnt) ###')
+    print(f'loop over frequency:  {fLen/t_loop:12.0f} pnt/s')
+    print(f'rf.network.connect:   {fLen/t_skrf:12.0f} pnt/s')
+    print(f'cascade:              {fLen/t_cascade:12.0f} pnt/s')
+    print(f'deembed (both sides): {fLen/t_deembed:12.0f} pnt/s')
+    print(f's2z:                  {fLen/t_z:12.0f} pnt/s\n')
+
+
+
+'''
+    Benchmark: QA checks of one file and of a directory
+'''
+def bench_qa(copies=8, workers=4):
+
+    import os
+    import shutil
+    import tempfile
+
+    [NumPorts, fLen, f, SParams] = netman.read_touchstone(path_ntwk + 'exam_1.s4p')
+
+    t_pass = timeit(lambda: netman.check_passivity(SParams))
+    t_recip = timeit(lambda: netman.check_reciprocity(SParams))
+    t_causal = timeit(lambda: netman.check_causality(SParams))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for cnt in range(copies):
+            for name in ['exam_1.s4p', 'exam_2.s4p', 'exam_3.s4p', 'exam_4.s2p']:
+                shutil.copy(path_ntwk + name, os.path.join(tmp_dir, f"{cnt}_{name}"))
+        t_dir = timeit(lambda: netman.qa_directory(tmp_dir, workers=workers), repeat=1)
+        [results, failed] = netman.qa_directory(tmp_dir, workers=workers)
+
+    print(f'### QA checks (exam_1.s4p, {fLen} pnt) ###')
+    print(f'passivity:   {1e3*t_pass:8.2f} ms')
+    print(f'reciprocity: {1e3*t_recip:8.2f} ms')
+    print(f'causality:   {1e3*t_causal:8.2f} ms')
+    print(f'qa_directory ({len(results)} files, {workers} workers): {t_dir:6.2f} s   {len(results)/t_dir:6.1f} files/s\n')
+
+
+
+'''
+    Benchmark: time-domain transform of all N^2 parameters in one FFT call
+    vs. one transform per parameter
+'''
+def bench_timedomain():
+
+    [NumPorts, fLen, f, SParams] = netman.read_touchstone(path_ntwk + 'exam_1.s4p')
+
+    def per_key():
+        return [netman.time_response(netman.SParameterSet(f, SParams[key][:, np.newaxis, np.newaxis]), 'step')
+                for key in SParams]
+
+    t_key = timeit(per_key, repeat=1)
+    t_stack = timeit(lambda: netman.time_response(SParams, 'step'), repeat=3)
+    t_tdr = timeit(lambda: netman.tdr_impedance(SParams, t_stop=20e-9), repeat=3)
+    [time, h] = netman.time_response(SParams, 'step')
+
+    print(f'### Step responses (exam_1.s4p, {len(time)} time points) ###')
+    print(f'per parameter:  {1e3*t_key:8.1f} ms')
+    print(f'stacked:        {1e3*t_stack:8.1f} ms   speedup: {t_key/t_stack:6.1f} x')
+    print(f'tdr_impedance:  {1e3*t_tdr:8.1f} ms\n')
+
+
+
+'''
+    Benchmark: one mixed-mode parameter on demand (MixedModeAccessor) vs. the
+    full mixed-mode transform
+'''
+def bench_mm_accessor():
+
+    [NumPorts, fLen, f, SParams] = netman.read_touchstone(path_ntwk + 'exam_1.s4p')
+    s = np.tile(SParams.s, (1, 4, 4))
+    SBig = netman.SParameterSet(f, s)
+
+    t_full = timeit(lambda: netman.S_to_MM_nport(SBig)['Sdd21'], repeat=3)
+    t_lazy = timeit(lambda: netman.MixedModeAccessor(SBig)['Sdd21'], repeat=3)
+
+    print(f'### Sdd21 of a {s.shape[1]}-port ({fLen} pnt) ###')
+    print(f'full transform: {1e3*t_full:8.2f} ms')
+    print(f'on demand:      {1e3*t_lazy:8.2f} ms   speedup: {t_full/t_lazy:6.1f} x\n')
+
+
+
+'''
+    Benchmark: cold-start import time (python -X importtime in a fresh
+    interpreter) of the package and of the first use of the numeric and the
+    plot functions
+'''
+def bench_importtime():
+
+    import subprocess
+
+    cases = {'import network_manipulations': 'import network_manipulations',
+             'numeric (read + qa)': 'import network_manipulations as n; n.read_touchstone_array; n.qa_Sparam',
+             'plot functions': 'import network_manipulations as n; n.plot_impedance'}
+    heavy = ('matplotlib', 'skrf')
+
+    print('### Cold-start import time ###')
+    for [name, code] in cases.items():
+        code += '; import sys; print(*[m for m in ' + repr(heavy) + ' if m in sys.modules])'
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                                capture_output=True, text=True, check=True)
+        # lines: "import time: self [us] | cumulative | imported package"
+        total = 0
+        for line in result.stderr.splitlines():
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].strip() and not fields[2].startswith('  ') and fields[1].strip().isdigit():
+                total += int(fields[1])
+        loaded = result.stdout.strip() or '-'
+        print(f'{name:30s} {1e-3*total:8.1f} ms   heavy modules: {loaded}')
+    print()
+
+
+
+'''
+    Benchmark: headless report (S-parameter, comparison and impedance page of
+    every DUT) of a lot of DUTs, rendered in a process pool
+'''
+def bench_report():
+
+    import os
+    import shutil
+    import tempfile
+
+    workers = os.cpu_count() or 1
+    NumDUTs = 4 * workers
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for cnt in range(NumDUTs):
+            shutil.copy(path_ntwk + 'exam_1.s4p', os.path.join(tmp_dir, f'dut_{cnt}.s4p'))
+
+        print(f'### Report ({NumDUTs} DUTs, {workers} workers) ###')
+        for fmt in netman.report.REPORT_FORMATS:
+            output = os.path.join(tmp_dir, 'report.' + fmt)
+            [NumPages, pages_per_second, failed] = netman.build_report(
+                tmp_dir, output, golden=path_ntwk + 'exam_1.s4p', imp_method='seriesthru',
+                workers=workers, recursive=False)
+            size = os.path.getsize(output) if fmt == 'pdf' else sum(
+                os.path.getsize(os.path.join(output[:-5] + '_files', name))
+                for name in os.listdir(output[:-5] + '_files'))
+            print(f'{fmt:5s} {NumPages:4d} pages   {pages_per_second:6.2f} pages/s   {size/2**20:7.1f} MiB')
+    print()
+
+
+
+'''
+    Benchmark: watch-folder mode, first pass over an archive vs. a pass with
+    one new file
+'''
+def bench_watcher():
+
+    import os
+    import shutil
+    import tempfile
+
+    NumFiles = 40
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for cnt in range(NumFiles):
+            shutil.copy(path_ntwk + 'exam_1.s4p', os.path.join(tmp_dir, f'dut_{cnt}.s4p'))
+        watcher = netman.FolderWatcher(tmp_dir, reference=path_ntwk + 'exam_2.s4p', settle=0)
+
+        start = time.perf_counter()
+        watcher.scan()
+        t_full = time.perf_counter() - start
+
+        shutil.copy(path_ntwk + 'exam_2.s4p', os.path.join(tmp_dir, 'dut_new.s4p'))
+        start = time.perf_counter()
+        watcher.scan()
+        t_new = time.perf_counter() - start
+
+        start = time.perf_counter()
+        watcher.scan()
+        t_none = time.perf_counter() - start
+
+    print(f'### Watch folder ({NumFiles} files) ###')
+    print(f'first pass:     {1e3*t_full:8.1f} ms')
+    print(f'one new file:   {1e3*t_new:8.1f} ms')
+    print(f'nothing new:    {1e3*t_none:8.1f} ms\n')
+
+
+
+'''
+    Benchmark: query of the columnar result store (one parameter at one
+    frequency / in a band across all DUTs) vs. re-parsing the Touchstone
+    files
+'''
+def bench_store():
+
+    import tempfile
+
+    [f, s, port_imp] = netman.read_touchstone_array(path_ntwk + 'exam_1.s4p')
+    NumDUTs = 256
+
+    def reparse():
+        [f_file, s_file, port_imp] = netman.read_touchstone_array(path_ntwk + 'exam_1.s4p')
+        Sdd21 = netman.S_to_MM_nport(netman.SParameterSet(f_file, s_file))['Sdd21']
+        return np.interp(1e9, f_file, Sdd21.real)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with netman.ResultStore(tmp_dir, dtype=np.complex64) as store:
+            start = time.perf_counter()
+            for cnt in range(NumDUTs):
+                store.add(f'dut_{cnt}', netman.SParameterSet(f, s), {'NMSE_transm': -cnt})
+            t_add = time.perf_counter() - start
+
+        # fresh object, nothing mapped yet
+        store = netman.ResultStore(tmp_dir)
+        t_point = timeit(lambda: netman.ResultStore(tmp_dir).read_param('Sdd21', f=1e9), repeat=3)
+        t_band = timeit(lambda: store.read_param('S21', band=[0.9e9, 1.1e9]), repeat=3)
+        t_dut = timeit(lambda: store.read('dut_100'), repeat=3)
+        t_parse = timeit(reparse, repeat=3) * NumDUTs
+
+    print(f'### Result store ({NumDUTs} DUTs, exam_1.s4p) ###')
+    print(f'add (S + MM):           {1e3*t_add/NumDUTs:8.2f} ms/DUT')
+    print(f'Sdd21 at 1 GHz:         {1e3*t_point:8.2f} ms   re-parse (extrapolated): {t_parse:6.1f} s')
+    print(f'S21 in 0.9-1.1 GHz:     {1e3*t_band:8.2f} ms')
+    print(f'all S of one DUT:       {1e3*t_dut:8.2f} ms\n')
+
+
+
+'''
+    Benchmark: band selection with slice_Sparam (binary search, views) vs.
+    boolean masks (copies of every trace)
+'''
+def bench_slice():
+
+    [NumPorts, fLen, f, SParams] = netman.read_touchstone(path_ntwk + 'exam_1.s4p')
+    bands = [[1e8, 2e8], [5e8, 6e8], [1e9, 1.1e9]]
+    keys = list(SParams)
+
+    def masked():
+        return [{key: SParams[key][(f >= band[0]) & (f <= band[1])] for key in keys} for band in bands]
+
+    t_mask = timeit(masked, repeat=200)
+    t_slice = timeit(lambda: netman.slice_Sparam(keys, SParams, bands=bands), repeat=200)
+    t_set = timeit(lambda: netman.slice_Sparam(None, SParams, bands=bands), repeat=200)
+
+    print(f'### 3 bands of all {len(keys)} parameters (exam_1.s4p) ###')
+    print(f'boolean masks:          {1e6*t_mask:8.1f} us')
+    print(f'slice_Sparam (dict):    {1e6*t_slice:8.1f} us   speedup: {t_mask/t_slice:6.1f} x')
+    print(f'slice_Sparam (set):     {1e6*t_set:8.1f} us   speedup: {t_mask/t_set:6.1f} x\n')
+
+
+
+benchmarks = {'touchstone': bench_touchstone,
+              'cache': bench_cache,
+              'nmse': bench_nmse,
+              'mixedmode': bench_mixedmode,
+              'bulk': bench_bulk,
+              'osci': bench_osci,
+              'plot': bench_plot,
+              'decimate': bench_decimate,
+              'interp': bench_interp,
+              'impedance': bench_impedance,
+              'fitting': bench_fitting,
+              'vectorfit': bench_vectorfit,
+              'network_ops': bench_network_ops,
+              'qa': bench_qa,
+              'timedomain': bench_timedomain,
+              'mm_accessor': bench_mm_accessor,
+              'importtime': bench_importtime,
+              'report': bench_report,
+              'watcher': bench_watcher,
+              'store': bench_store,
+              'slice': bench_slice}
+
+if __name__ == '__main__':
+
+    selected = sys.argv[1:] if len(sys.argv) > 1 else list(benchmarks)
+
+    for name in selected:
+        benchmarks[name]()
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """
-last change: 17.12.2025
+last change: 17.10.2026
 Author(s): Christoph Maier
 
 This file contains different functions for the manipulation of S parameters,
@@ -11,19 +11,81 @@ Implemented functions:
     extract_Sparam: extracts the S-parameters out of a network object
     extract_MMparam: extracts the MM-parameters out of a network object
     slice_Sparam: 'slice' dict object. Needed to extract explicit S-parameter
+                  (optionally only frequency bands / every n-th point)
     S_to_MM: calculate Mixed-Mode parameters out of S-parameter
+    S_to_MM_nport: calculate Mixed-Mode parameters out of 2N-port S-parameter
+    MM_to_S_nport: calculate 2N-port S-parameter out of Mixed-Mode parameters
     calc_Sparam_NMSE: calculate the normalized mean-square error of two networks
+    calc_Sparam_NMSE_batch: calculate the NMSE of many networks at once
     calc_imp_oneport: caluclate impedance out of S11
     calc_imp_seriesthru: calculate impeance out of S21 with series-thru formula
     calc_imp_shuntthru: calculate impedance out of S21 with shunt-thru formula
+    calc_imp_batch: calculate the impedance of many DUTs at once
 """
 
 # needed packages
-import skrf as rf
+from functools import lru_cache
+import sys
 import numpy as np
 
+from .myclasses import SParameterSet
+from .resample import _same_grid, common_grid, interp_Sparam, align_Sparam
+
 # definition of constants
 eps = np.finfo(np.float64).eps # define epsilon (a very small number)
+PORT_CONVENTIONS = ('interleaved', 'grouped') # named port orderings of 2N-ports
+
+
+'''
+    This function checks whether an object is a scikit-rf network. skrf is
+    not imported here (long import time): if it was never imported, the
+    object can not be a network.
+
+    Input Parameters:
+        obj: any object
+
+    Output Parameters:
+        is_network: True for skrf network objects
+'''
+def _is_network(obj):
+
+    skrf = sys.modules.get('skrf')
+
+    return skrf is not None and isinstance(obj, skrf.Network)
+
+
+
+'''
+    This function converts the different representations of S-parameters
+    (network object, SParameterSet, dict or (F, N, N) array) into a
+    SParameterSet. Network objects, SParameterSets and arrays are not copied,
+    dicts are stacked once into a common buffer.
+
+    Input Parameters:
+        SParams: network object, SParameterSet, dict or array
+        f: frequency vector (only used for dict and array input)
+
+    Output Parameters:
+        SSet: SParameterSet object
+'''
+def _as_SParameterSet(SParams,
+                      f=None):
+
+    if isinstance(SParams, SParameterSet):
+        return SParams
+    if _is_network(SParams):
+        return SParameterSet(SParams.f, SParams.s)
+    if isinstance(SParams, np.ndarray):
+        return SParameterSet(f, SParams)
+    if isinstance(SParams, dict):
+        NumPorts = int(round(np.sqrt(len(SParams))))
+        keys = [f"S{row+1}{column+1}" for row in range(NumPorts) for column in range(NumPorts)]
+        if not all(key in SParams for key in keys):
+            keys = None
+        return SParameterSet.from_dict(f, SParams, keys)
+
+    raise Exception('Given object is not a network object')
+
 
 
 '''
@@ -31,31 +93,27 @@ eps = np.finfo(np.float64).eps # define epsilon (a very small number)
     out of it.
     
     Input Parameters:
-        InputNetwork: network object of interst
+        InputNetwork: network object (or SParameterSet) of interst
         
     Output Parameters:
         NumPorts: number of ports
         fLen: number of measured points
         f: frequency vector
-        SParams: S-Parameters, can be accessed by keyword(e.g. SParams['S11'])
+        SParams: S-Parameters as SParameterSet, can be accessed by
+                 keyword(e.g. SParams['S11'])
 '''
 def extract_Sparam(InputNetwork):
     
     # div. error checks
-    if not isinstance(InputNetwork, rf.network.Network):
+    if not (isinstance(InputNetwork, SParameterSet) or _is_network(InputNetwork)):
         raise Exception('Given object is not a network object')
         
-    NumPorts = InputNetwork.number_of_ports
-    f = InputNetwork.f
-    fLen = len(InputNetwork.f)
+    SParams = _as_SParameterSet(InputNetwork)
+    NumPorts = SParams.NumPorts
+    f = SParams.f
+    fLen = SParams.fLen
     
     print('The network has ' + str(NumPorts) + ' ports.')
-    
-    SParams = {}
-    for row in range(NumPorts):
-        for column in range(NumPorts):
-            key = f"S{row+1}{column+1}"
-            SParams[key] = InputNetwork.s[:, row, column]
 
     return [NumPorts,
             fLen,
@@ -69,37 +127,46 @@ def extract_Sparam(InputNetwork):
     out of it.
     
     Input Parameters:
-        InputNetwork: network object of interst
+        InputNetwork: network object (or SParameterSet) of interst
+        key_order: list of keys, in the order the MM-parameters are stored
+                   in the network (row-major). If not given, the labels in
+                   the comments of the network (e.g. 're:Sdd11') are used,
+                   otherwise the R&S order ['Sdd11', 'Sdc11', 'Sdd12', ...]
+                   (see S_to_MM_nport). A network with single-ended labels
+                   (e.g. 're:S11') raises a ValueError.
         
     Output Parameters:
         NumPorts: number of ports
         fLen: number of measured points
         f: frequency vector
-        SParams: MM-Parameters, can be accessed by keyword(e.g. SParams['S11'])
+        SParams: MM-Parameters as SParameterSet, can be accessed by
+                 keyword(e.g. SParams['Sdd11'])
 '''
 def extract_MMparam(InputNetwork,
-                    key_order):
+                    key_order=None):
     
     # div. error checks
-    if not isinstance(InputNetwork, rf.network.Network):
+    if not (isinstance(InputNetwork, SParameterSet) or _is_network(InputNetwork)):
         raise Exception('Given object is not a network object')
         
-    NumPorts = InputNetwork.number_of_ports
-    f = InputNetwork.f
-    fLen = len(InputNetwork.f)
+    SSet = _as_SParameterSet(InputNetwork)
+    NumPorts = SSet.NumPorts
+    f = SSet.f
+    fLen = SSet.fLen
     
     print('The network has ' + str(NumPorts) + ' ports.')
-    
-    SParams = {}
-    
-    # Flatten the 2D S-matrix into a 1D list to map to your keys
-    flat_s = InputNetwork.s.reshape(InputNetwork.s.shape[0], -1)
 
-    if flat_s.shape[1] != len(key_order):
-        raise Exception(f"Number of keys ({len(key_order)}) does not match number of S-parameters ({flat_s.shape[1]})")
+    if key_order is not None and NumPorts**2 != len(key_order):
+        raise Exception(f"Number of keys ({len(key_order)}) does not match number of S-parameters ({NumPorts**2})")
+
+    labels = None
+    if key_order is None and _is_network(InputNetwork):
+        from .touchstone import _network_labels
+        labels = _network_labels(InputNetwork)
+    key_order = _MM_key_order(NumPorts, key_order, labels)
 
-    for idx, key in enumerate(key_order):
-        SParams[key] = flat_s[:, idx]
+    # same buffer, the keys are mapped in row-major order
+    SParams = SParameterSet(f, SSet.s, key_order)
 
     return [NumPorts,
             fLen,
@@ -110,23 +177,83 @@ def extract_MMparam(InputNetwork,
 
 '''
     This function takes a dict S-parameter object and 'slices'. It is needed
-    to extract specific S-parameters out of a whole object.
+    to extract specific S-parameters out of a whole object. Optionally, only
+    frequency bands and/or every stride-th point are extracted. The band
+    edges are found with a binary search on the (ascending) frequency vector
+    (all bands in one call) and the results are views, no data is copied.
     
     Input Parameters:
         keys_to_extract: is a list of strings, used to specify the
-                         keys (e.g. ['S11','S12'])
-        dict_input: input S-parameter dict object
+                         keys (e.g. ['S11','S12']). None for all keys; for a
+                         SParameterSet input the result is then a
+                         SParameterSet (view of the band) again, which can be
+                         passed e.g. to calc_Sparam_NMSE or the plot functions
+                         (with stride > 1 its S-array is a copy, it must be
+                         contiguous)
+        dict_input: input S-parameter dict object (or SParameterSet)
+        f: frequency vector (sorted ascending), only needed for bands and
+           dict input (taken from a SParameterSet if not given)
+        bands: frequency band [f_start, f_stop] (edges included) or list of
+               bands [[f_start_1, f_stop_1], [f_start_2, f_stop_2], ...]
+        stride: only every stride-th point is extracted (decimation)
         
     Output Parameters:
-        dict_output: sliced output S-parameter dict object
+        dict_output: sliced output S-parameter dict object (without bands
+                     and stride, the only output)
+        f_output: sliced frequency vector (with bands or stride). For a list
+                  of bands, f_output and dict_output are lists with one
+                  entry per band.
         
 '''
 def slice_Sparam(keys_to_extract,
-                 dict_input):
+                 dict_input,
+                 f=None,
+                 bands=None,
+                 stride=1):
+    
+    if keys_to_extract is None:
+        keys_to_extract = list(dict_input.keys())
+    
+    if bands is None and stride == 1:
+        dict_output = {k: dict_input[k] for k in keys_to_extract}
+        return dict_output
+    
+    if f is None:
+        f = getattr(dict_input, 'f', None)
+    
+    # index ranges of all bands with one binary search per band edge
+    if bands is None:
+        single = True
+        slices = [slice(None, None, stride)]
+    else:
+        if f is None:
+            raise Exception('A frequency vector is needed for the band selection')
+        edges = np.asarray(bands, dtype=np.float64)
+        single = edges.ndim == 1
+        edges = edges.reshape(-1, 2)
+        starts = np.searchsorted(f, edges[:, 0], side='left')
+        stops = np.searchsorted(f, edges[:, 1], side='right')
+        slices = [slice(start, max(start, stop), stride) for start, stop in zip(starts, stops)]
+    
+    # complete SParameterSet: views of the (F, N, N) buffer
+    keep_set = isinstance(dict_input, SParameterSet) and len(keys_to_extract) == len(dict_input)
+    
+    f_output = []
+    dict_output = []
+    for part in slices:
+        f_part = None if f is None else f[part]
+        if keep_set:
+            dict_output.append(SParameterSet(f_part, dict_input.s[part], list(dict_input)))
+        else:
+            dict_output.append({k: dict_input[k][part] for k in keys_to_extract})
+        f_output.append(f_part)
     
-    dict_output = {k: dict_input[k] for k in keys_to_extract}
+    if single:
+        return [f_output[0],
+                dict_output[0]]
     
-    return dict_output
+    return [f_output,
+            dict_output]
 
 
 
@@ -135,58 +262,259 @@ def slice_Sparam(keys_to_extract,
     the "normal" S-Parameters dict.
     
     Input Parameters:
-        dict_in: 4-port S-parameter dict
+        dict_in: 4-port S-parameters (SParameterSet, network object or dict)
     
     Output parameters:
-        dict_out: converted MM-parameter dict
+        dict_out: converted MM-parameters as SParameterSet
 '''
 def S_to_MM(dict_in):
     
-    S_mat = np.array([[dict_in["S11"], dict_in["S12"], dict_in["S13"], dict_in["S14"]],
-                      [dict_in["S21"], dict_in["S22"], dict_in["S23"], dict_in["S24"]],
-                      [dict_in["S31"], dict_in["S32"], dict_in["S33"], dict_in["S34"]],
-                      [dict_in["S41"], dict_in["S42"], dict_in["S43"], dict_in["S44"]]])
-    
-    # Mixed-mode transform matrix
-    Transform = (1/np.sqrt(2)) * np.array([[1, -1, 0, 0], [1,  1, 0, 0],
-                                           [0,  0, 1, -1], [0,  0, 1,  1]])
+    S_set = _as_SParameterSet(dict_in)
+    if S_set.NumPorts != 4:
+        raise Exception('Mixed-Mode transformation needs a 4-port network')
     
-    # calculate inverse of transfomr matrix
-    Transform_inv = np.linalg.inv(Transform)
-    
-    # Apply mixed-mode transform
+    # Apply mixed-mode transform (for all frequencies at once)
     # S_mm = T * S * Tinv
-    S_mat_exp = S_mat.transpose(2,0,1)
-    MixedMode_exp = Transform @ S_mat_exp @ Transform_inv
-    MixedMode = MixedMode_exp.transpose(1,2,0)
+    Transform = _MM_transform(4, ((1, 2), (3, 4)))
+    MixedMode = Transform @ S_set.s @ Transform.T
     
     labels = ["dd", "dc", "cd", "cc"]
-    dict_out = {}
+    keys = [f"S{labels[i]}{labels[j]}" for i in range(4) for j in range(4)]
     
-    for i in range(4):
-        for j in range(4):
-            key = f"S{labels[i]}{labels[j]}"
-            dict_out[key] = MixedMode[i, j, :]
+    dict_out = SParameterSet(S_set.f, MixedMode, keys)
     
     return dict_out
 
 
 
+'''
+    This function checks the port pairing for the mixed-mode transformation
+    and brings it into a hashable form. Without pairing, consecutive ports
+    are combined ((1,2), (3,4), ...).
+
+    Input Parameters:
+        NumPorts: number of (single-ended) ports, must be even
+        pairing: list of port pairs (positive port, negative port), 1-based
+                 (e.g. [(1,3), (2,4)])
+
+    Output parameters:
+        pairing: checked pairing as tuple of tuples
+'''
+def _check_pairing(NumPorts,
+                   pairing=None):
+
+    if NumPorts % 2 != 0:
+        raise Exception('Mixed-Mode transformation needs an even number of ports')
+
+    if pairing is None:
+        pairing = [(port, port + 1) for port in range(1, NumPorts + 1, 2)]
+
+    pairing = tuple((int(port_p), int(port_n)) for [port_p, port_n] in pairing)
+    ports = sorted(port for pair in pairing for port in pair)
+
+    if ports != list(range(1, NumPorts + 1)):
+        raise Exception('Port pairing ' + str(pairing) + ' does not use every port of the ' + str(NumPorts) + '-port exactly once')
+
+    return pairing
+
+
+
+'''
+    This function returns the port pairing of a named port-ordering
+    convention of a 2N-port.
+
+    Input Parameters:
+        NumPorts: number of (single-ended) ports
+        convention: 'interleaved' for the pairs (1,2), (3,4), ... (default)
+                    'grouped' for the pairs (1,N+1), (2,N+2), ..., i.e. all
+                    positive lines first
+
+    Output parameters:
+        pairing: list of port pairs (positive port, negative port), 1-based
+'''
+def _convention_pairing(NumPorts,
+                        convention='interleaved'):
+
+    if NumPorts % 2 != 0:
+        raise Exception('Mixed-Mode transformation needs an even number of ports')
+
+    NumPairs = NumPorts // 2
+    if convention == 'interleaved':
+        return [(2*pair + 1, 2*pair + 2) for pair in range(NumPairs)]
+    elif convention == 'grouped':
+        return [(pair + 1, pair + 1 + NumPairs) for pair in range(NumPairs)]
+    else:
+        raise ValueError('ERROR: No valid keyword for convention found ' + str(PORT_CONVENTIONS) + '.')
+
+
+
+'''
+    This function determines and validates the order of the mixed-mode keys
+    of a network which stores mixed-mode parameters.
+
+    Input Parameters:
+        NumPorts: number of ports
+        key_order: given list of keys (row-major), or None
+        labels: parameter labels out of the file header (see parse_labels),
+                used if no key_order is given. Single-ended labels (e.g.
+                'S21') raise a ValueError, the data has to be transformed
+                with S_to_MM_nport instead.
+
+    Output parameters:
+        key_order: validated list of keys (row-major)
+'''
+def _MM_key_order(NumPorts,
+                  key_order=None,
+                  labels=None):
+
+    if NumPorts % 2 != 0:
+        raise Exception('Mixed-Mode parameters need an even number of ports')
+
+    keys = _MM_keys(NumPorts // 2)
+
+    if key_order is None:
+        if labels and len(labels) == NumPorts**2:
+            if not labels[0][1:3].isalpha():
+                raise ValueError('ERROR: The network stores single-ended parameters (' + labels[0] + ', ...), '
+                                 'use S_to_MM_nport to calculate the mixed-mode parameters.')
+            key_order = labels
+        else:
+            key_order = keys
+
+    if sorted(key_order) != sorted(keys):
+        raise Exception('Keys ' + str(list(key_order)) + ' are no complete set of mixed-mode keys of a ' + str(NumPorts) + '-port')
+
+    return list(key_order)
+
+
+
+'''
+    This function calculates the mixed-mode transform matrix for a given
+    number of ports and port pairing. The matrices are memoized, since they
+    are constant. The transform is orthogonal, the inverse is the transpose.
+    The order of the modes is [DM @P1, CM @P1, DM @P2, CM @P2, ...].
+
+    Input Parameters:
+        NumPorts: number of (single-ended) ports
+        pairing: checked pairing (see _check_pairing)
+
+    Output parameters:
+        Transform: (read-only) transform matrix (NumPorts, NumPorts)
+'''
+@lru_cache(maxsize=None)
+def _MM_transform(NumPorts,
+                  pairing):
+
+    Transform = np.zeros((NumPorts, NumPorts))
+    for idx, [port_p, port_n] in enumerate(pairing):
+        Transform[2*idx, [port_p - 1, port_n - 1]] = [1, -1]
+        Transform[2*idx + 1, [port_p - 1, port_n - 1]] = [1, 1]
+    Transform = Transform / np.sqrt(2)
+    Transform.setflags(write=False)
+
+    return Transform
+
+
+
+'''
+    This function creates the keys of the mixed-mode parameters
+    (e.g. 'Sdc12') in the order of the transform matrix.
+
+    Input Parameters:
+        NumPairs: number of mixed-mode ports
+
+    Output parameters:
+        keys: list of keys in row-major order
+'''
+def _MM_keys(NumPairs):
+
+    modes = [(mode, pair + 1) for pair in range(NumPairs) for mode in 'dc']
+    keys = [f"S{mode_i}{mode_j}{pair_i}{pair_j}" for [mode_i, pair_i] in modes
+                                                 for [mode_j, pair_j] in modes]
+
+    return keys
+
+
+
+'''
+    This function calculates the Mixed-Mode S-Parameters out of the S-parameters
+    of a network with any even number of ports. The transformation is done
+    with one batched matrix product over all frequencies.
+    
+    Input Parameters:
+        SParams: S-parameters (SParameterSet, network object, dict or
+                 (F, N, N) array)
+        pairing: list of port pairs (positive port, negative port), 1-based.
+                 Default: consecutive ports ((1,2), (3,4), ...)
+    
+    Output parameters:
+        MMParams: MM-parameters as SParameterSet (keys e.g. 'Sdd21', 'Scd12')
+'''
+def S_to_MM_nport(SParams,
+                  pairing=None):
+
+    S_set = _as_SParameterSet(SParams)
+    pairing = _check_pairing(S_set.NumPorts, pairing)
+    Transform = _MM_transform(S_set.NumPorts, pairing)
+
+    # S_mm = T * S * Tinv
+    MixedMode = Transform @ S_set.s @ Transform.T
+
+    MMParams = SParameterSet(S_set.f, MixedMode, _MM_keys(len(pairing)))
+
+    return MMParams
+
+
+
+'''
+    This function calculates the (single-ended) S-parameters out of the
+    Mixed-Mode S-Parameters. It is the inverse of S_to_MM_nport.
+    
+    Input Parameters:
+        MMParams: MM-parameters (SParameterSet or (F, N, N) array in the order
+                  of S_to_MM_nport, or dict with keys like 'Sdd21')
+        pairing: list of port pairs (positive port, negative port), 1-based.
+                 Default: consecutive ports ((1,2), (3,4), ...)
+    
+    Output parameters:
+        SParams: S-parameters as SParameterSet
+'''
+def MM_to_S_nport(MMParams,
+                  pairing=None):
+
+    if isinstance(MMParams, dict):
+        NumPorts = int(round(np.sqrt(len(MMParams))))
+        MMParams = SParameterSet.from_dict(None, MMParams, _MM_keys(NumPorts // 2))
+    MM_set = _as_SParameterSet(MMParams)
+
+    pairing = _check_pairing(MM_set.NumPorts, pairing)
+    Transform = _MM_transform(MM_set.NumPorts, pairing)
+
+    # S = Tinv * S_mm * T
+    SParams = SParameterSet(MM_set.f, Transform.T @ MM_set.s @ Transform)
+
+    return SParams
+
+
+
 '''
     This function calculates the normalized mean-square error (NMSE) of two
     S-parameter objects by comparing the transmission and the reflection
     coefficients separately.
     
     Input Parameters:
-        SComp: network object of the S-parameter block which is compared to
-               the reference one.
-        SRef: network object used as reference. The frequency grid and the
+        SComp: network object (or SParameterSet) of the S-parameter block
+               which is compared to the reference one.
+        SRef: network object (or SParameterSet) used as reference. The frequency grid and the
               number of ports of the two S-parameter objects must be the same
               If this variable is left empty, a comparison to a infinitesimally
               small, perfecly matched line is made.
         valuetype: Flag indicating whether output values are in dB or linear
                    scale. If set to 'dB', output is in decibels; any other
                    value (or empty) means linear scale.
+        interpolate: if True, differing frequency grids are aligned first
+                     (SComp is interpolated onto the grid of SRef, restricted
+                     to the overlapping range, see align_Sparam)
     
     Output parameters:
         NMSERef: Calculated NMSE for the reflection coefficients 
@@ -194,34 +522,41 @@ def S_to_MM(dict_in):
 '''
 def calc_Sparam_NMSE(SComp,
                      SRef,
-                     valuetype=' '):
+                     valuetype=' ',
+                     interpolate=False):
      
     # generate variables
     NMSERef =[]
     NMSETrans = []
     
     # div. error checks
-    if not isinstance(SComp, rf.network.Network):
+    if not (isinstance(SComp, SParameterSet) or _is_network(SComp)):
         raise Exception('Given object is not a network object')
     else:
-        if not isinstance(SRef, rf.network.Network):
+        SComp = _as_SParameterSet(SComp)
+        if not (isinstance(SRef, SParameterSet) or _is_network(SRef)):
             CompareToUnityLine = True
         else:
             CompareToUnityLine = False
-            if not (SComp.number_of_ports == SRef.number_of_ports):
+            SRef = _as_SParameterSet(SRef)
+            if not (SComp.NumPorts == SRef.NumPorts):
                raise Exception('The number of ports of the two objects do not agree')
-            if not (len(SComp.f) == len(SRef.f)):
+            if interpolate:
+                [SComp, SRef] = align_Sparam(SComp, SRef, grid='common')
+            elif not (SComp.fLen == SRef.fLen):
                 raise Exception('The number of measurement points does not match')
+            elif not _same_grid(SComp.f, SRef.f):
+                raise Exception('The frequency points of the two objects do not match')
                 
                 
-    NumPorts = SComp.number_of_ports
+    NumPorts = SComp.NumPorts
     RefNumer = 0
     RefDenom = 0
     TransNumer = 0
     TransDenom = 0
     
     if CompareToUnityLine:
-        fLen = len(SComp.f)
+        fLen = SComp.fLen
         for row in range(NumPorts):
             for column in range(NumPorts):
                 if row == column:
@@ -255,6 +590,158 @@ def calc_Sparam_NMSE(SComp,
 
 
 
+'''
+    This function takes a list of network objects or S-parameter arrays (or an
+    already stacked array) and stacks them into one (K, F, N, N) array.
+
+    Input Parameters:
+        SList: list of network objects, SParameterSets or (F, N, N) arrays, or
+               a stacked (K, F, N, N) / single (F, N, N) array
+
+    Output parameters:
+        SStack: stacked complex S-parameter array (K, F, N, N)
+'''
+def _stack_Sparam(SList):
+
+    if isinstance(SList, SParameterSet) or _is_network(SList):
+        SList = [SList]
+    elif isinstance(SList, np.ndarray):
+        if SList.ndim == 3:
+            return SList[np.newaxis]
+        if SList.ndim != 4:
+            raise Exception('S-parameter array must have the shape (K, F, N, N) or (F, N, N)')
+        return SList
+
+    SStack = [_as_SParameterSet(ntwk).s for ntwk in SList]
+
+    if len(set(s.shape for s in SStack)) > 1:
+        raise Exception('The number of ports or measurement points of the networks do not agree')
+
+    return np.stack(SStack)
+
+
+
+'''
+    This function sums up the squared magnitude of a stacked S-parameter
+    array along the frequency axis (|S|^2 calculated on the real/imag view,
+    without the detour over np.abs).
+
+    Input Parameters:
+        SStack: complex S-parameter array (K, F, N, N)
+
+    Output parameters:
+        Power: summed squared magnitude (K, N, N)
+'''
+def _sum_square(SStack):
+
+    SFloat = np.ascontiguousarray(SStack).view(np.float64)
+    Power = np.einsum('kfij,kfij->kij', SFloat, SFloat)
+
+    return Power[..., 0::2] + Power[..., 1::2]
+
+
+
+'''
+    This function calculates the normalized mean-square error (NMSE) of many
+    S-parameter objects at once. The definitions are the same as in
+    calc_Sparam_NMSE, but all networks are compared in one vectorized pass
+    (and nothing is printed).
+
+    Input Parameters:
+        SComp: stacked (K, F, N, N) array or list of network objects /
+               SParameterSets / arrays which are compared to the reference one
+        SRef: network object, SParameterSet or (F, N, N) array used as
+              reference. If this
+              variable is left empty, a comparison to a infinitesimally
+              small, perfecly matched line is made.
+        valuetype: Flag indicating whether output values are in dB or linear
+                   scale. If set to 'dB', output is in decibels; any other
+                   value (or empty) means linear scale.
+        pairwise: if True, additionally the K x K NMSE matrices of all
+                  networks against each other are calculated
+        interpolate: if True, all networks are interpolated onto the grid of
+                     SRef (restricted to the range covered by all networks).
+                     Needs network objects or SParameterSets as input.
+
+    Output parameters:
+        NMSERef: Calculated NMSE for the reflection coefficients (K,)
+        NMSETrans: Calculated NMSE for the transmission coefficients (K,)
+        PairRef: (only if pairwise) K x K reflection NMSE, entry [i, j] is
+                 network i compared to network j as reference
+        PairTrans: (only if pairwise) K x K transmission NMSE
+'''
+def calc_Sparam_NMSE_batch(SComp,
+                           SRef=None,
+                           valuetype=' ',
+                           pairwise=False,
+                           interpolate=False):
+
+    if interpolate:
+        if isinstance(SComp, SParameterSet) or _is_network(SComp):
+            SComp = [SComp]
+        if isinstance(SComp, np.ndarray) or isinstance(SRef, np.ndarray):
+            raise Exception('Interpolation needs network objects or SParameterSets as input')
+        SComp = [_as_SParameterSet(ntwk) for ntwk in SComp]
+        f_list = [ntwk.f for ntwk in SComp]
+        if SRef is not None:
+            SRef = _as_SParameterSet(SRef)
+            f_list.insert(0, SRef.f)
+        f_new = common_grid(f_list)
+        SComp = [interp_Sparam(ntwk, f_new) for ntwk in SComp]
+        if SRef is not None:
+            SRef = interp_Sparam(SRef, f_new).s
+
+    SComp = _stack_Sparam(SComp)
+    [K, fLen, NumPorts, _] = SComp.shape
+
+    # masks for reflection (diagonal) and transmission (off-diagonal) terms
+    RefMask = np.eye(NumPorts, dtype=bool)
+    TransMask = ~RefMask
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if SRef is None:
+            Power = _sum_square(SComp - TransMask)
+            NMSERef = Power[:, RefMask].sum(axis=-1)
+            NMSETrans = Power[:, TransMask].sum(axis=-1) / (fLen * np.count_nonzero(TransMask))
+        else:
+            SRef = _stack_Sparam(SRef)[0]
+            if SRef.shape != SComp.shape[1:]:
+                raise Exception('The number of ports or measurement points of the two objects do not agree')
+            Power = _sum_square(SComp - SRef)
+            PowerRef = _sum_square(SRef[np.newaxis])[0]
+            NMSERef = Power[:, RefMask].sum(axis=-1) / PowerRef[RefMask].sum()
+            NMSETrans = Power[:, TransMask].sum(axis=-1) / PowerRef[TransMask].sum()
+
+        if pairwise:
+            # |a - b|^2 = |a|^2 + |b|^2 - 2 Re(a b*), one Gram matrix per mask
+            PairNMSE = []
+            for Mask in (RefMask, TransMask):
+                Vec = SComp[:, :, Mask].reshape(K, -1)
+                Gram = Vec @ Vec.conj().T
+                Norm = Gram.diagonal().real
+                Numer = np.maximum(Norm[:, np.newaxis] + Norm[np.newaxis, :] - 2 * Gram.real, 0)
+                np.fill_diagonal(Numer, 0)
+                PairNMSE.append(Numer / Norm[np.newaxis, :])
+            [PairRef, PairTrans] = PairNMSE
+
+    if valuetype == 'dB':
+        NMSERef = 10*np.log10(np.abs(NMSERef + eps))
+        NMSETrans = 10*np.log10(np.abs(NMSETrans + eps))
+        if pairwise:
+            PairRef = 10*np.log10(np.abs(PairRef + eps))
+            PairTrans = 10*np.log10(np.abs(PairTrans + eps))
+
+    if pairwise:
+        return [NMSERef,
+                NMSETrans,
+                PairRef,
+                PairTrans]
+
+    return [NMSERef,
+            NMSETrans]
+
+
+
 '''
     This function calculates the impedance out of a one-port measurement.
     
@@ -327,3 +814,121 @@ def calc_imp_shuntthru(f,
     
     return impedance
 
+
+
+'''
+    This function finds the row and column of a S-parameter label in the
+    S-matrix of a N-port. The keys of a SParameterSet (e.g. mixed-mode keys
+    like 'Sdd21') are looked up directly. Otherwise the label is split into
+    the two port numbers (e.g. 'S1112' -> port 11, port 12 for a 12-port);
+    labels which can not be split into valid ports of the N-port or which
+    can be split in more than one way (e.g. 'S111' for a 12-port) raise an
+    Exception.
+
+    Input Parameters:
+        param: S-parameter label (e.g. 'S21')
+        NumPorts: number of ports
+        keys: key index of a SParameterSet ({key: (row, column)}, optional)
+
+    Output parameters:
+        row: row index of the parameter (0-based)
+        column: column index of the parameter (0-based)
+'''
+def _param_index(param,
+                 NumPorts,
+                 keys=None):
+
+    if keys is not None and param in keys:
+        return list(keys[param])
+
+    digits = param[1:] if param[:1].upper() == 'S' else ''
+    index = []
+    if digits.isdigit():
+        for cnt in range(1, len(digits)):
+            if digits[0] == '0' or digits[cnt] == '0':
+                continue
+            [row, column] = [int(digits[:cnt]), int(digits[cnt:])]
+            if row <= NumPorts and column <= NumPorts:
+                index.append([row - 1, column - 1])
+
+    if len(index) != 1:
+        raise Exception(f"{param} is not a unique S-parameter of a {NumPorts}-port")
+
+    return index[0]
+
+
+
+# coefficients of the impedance formulas, Z = Z0 * (numer/den - shift) with
+# den = offset + sign * S and the default S-parameter of the method
+IMP_METHODS = {'oneport':    {'offset': 1, 'sign': -1, 'numer': 2,   'shift': 1,   'param': 'S11'},
+               'seriesthru': {'offset': 0, 'sign': 1,  'numer': 2,   'shift': 2,   'param': 'S21'},
+               'shuntthru':  {'offset': 1, 'sign': -1, 'numer': 0.5, 'shift': 0.5, 'param': 'S21'}}
+
+
+'''
+    This function calculates the impedance of many DUTs at once. The formulas
+    are the same as in calc_imp_oneport, calc_imp_seriesthru and
+    calc_imp_shuntthru, but written as Z = Z0 * (numer/den - shift). This way
+    only one buffer is needed (no temporaries) and the singular points
+    (S11 -> 1, S21 -> 0, S21 -> 1) can be caught before the division. These
+    points are set to NaN, no warnings or inf values are produced.
+    
+    Input Parameters:
+        S: S-parameters of the DUTs as (K, F) / (F,) array of the needed
+           parameter, or (K, F, N, N) / (F, N, N) array, list of network
+           objects or SParameterSets (the parameter is taken out of it)
+        method: 'oneport', 'seriesthru' or 'shuntthru'
+        port_imp: port impedance (50 Ohm if not given), scalar or array which
+                  can be broadcast to the output (e.g. (K, 1))
+        param: S-parameter used for full S-arrays (e.g. 'S22' or 'S1112' for
+               networks with more than 9 ports, see _param_index). Default is
+               S11 for 'oneport' and S21 for 'seriesthru'/'shuntthru'
+        out: complex array for the result (optional, same shape as result)
+        dtype: complex dtype of the result (np.complex64 for float32 output),
+               ignored if out is given
+        tol: denominators with a magnitude <= tol are treated as singular
+    
+    Output parameters:
+        impedance: complex impedance array (K, F) (or (F,) for single DUTs)
+'''
+def calc_imp_batch(S,
+                   method,
+                   port_imp=50,
+                   param=None,
+                   out=None,
+                   dtype=np.complex128,
+                   tol=1e-12):
+
+    if method not in IMP_METHODS:
+        raise ValueError('ERROR: No valid keyword for method found.')
+    coeff = IMP_METHODS[method]
+
+    first = S[0] if isinstance(S, (list, tuple)) and len(S) else S
+    keys = first._index if isinstance(first, SParameterSet) else None
+    if not isinstance(S, np.ndarray):
+        S = _stack_Sparam(S)
+    if S.ndim >= 3:
+        if param is None:
+            param = coeff['param']
+        [row, column] = _param_index(param, S.shape[-1], keys)
+        S = S[..., row, column]
+
+    if out is None:
+        out = np.empty(S.shape, dtype=dtype)
+    elif out.shape != S.shape:
+        raise Exception('Shape of out does not match the shape of the result ' + str(S.shape))
+    elif not np.iscomplexobj(out):
+        raise Exception('out must be a complex array, the imaginary part would be lost')
+
+    # den = offset + sign * S
+    np.multiply(S, coeff['sign'], out=out, casting='same_kind')
+    if coeff['offset']:
+        out += coeff['offset']
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        out[np.abs(out) <= tol] = np.nan
+        np.divide(coeff['numer'], out, out=out)
+        out -= coeff['shift']
+        out *= port_imp
+
+    return out
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """
-last change: 16.06.2026
+last change: 17.10.2026
 Author(s): Christoph Maier
 
 network_manipulations
@@ -10,42 +10,206 @@ Used for different network manipulations.
 
 This package bundles together:
 - extracting S and MM parameters out of network objects
-- slice S-Parameters
-- calculate MM parameters out of S parameters
-- calulate the NMSE of two networks
-- calculate impedance out of S-parameters (one-port, series-thru, shunt-thru)
-- div. plotting functions
+- slice S-Parameters (by key, frequency band and stride)
+- calculate MM parameters out of S parameters (any even number of ports),
+  also on demand per parameter
+- calulate the NMSE of two networks (or of many networks in one pass)
+- calculate impedance out of S-parameters (one-port, series-thru, shunt-thru),
+  also for many DUTs at once
+- extraction of equivalent-circuit values (R, L, C, ESR, ESL, SRF)
+- compression of S-parameters into rational models (vector fitting)
+- S/Z/Y/ABCD/T conversions, cascading and de-embedding of networks
+- quality checks (passivity, reciprocity, causality) of single files or directories
+- time-domain transforms (impulse/step responses, TDR impedance)
+- headless PDF/HTML reports of whole lots of DUTs (rendered in parallel)
+- incremental watch-folder mode (only new or changed files are processed)
+- columnar on-disk store of the results of many DUTs (query by DUT,
+  parameter and frequency band)
+- fast reading of Touchstone (.sNp) files
+- interpolation of S-parameters onto other frequency grids
+- binary on-disk cache for parsed Touchstone files
+- parallel loading of whole directories of Touchstone files
+- div. plotting functions (with min/max decimation of long traces)
 
 Intended usage:
     import network_manipulations as netman
 
     netman.extract_Sparam(...)
     netman.plot_impedance(...)
+
+The submodules are imported on first use of one of their functions, so
+matplotlib and scikit-rf are only loaded when they are needed.
 """
 
-from .myclasses import MixedModeParameter
-from .osci_scripts import read_csv_1trace, mul_measurements_1ch, time_normalizer, multiplot
-from .plot_functions import conv_plot_values, plot_values, plot_Sparam, plot_comp_Sparam, plot_impedance
-from .SParams import extract_Sparam, extract_MMparam, slice_Sparam, S_to_MM, calc_Sparam_NMSE, calc_imp_oneport, calc_imp_seriesthru, calc_imp_shuntthru
+import importlib
+
+# public names and the submodule which defines them. The submodules are only
+# imported on first access (see __getattr__), so e.g. the numeric functions
+# can be used without importing matplotlib and scikit-rf.
+_LAZY_ATTRS = {
+    'MixedModeParameter':     'myclasses',
+    'SParameterSet':          'myclasses',
+    'MixedModeAccessor':      'myclasses',
+    'read_csv_1trace':        'osci_scripts',
+    'read_csv_traces':        'osci_scripts',
+    'iter_csv_chunks':        'osci_scripts',
+    'stream_csv_stats':       'osci_scripts',
+    'mul_measurements_1ch':   'osci_scripts',
+    'load_csv_measurements':  'osci_scripts',
+    'time_normalizer':        'osci_scripts',
+    'multiplot':              'osci_scripts',
+    'conv_plot_values':       'plot_functions',
+    'decimate_trace':         'plot_functions',
+    'plot_values':            'plot_functions',
+    'plot_Sparam':            'plot_functions',
+    'plot_Sparam_batch':      'plot_functions',
+    'plot_comp_Sparam':       'plot_functions',
+    'plot_impedance':         'plot_functions',
+    'extract_Sparam':         'SParams',
+    'extract_MMparam':        'SParams',
+    'slice_Sparam':           'SParams',
+    'S_to_MM':                'SParams',
+    'S_to_MM_nport':          'SParams',
+    'MM_to_S_nport':          'SParams',
+    'calc_Sparam_NMSE':       'SParams',
+    'calc_Sparam_NMSE_batch': 'SParams',
+    'calc_imp_oneport':       'SParams',
+    'calc_imp_seriesthru':    'SParams',
+    'calc_imp_shuntthru':     'SParams',
+    'calc_imp_batch':         'SParams',
+    'read_touchstone':        'touchstone',
+    'read_touchstone_array':  'touchstone',
+    'read_touchstone_labels': 'touchstone',
+    'common_grid':            'resample',
+    'interp_Sparam':          'resample',
+    'align_Sparam':           'resample',
+    'eval_series_RLC':        'fitting',
+    'find_SRF':               'fitting',
+    'fit_series_RLC':         'fitting',
+    'fit_capacitor':          'fitting',
+    'vector_fit':             'vectorfit',
+    'eval_model':             'vectorfit',
+    'save_model':             'vectorfit',
+    'load_model':             'vectorfit',
+    's2z':                    'network_ops',
+    'z2s':                    'network_ops',
+    's2y':                    'network_ops',
+    'y2s':                    'network_ops',
+    's2abcd':                 'network_ops',
+    'abcd2s':                 'network_ops',
+    's2t':                    'network_ops',
+    't2s':                    'network_ops',
+    'flip_ports':             'network_ops',
+    'cascade':                'network_ops',
+    'deembed':                'network_ops',
+    'split_2xthru':           'network_ops',
+    'check_passivity':        'qa',
+    'check_reciprocity':      'qa',
+    'check_causality':        'qa',
+    'qa_Sparam':              'qa',
+    'qa_directory':           'qa',
+    'time_response':          'timedomain',
+    'tdr_impedance':          'timedomain',
+    'build_report':           'report',
+    'default_metrics':        'watcher',
+    'FolderWatcher':          'watcher',
+    'ResultStore':            'store',
+    'TouchstoneCache':        'cache',
+    'load_touchstone_cached': 'cache',
+    'find_touchstone_files':  'bulk_loader',
+    'load_touchstone_dir':    'bulk_loader',
+}
 
 # __all__ is optional
 # Define package’s public API and control what gets imported
 # when someone uses: from network_manipulations import *
 __all__ = ["MixedModeParameter",
+           "SParameterSet",
+           "MixedModeAccessor",
            "read_csv_1trace",
+           "read_csv_traces",
+           "iter_csv_chunks",
+           "stream_csv_stats",
            "mul_measurements_1ch",
+           "load_csv_measurements",
            "time_normalizer",
            "multiplot",
            "conv_plot_values",
+           "decimate_trace",
            "plot_values",
            "plot_Sparam",
+           "plot_Sparam_batch",
            "plot_comp_Sparam",
            "plot_impedance",
            "extract_Sparam",
            "extract_MMparam",
            "slice_Sparam",
            "S_to_MM",
+           "S_to_MM_nport",
+           "MM_to_S_nport",
            "calc_Sparam_NMSE",
+           "calc_Sparam_NMSE_batch",
            "calc_imp_oneport",
            "calc_imp_seriesthru",
-           "calc_imp_shuntthru"]
+           "calc_imp_shuntthru",
+           "calc_imp_batch",
+           "read_touchstone",
+           "read_touchstone_array",
+           "read_touchstone_labels",
+           "common_grid",
+           "interp_Sparam",
+           "align_Sparam",
+           "eval_series_RLC",
+           "find_SRF",
+           "fit_series_RLC",
+           "fit_capacitor",
+           "vector_fit",
+           "eval_model",
+           "save_model",
+           "load_model",
+           "s2z",
+           "z2s",
+           "s2y",
+           "y2s",
+           "s2abcd",
+           "abcd2s",
+           "s2t",
+           "t2s",
+           "flip_ports",
+           "cascade",
+           "deembed",
+           "split_2xthru",
+           "check_passivity",
+           "check_reciprocity",
+           "check_causality",
+           "qa_Sparam",
+           "qa_directory",
+           "time_response",
+           "tdr_impedance",
+           "build_report",
+           "default_metrics",
+           "FolderWatcher",
+           "ResultStore",
+           "TouchstoneCache",
+           "load_touchstone_cached",
+           "find_touchstone_files",
+           "load_touchstone_dir"]
+
+
+
+def __getattr__(name):
+    # called only for names which are not yet in the module namespace
+    if name in _LAZY_ATTRS.values():
+        # submodule (e.g. netman.SParams), set as attribute by the import
+        return importlib.import_module('.' + name, __name__)
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module('.' + _LAZY_ATTRS[name], __name__), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+This file contains functions to load whole directories of Touchstone files.
+The files are parsed in a process pool, every worker writes its result as .npy
+files into a common output directory. The main process only memory-maps these
+files, the arrays are not sent back through the pipes of the pool. Every call
+uses its own file names, so the files of earlier calls (which may still be
+mapped) are never overwritten.
+
+Implemented functions:
+    find_touchstone_files: finds all .sNp files in a directory
+    load_touchstone_dir: loads all .sNp files of a directory in parallel
+"""
+
+# needed packages
+import os
+import re
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import numpy as np
+
+from .myclasses import SParameterSet
+from .touchstone import read_touchstone_array
+
+
+'''
+    This function searches a directory for Touchstone files (.s1p, .s2p, ...).
+
+    Input Parameters:
+        path: directory to search
+        recursive: if True, also the subdirectories are searched
+
+    Output Parameters:
+        filenames: sorted list of the found files (including path)
+'''
+def find_touchstone_files(path,
+                          recursive=True):
+
+    pattern = re.compile(r'\.s\d+p$', flags=re.IGNORECASE)
+    filenames = []
+
+    for root, dirs, files in os.walk(path):
+        filenames += [os.path.join(root, file) for file in files if pattern.search(file)]
+        if not recursive:
+            break
+
+    return sorted(filenames)
+
+
+
+'''
+    This function is executed in the worker processes. It parses one file and
+    stores frequency vector and S-array as .npy files.
+
+    Input Parameters:
+        filename: Touchstone file to parse
+        out_dir: directory for the .npy files
+        name: name of the .npy files (unique per call and file)
+
+    Output Parameters:
+        filename: parsed file
+        path_f: .npy file of the frequency vector (None on error)
+        path_s: .npy file of the S-array (None on error)
+        error: error message (None on success)
+'''
+def _load_worker(filename,
+                 out_dir,
+                 name):
+
+    try:
+        [f, s, port_imp] = read_touchstone_array(filename)
+        path_f = os.path.join(out_dir, f"{name}_f.npy")
+        path_s = os.path.join(out_dir, f"{name}_s.npy")
+        for path, array in ((path_f, f), (path_s, s)):
+            with open(path + '.tmp', 'wb') as file:
+                np.save(file, array)
+            os.replace(path + '.tmp', path)
+    except Exception as error:
+        return [filename, None, None, f"{type(error).__name__}: {error}"]
+
+    return [filename, path_f, path_s, None]
+
+
+
+'''
+    This function loads all Touchstone files of a directory (or a given list
+    of files) in a process pool. The results are memory-mapped from .npy files
+    in out_dir. Broken or empty files do not abort the loading, they are
+    reported in the second output.
+
+    Input Parameters:
+        path: directory with the Touchstone files, or list of filenames
+        workers: number of worker processes (default: number of CPUs)
+        recursive: if True, also the subdirectories are searched
+        out_dir: directory for the .npy files. If not given, a temporary
+                 directory is created, which is the owner of the returned
+                 SParameterSets and removed when none of them is used
+                 anymore. A given out_dir belongs to the caller: every call
+                 writes a new set of files (the files of earlier calls may
+                 still be mapped), nothing is removed, the caller removes
+                 the directory when the results are not needed anymore.
+
+    Output Parameters:
+        SParamSets: dict {filename: SParameterSet} of the loaded files
+                    (arrays are read-only memory-maps)
+        failed: dict {filename: error message} of the files which could not
+                be loaded
+'''
+def load_touchstone_dir(path,
+                        workers=None,
+                        recursive=True,
+                        out_dir=None):
+
+    if isinstance(path, (str, os.PathLike)):
+        filenames = find_touchstone_files(path, recursive)
+    else:
+        filenames = [os.fspath(filename) for filename in path]
+
+    tmp_dir = None
+    if out_dir is None:
+        tmp_dir = tempfile.TemporaryDirectory(prefix='netman_', ignore_cleanup_errors=True)
+        out_dir = tmp_dir.name
+    else:
+        os.makedirs(out_dir, exist_ok=True)
+    run = uuid.uuid4().hex[:12]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    SParamSets = {}
+    failed = {}
+
+    if not filenames:
+        return [SParamSets,
+                failed]
+
+    chunksize = max(1, len(filenames) // (4 * workers))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_load_worker, filenames, repeat(out_dir),
+                               [f"{run}_{idx}" for idx in range(len(filenames))],
+                               chunksize=chunksize)
+
+        for [filename, path_f, path_s, error] in results:
+            if error is not None:
+                failed[filename] = error
+                continue
+            f = np.load(path_f, mmap_mode='r')
+            s = np.load(path_s, mmap_mode='r')
+            # the temporary directory lives as long as one of the sets
+            SParamSets[filename] = SParameterSet(f, s, owner=tmp_dir)
+
+    return [SParamSets,
+            failed]
@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+This file contains an on-disk cache for parsed Touchstone files. The first
+load of a file parses the ASCII data and writes a binary sidecar (.npy files
+for the frequency vector and the complex (F, N, N) S-array). Later loads
+memory-map the sidecar, as long as the source file did not change.
+
+Implemented classes/functions:
+    TouchstoneCache: cache object with size limit (LRU eviction) and counters
+    load_touchstone_cached: read a Touchstone file through the default cache
+"""
+
+# needed packages
+import atexit
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+import numpy as np
+
+from .myclasses import SParameterSet
+from .touchstone import read_touchstone_array
+
+# definition of constants
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'network_manipulations')
+DEFAULT_MAX_SIZE = 1024 * 2**20 # 1 GiB
+LOCK_TIMEOUT = 10               # seconds until a lock of the index is broken
+
+
+'''
+    This function calculates the SHA-1 hash of a file.
+
+    Input Parameters:
+        filename: string which stores the filename (including path)
+
+    Output Parameters:
+        digest: hex digest of the file content
+'''
+def _file_hash(filename):
+
+    sha = hashlib.sha1()
+    with open(filename, 'rb') as file:
+        for block in iter(lambda: file.read(2**20), b''):
+            sha.update(block)
+
+    return sha.hexdigest()
+
+
+
+"""
+    A class to cache parsed Touchstone files as binary sidecars. Every entry
+    consists of two .npy files (frequency vector and S-array) stored in the
+    cache directory, as well as an entry in the index file ('index.json').
+
+    Every version of a source file gets new sidecar names (the existing
+    files are never overwritten), so arrays of earlier loads which are still
+    memory-mapped stay valid when the source file changes. The files are
+    written under a temporary name and renamed, so other processes never see
+    partial sidecars. The index is written with a lock file; the entries of
+    other processes are merged. If two processes parsed the same file, the
+    entry of the newer source version is kept and the sidecars of the other
+    one are removed, so every sidecar on disk is counted against max_size.
+    The size limit is applied to the merged index. Cache hits only change
+    the access times in memory, these are written with the next miss, by
+    flush or at the end of a with block.
+
+    Attributes:
+        cache_dir: directory for the sidecar files
+        max_size: maximum size of all sidecars in bytes. If the size is
+                  exceeded, the least recently used entries are removed.
+        validate: 'mtime' compares size and modification time of the source
+                  file, 'hash' additionally compares the content hash
+        stats: dict with the counters 'hits', 'misses', 'evictions' and the
+               summed load times 'time_hit' and 'time_miss' (in seconds)
+
+    Methods:
+        load: read a Touchstone file (from cache if possible)
+        flush: write the access times of the cache hits into the index
+        clear: remove all entries from the cache
+        size: total size of the sidecar files in bytes
+"""
+class TouchstoneCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_size=DEFAULT_MAX_SIZE, validate='mtime'):
+
+        if validate not in ('mtime', 'hash'):
+            raise ValueError('No valid keyword for validate found.')
+
+        self.cache_dir = os.fspath(cache_dir)
+        self.max_size = max_size
+        self.validate = validate
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0,
+                      'time_hit': 0.0, 'time_miss': 0.0}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._index_file = os.path.join(self.cache_dir, 'index.json')
+        self._lock_file = os.path.join(self.cache_dir, 'index.lock')
+        self._index = self._read_index()
+        # keys with new sidecars / new access times / removed keys (with
+        # their stems) of this object since the last write
+        self._changed = set()
+        self._touched = set()
+        self._removed = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.flush()
+
+    def _read_index(self):
+        try:
+            with open(self._index_file, 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    @contextmanager
+    def _locked(self):
+        # lock file, created exclusively; a lock older than LOCK_TIMEOUT is
+        # treated as left over by a crashed process
+        start = time.time()
+        while True:
+            try:
+                handle = os.open(self._lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(self._lock_file) > LOCK_TIMEOUT:
+                        os.remove(self._lock_file)
+                        continue
+                except OSError:
+                    continue
+                if time.time() - start > LOCK_TIMEOUT:
+                    raise Exception(f"The cache index {self._index_file} is locked")
+                time.sleep(0.01)
+        try:
+            yield
+        finally:
+            os.close(handle)
+            os.remove(self._lock_file)
+
+    def _write_index(self, keep=None):
+        with self._locked():
+            # merge the entries of other processes
+            index = self._read_index()
+            for key, stem in self._removed.items():
+                if key in index and index[key].get('stem', key) == stem:
+                    del index[key]
+            for key in self._touched - self._changed:
+                entry = index.get(key)
+                if entry is not None and key in self._index and entry.get('stem', key) == self._index[key].get('stem', key):
+                    entry['last_access'] = max(entry['last_access'], self._index[key]['last_access'])
+            for key in self._changed:
+                if key not in self._index:
+                    continue
+                entry = index.get(key)
+                if entry is not None and entry.get('stem', key) != self._index[key]['stem']:
+                    # the same file was parsed by another process, the
+                    # sidecars of the older source version are removed
+                    if entry['mtime_ns'] > self._index[key]['mtime_ns']:
+                        self._remove_files(self._index[key]['stem'])
+                        continue
+                    self._remove_files(entry.get('stem', key))
+                index[key] = self._index[key]
+            self._index = index
+            self._changed = set()
+            self._touched = set()
+            self._removed = {}
+            self._evict(keep)
+
+            tmp_file = f"{self._index_file}.{os.getpid()}.tmp"
+            with open(tmp_file, 'w') as file:
+                json.dump(self._index, file)
+            os.replace(tmp_file, self._index_file)
+            self._removed = {}
+
+    def flush(self):
+        if self._changed or self._touched or self._removed:
+            self._write_index()
+
+    def _paths(self, stem):
+        return [os.path.join(self.cache_dir, stem + '_f.npy'),
+                os.path.join(self.cache_dir, stem + '_s.npy')]
+
+    def _remove_files(self, stem):
+        # on Windows, files which are still mapped can not be removed
+        for path in self._paths(stem):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _remove(self, key):
+        stem = self._index.pop(key).get('stem', key)
+        self._remove_files(stem)
+        self._changed.discard(key)
+        self._touched.discard(key)
+        self._removed[key] = stem
+
+    def _is_valid(self, entry, filename, stat):
+        if entry['size'] != stat.st_size:
+            return False
+        if self.validate == 'mtime':
+            return entry['mtime_ns'] == stat.st_mtime_ns
+        return entry['hash'] == _file_hash(filename)
+
+    def _evict(self, keep):
+        while self.size() > self.max_size:
+            candidates = [key for key in self._index if key != keep]
+            if not candidates:
+                break
+            oldest = min(candidates, key=lambda k: self._index[k]['last_access'])
+            self._remove(oldest)
+            self.stats['evictions'] += 1
+
+    def size(self):
+        return sum(entry['nbytes'] for entry in self._index.values())
+
+    def clear(self):
+        for key in list(self._index):
+            self._remove(key)
+        self._write_index()
+
+    def load(self, filename):
+
+        """
+        Reads a Touchstone file. If a valid sidecar exists, the arrays are
+        memory-mapped (read-only), otherwise the file is parsed and the
+        sidecar is written.
+
+        Parameters:
+            filename: string which stores the filename (including path)
+
+        Returns:
+            NumPorts, fLen, f, SParams (same structure as read_touchstone)
+        """
+        start = time.perf_counter()
+
+        filename = os.path.abspath(os.fspath(filename))
+        key = hashlib.sha1(filename.encode('utf-8')).hexdigest()
+        stat = os.stat(filename)
+
+        entry = self._index.get(key)
+        hit = False
+        if entry is not None and self._is_valid(entry, filename, stat):
+            [path_f, path_s] = self._paths(entry.get('stem', key))
+            try:
+                f = np.load(path_f, mmap_mode='r')
+                s = np.load(path_s, mmap_mode='r')
+                hit = True
+            except (OSError, ValueError):
+                pass
+
+        if not hit:
+            [f, s, port_imp] = read_touchstone_array(filename)
+            if entry is not None:
+                self._remove(key)
+            # new names for every version of the source file
+            stem = f"{key}_{time.time_ns():x}_{os.getpid():x}"
+            [path_f, path_s] = self._paths(stem)
+            for path, array in ((path_f, f), (path_s, s)):
+                tmp_file = path + '.tmp'
+                with open(tmp_file, 'wb') as file:
+                    np.save(file, array)
+                os.replace(tmp_file, path)
+            self._index[key] = {'source': filename,
+                                'stem': stem,
+                                'size': stat.st_size,
+                                'mtime_ns': stat.st_mtime_ns,
+                                'hash': _file_hash(filename) if self.validate == 'hash' else None,
+                                'port_imp': port_imp,
+                                'nbytes': os.path.getsize(path_f) + os.path.getsize(path_s),
+                                'last_access': time.time()}
+            self._changed.add(key)
+            self._write_index(keep=key)
+        else:
+            self._index[key]['last_access'] = time.time()
+            self._touched.add(key)
+
+        SParams = SParameterSet(f, s)
+        NumPorts = SParams.NumPorts
+        fLen = SParams.fLen
+
+        if hit:
+            self.stats['hits'] += 1
+            self.stats['time_hit'] += time.perf_counter() - start
+        else:
+            self.stats['misses'] += 1
+            self.stats['time_miss'] += time.perf_counter() - start
+
+        return [NumPorts,
+                fLen,
+                f,
+                SParams]
+
+
+
+# default cache, created on first use
+_default_cache = None
+
+
+'''
+    This function reads a Touchstone file through a TouchstoneCache. If no
+    cache is given, a default cache in the user's home directory is used.
+
+    Input Parameters:
+        filename: string which stores the filename (including path) of the
+                  .sNp file
+        cache: TouchstoneCache object (optional)
+
+    Output Parameters:
+        NumPorts: number of ports
+        fLen: number of measured points
+        f: frequency vector (memory-mapped on a cache hit)
+        SParams: S-Parameters as SParameterSet, can be accessed by
+                 keyword(e.g. SParams['S11'])
+'''
+def load_touchstone_cached(filename,
+                           cache=None):
+
+    global _default_cache
+
+    if cache is None:
+        if _default_cache is None:
+            _default_cache = TouchstoneCache()
+            atexit.register(_default_cache.flush)
+        cache = _default_cache
+
+    return cache.load(filename)
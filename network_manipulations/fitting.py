@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+This file contains functions to extract equivalent-circuit values out of
+impedance curves (e.g. the output of calc_imp_batch). The series RLC model
+
+    Z = R + j*(w*L - 1/(w*C))
+
+is linear in R, L and 1/C. Therefore the values are found by a weighted
+linear least-squares fit, which is solved for all parts at once (one 2x2
+system per part, batched).
+
+Implemented functions:
+    eval_series_RLC: calculates the impedance of series RLC circuits
+    find_SRF: finds the self-resonant frequency out of the measured curve
+    fit_series_RLC: fits series R, L and C to impedance curves
+    fit_capacitor: extracts C, ESR, ESL and SRF of capacitors
+"""
+
+# needed packages
+import numpy as np
+
+
+'''
+    This function brings the frequency vector and the impedance curves into
+    a common form and restricts them to the given frequency range.
+
+    Input Parameters:
+        f: frequency vector (F,)
+        Z: complex impedance array (K, F) or (F,)
+        fmin: lower limit of the frequency range (optional)
+        fmax: upper limit of the frequency range (optional)
+
+    Output Parameters:
+        f: frequency vector inside the range
+        Z: impedance array (K, F) inside the range
+'''
+def _prepare_fit(f,
+                 Z,
+                 fmin=None,
+                 fmax=None):
+
+    f = np.asarray(f, dtype=np.float64)
+    Z = np.atleast_2d(np.asarray(Z))
+
+    if Z.shape[-1] != len(f):
+        raise Exception('The number of measurement points of f and Z does not match')
+
+    mask = np.ones(len(f), dtype=bool)
+    if fmin is not None:
+        mask &= f >= fmin
+    if fmax is not None:
+        mask &= f <= fmax
+    if np.count_nonzero(mask) < 3:
+        raise Exception('At least three frequency points are needed for the fit')
+
+    if not mask.all():
+        f = f[mask]
+        Z = Z[:, mask]
+
+    return [f, Z]
+
+
+
+'''
+    This function calculates the impedance of series RLC circuits.
+
+    Input Parameters:
+        f: frequency vector (F,)
+        R: resistance (scalar or (K,))
+        L: inductance (scalar or (K,))
+        C: capacitance (scalar or (K,)), np.inf for no capacitor
+
+    Output Parameters:
+        Z: complex impedance array (K, F) (or (F,) for scalar values)
+'''
+def eval_series_RLC(f,
+                    R,
+                    L,
+                    C):
+
+    omega = 2 * np.pi * np.asarray(f, dtype=np.float64)
+    R = np.asarray(R, dtype=np.float64)[..., np.newaxis]
+    L = np.asarray(L, dtype=np.float64)[..., np.newaxis]
+    C = np.asarray(C, dtype=np.float64)[..., np.newaxis]
+
+    return R + 1j * (omega * L - 1 / (omega * C))
+
+
+
+'''
+    This function finds the self-resonant frequency (first zero crossing of
+    the reactance from capacitive to inductive) of measured impedance curves.
+    The crossing is interpolated linearly between the two neighbouring points.
+    Points with a non-finite reactance (NaN, inf, e.g. at f = 0) are skipped,
+    the crossing is searched between the neighbouring valid points.
+
+    Input Parameters:
+        f: frequency vector (F,)
+        Z: complex impedance array (K, F) or (F,)
+
+    Output Parameters:
+        SRF: self-resonant frequency (K,), NaN if there is no crossing
+'''
+def find_SRF(f,
+             Z):
+
+    [f, Z] = _prepare_fit(f, Z)
+    X = Z.imag
+    valid = np.isfinite(X)
+
+    # index of the previous valid point of every point (-1: none)
+    last = np.maximum.accumulate(np.where(valid, np.arange(len(f)), -1), axis=1)
+    prev = np.concatenate([np.full((X.shape[0], 1), -1), last[:, :-1]], axis=1)
+    X_prev = np.take_along_axis(X, np.maximum(prev, 0), axis=1)
+
+    crossing = valid & (prev >= 0) & (X_prev < 0) & (X >= 0)
+    found = crossing.any(axis=1)
+    idx = np.argmax(crossing, axis=1)
+
+    rows = np.arange(X.shape[0])
+    idx_1 = prev[rows, idx]
+    X_1 = X[rows, idx_1]
+    X_2 = X[rows, idx]
+    with np.errstate(invalid='ignore'):
+        SRF = f[idx_1] + (f[idx] - f[idx_1]) * X_1 / (X_1 - X_2)
+
+    SRF[~found] = np.nan
+
+    return SRF
+
+
+
+'''
+    This function fits a series RLC circuit to impedance curves. The real part
+    gives R, the reactance X = w*L - 1/(w*C) is linear in L and D = 1/C. For
+    every part the weighted normal equations (a 2x2 system) are set up with
+    one einsum and solved together with np.linalg.solve.
+
+    Input Parameters:
+        f: frequency vector (F,)
+        Z: complex impedance array (K, F) or (F,), e.g. out of calc_imp_batch
+        weight: 'relative' weights every point with 1/|Z|^2, so all decades
+                count the same (recommended for loglog curves)
+                'none' for an unweighted fit
+                An array (F,) or (K, F) gives user-defined weights
+        fmin: lower limit of the used frequency range (optional)
+        fmax: upper limit of the used frequency range (optional)
+        Points with a non-finite impedance (NaN, inf) and points at f <= 0
+        (where the model is singular) are ignored. Every part needs at least
+        two usable points.
+
+    Output Parameters:
+        R: series resistance (K,)
+        L: series inductance (K,)
+        C: series capacitance (K,), np.inf if no capacitive part was found
+'''
+def fit_series_RLC(f,
+                   Z,
+                   weight='relative',
+                   fmin=None,
+                   fmax=None):
+
+    f_full = np.asarray(f, dtype=np.float64)
+    [f, Z] = _prepare_fit(f_full, Z, fmin, fmax)
+
+    if isinstance(weight, str):
+        if weight == 'relative':
+            W = 1 / np.maximum(Z.real**2 + Z.imag**2, np.finfo(np.float64).tiny)
+        elif weight == 'none':
+            W = np.ones(Z.shape)
+        else:
+            raise ValueError('ERROR: No valid keyword for weight found.')
+    else:
+        W = np.broadcast_to(np.atleast_2d(weight), (Z.shape[0], len(f_full)))
+        if len(f) != len(f_full):
+            W = W[:, (f_full >= f[0]) & (f_full <= f[-1])]
+
+    # the model is singular at f = 0, these points are dropped
+    positive = f > 0
+    if not positive.all():
+        f = f[positive]
+        Z = Z[:, positive]
+        W = W[:, positive]
+
+    # non-finite points get the weight 0
+    valid = np.isfinite(Z)
+    W = np.where(valid, W, 0)
+    Z = np.where(valid, Z, 0)
+    usable = np.count_nonzero(W > 0, axis=1)
+    if np.any(usable < 2):
+        raise Exception(f"Less than two usable frequency points for part(s) {np.flatnonzero(usable < 2).tolist()}")
+
+    omega = 2 * np.pi * f
+    # basis functions of the reactance: X = L * omega + D * (-1/omega)
+    Basis = np.stack([omega, -1 / omega])
+
+    # normal equations A * [L, D] = b for every part
+    A = np.einsum('kf,if,jf->kij', W, Basis, Basis)
+    b = np.einsum('kf,if,kf->ki', W, Basis, Z.imag)
+
+    # scale the system, omega spans many decades
+    scale = np.sqrt(np.einsum('kii->ki', A))
+    A = A / (scale[:, :, np.newaxis] * scale[:, np.newaxis, :])
+    b = b / scale
+    [L, D] = (np.linalg.solve(A, b[..., np.newaxis])[..., 0] / scale).T
+
+    R = np.einsum('kf,kf->k', W, Z.real) / W.sum(axis=1)
+
+    with np.errstate(divide='ignore'):
+        C = np.where(D > 0, 1 / D, np.inf)
+
+    return [R,
+            L,
+            C]
+
+
+
+'''
+    This function extracts the parasitic elements of capacitors out of their
+    impedance curves: capacitance, equivalent series resistance (ESR),
+    equivalent series inductance (ESL) and the self-resonant frequency.
+
+    Input Parameters:
+        f: frequency vector (F,)
+        Z: complex impedance array (K, F) or (F,)
+        weight: weighting of the fit (see fit_series_RLC)
+        fmin: lower limit of the used frequency range (optional)
+        fmax: upper limit of the used frequency range (optional)
+
+    Output Parameters:
+        C: capacitance (K,)
+        ESR: equivalent series resistance (K,)
+        ESL: equivalent series inductance (K,)
+        SRF: self-resonant frequency 1/(2*pi*sqrt(ESL*C)) of the fitted
+             model (K,), NaN if ESL <= 0 or no capacitance was found
+             (C = inf)
+'''
+def fit_capacitor(f,
+                  Z,
+                  weight='relative',
+                  fmin=None,
+                  fmax=None):
+
+    [ESR, ESL, C] = fit_series_RLC(f, Z, weight, fmin, fmax)
+
+    with np.errstate(invalid='ignore'):
+        SRF = 1 / (2 * np.pi * np.sqrt(ESL * C))
+    SRF[~(ESL > 0) | ~np.isfinite(C)] = np.nan
+
+    return [C,
+            ESR,
+            ESL,
+            SRF]
@@ -1,12 +1,17 @@
 # -*- coding: utf-8 -*-
 """
-last change: 14.11.2025
+last change: 17.10.2026
 Author(s): Christoph Maier
 
 The following classes are stored here:
     MixedModeParameter: A class to store the mixed-mode parameter.
+    SParameterSet: A class to store S-parameters in one contiguous array.
+    MixedModeAccessor: A class to access mixed-mode parameters on demand.
 """
 
+from collections.abc import Mapping
+import numpy as np
+
 
 
 """
@@ -15,8 +20,13 @@ The following classes are stored here:
     kind of S-parameters, calculating the response to differential-mode (DM) 
     and common-mode (CM) signals. 
 
+    All parameters are stored in one complex array of shape (fLen, 4, 4) in
+    the mode order [DM @P1, CM @P1, DM @P2, CM @P2] (same order as S_to_MM and
+    the R&S export). The single parameters are views into this array.
+
     Attributes:
-        frequency (list): A list of the frequency points.
+        frequency (array): The frequency points.
+        data (array): complex mixed-mode parameter array (fLen, 4, 4)
         
         Differential-to-Differential S-parameters:
         - Sdd11: DM excitation @P1; DM measurement @P1
@@ -43,43 +53,370 @@ The following classes are stored here:
         - Scc22: CM excitation @P2; CM measurement @P2
 
     Methods:
-        None
+        from_array: create the object out of a (fLen, 4, 4) array
+        from_S_to_MM: create the object out of the output of S_to_MM
+        from_network: create the object out of a network object
 """
 class MixedModeParameter:
-    def __init__(self, frequency, sdd11_re, sdd11_im, sdd12_re, sdd12_im,
-                 sdc11_re, sdc11_im, sdc12_re, sdc12_im, sdd21_re, sdd21_im,
-                 sdd22_re, sdd22_im, sdc21_re, sdc21_im, sdc22_re, sdc22_im,
-                 scd11_re, scd11_im, scd12_re, scd12_im, scc11_re, scc11_im,
-                 scc12_re, scc12_im, scd21_re, scd21_im, scd22_re, scd22_im,
-                 scc21_re, scc21_im, scc22_re, scc22_im):
+    __slots__ = ('frequency', 'data')
+
+    # order of the legacy constructor arguments
+    _legacy_order = ['Sdd11', 'Sdd12', 'Sdc11', 'Sdc12', 'Sdd21', 'Sdd22', 'Sdc21', 'Sdc22',
+                     'Scd11', 'Scd12', 'Scc11', 'Scc12', 'Scd21', 'Scd22', 'Scc21', 'Scc22']
+
+    def __init__(self, frequency, *args):
         
         """
-        Initializes the MixedModeParameter class by combining the real and
-        imaginary parts of the S-parameters into lists of complex numbers for
-        each parameter.
+        Initializes the MixedModeParameter class.
     
         Parameters:
             frequency (list): A list of frequency points.
-            sdd11_re, sdd11_im, ..., scc22_im (list): Real and imaginary parts
-                                                    of the S-parameters.
-    
-        Each S-parameter is represented as a list of complex numbers
-        corresponding to each frequency point.
-        """
-        self.frequency = frequency
-        self.Sdd11 = [complex(r,i) for r, i in zip(sdd11_re, sdd11_im)]
-        self.Sdd12 = [complex(r,i) for r, i in zip(sdd12_re, sdd12_im)]
-        self.Sdc11 = [complex(r,i) for r, i in zip(sdc11_re, sdc11_im)]
-        self.Sdc12 = [complex(r,i) for r, i in zip(sdc12_re, sdc12_im)]
-        self.Sdd21 = [complex(r,i) for r, i in zip(sdd21_re, sdd21_im)]
-        self.Sdd22 = [complex(r,i) for r, i in zip(sdd22_re, sdd22_im)]
-        self.Sdc21 = [complex(r,i) for r, i in zip(sdc21_re, sdc21_im)]
-        self.Sdc22 = [complex(r,i) for r, i in zip(sdc22_re, sdc22_im)]
-        self.Scd11 = [complex(r,i) for r, i in zip(scd11_re, scd11_im)]
-        self.Scd12 = [complex(r,i) for r, i in zip(scd12_re, scd12_im)]
-        self.Scc11 = [complex(r,i) for r, i in zip(scc11_re, scc11_im)]
-        self.Scc12 = [complex(r,i) for r, i in zip(scc12_re, scc12_im)]
-        self.Scd21 = [complex(r,i) for r, i in zip(scd21_re, scd21_im)]
-        self.Scd22 = [complex(r,i) for r, i in zip(scd22_re, scd22_im)]
-        self.Scc21 = [complex(r,i) for r, i in zip(scc21_re, scc21_im)]
-        self.Scc22 = [complex(r,i) for r, i in zip(scc22_re, scc22_im)]
+            args: either one complex array of shape (fLen, 4, 4), or (like in
+                  former versions) the 32 lists sdd11_re, sdd11_im, sdd12_re,
+                  sdd12_im, sdc11_re, ..., scc22_im with the real and
+                  imaginary parts of the S-parameters.
+        """
+        self.frequency = np.asarray(frequency)
+
+        if len(args) == 1:
+            data = np.asarray(args[0])
+            if data.ndim != 3 or data.shape[1:] != (4, 4):
+                raise Exception('Mixed-mode array must have the shape (fLen, 4, 4)')
+            self.data = data if data.flags.c_contiguous else np.ascontiguousarray(data)
+        elif len(args) == 32:
+            self.data = np.empty((len(self.frequency), 4, 4), dtype=np.complex128)
+            for idx, name in enumerate(self._legacy_order):
+                [row, column] = _MM_INDEX[name]
+                self.data[:, row, column].real = args[2*idx]
+                self.data[:, row, column].imag = args[2*idx + 1]
+        else:
+            raise Exception('MixedModeParameter needs one (fLen, 4, 4) array or 32 real/imag vectors')
+
+    def __repr__(self):
+        return f"MixedModeParameter(fLen={self.data.shape[0]})"
+
+    @classmethod
+    def from_array(cls, frequency, data):
+        return cls(frequency, data)
+
+    @classmethod
+    def from_S_to_MM(cls, dict_out, frequency=None):
+
+        """
+        Creates the object out of the output of S_to_MM (no copy if the
+        output is a SParameterSet).
+
+        Parameters:
+            dict_out: MM-parameters as returned by S_to_MM
+            frequency: frequency vector (taken from dict_out if not given)
+        """
+        if isinstance(dict_out, SParameterSet):
+            if frequency is None:
+                frequency = dict_out.f
+            return cls(frequency, dict_out.s)
+
+        labels = ["dd", "dc", "cd", "cc"]
+        keys = [f"S{labels[i]}{labels[j]}" for i in range(4) for j in range(4)]
+        data = SParameterSet.from_dict(frequency, dict_out, keys).s
+
+        return cls(frequency, data)
+
+    @classmethod
+    def from_network(cls, InputNetwork, is_mixed_mode=False):
+
+        """
+        Creates the object out of a 4-port network object.
+
+        Parameters:
+            InputNetwork: 4-port network object
+            is_mixed_mode: False if the network stores single-ended
+                           S-parameters (they are transformed with S_to_MM),
+                           True if it already stores the MM-parameters in
+                           the order [DM @P1, CM @P1, DM @P2, CM @P2]
+        """
+        if InputNetwork.s.shape[1:] != (4, 4):
+            raise Exception('Mixed-mode parameters need a 4-port network')
+
+        if is_mixed_mode:
+            return cls(InputNetwork.f, InputNetwork.s)
+
+        # imported here, SParams itself imports this module
+        from .SParams import S_to_MM
+
+        return cls.from_S_to_MM(S_to_MM(InputNetwork))
+
+
+
+# position of the single mixed-mode parameters in the (fLen, 4, 4) array
+_MM_INDEX = {f"S{mode_out}{mode_in}{port_out}{port_in}":
+                 (2*(port_out - 1) + 'dc'.index(mode_out), 2*(port_in - 1) + 'dc'.index(mode_in))
+             for mode_out in 'dc' for mode_in in 'dc' for port_out in (1, 2) for port_in in (1, 2)}
+
+for _name, [_row, _column] in _MM_INDEX.items():
+    setattr(MixedModeParameter, _name,
+            property(lambda self, row=_row, column=_column: self.data[:, row, column]))
+
+
+
+"""
+    A class to store a set of S-parameters (or MM-parameters) in one
+    contiguous complex array of shape (fLen, NumPorts, NumPorts), together with
+    the frequency vector. The single parameters can be accessed by keyword,
+    like in a dict (e.g. SParams['S21']). The returned arrays are views into
+    the common buffer, no data is copied.
+
+    Attributes:
+        f: frequency vector (None if unknown)
+        s: complex parameter array (fLen, NumPorts, NumPorts)
+        NumPorts: number of ports
+        fLen: number of frequency points
+        owner: object which is kept alive as long as the set (e.g. the
+               temporary directory of a memory-mapped buffer), or None
+
+    Methods:
+        keys/items/values/get: same as for a dict
+        to_dict: convert into a dict of (view) arrays
+        from_dict: create the object out of a S-parameter dict
+"""
+class SParameterSet(Mapping):
+    def __init__(self, f, s, keys=None, owner=None):
+
+        """
+        Initializes the SParameterSet class.
+
+        Parameters:
+            f: frequency vector (can be None)
+            s: complex parameter array (fLen, NumPorts, NumPorts)
+            keys: list of NumPorts**2 keywords in row-major order. If not
+                  given, the keys are 'S11', 'S12', ..., 'SNN'.
+            owner: object which has to live as long as the set, e.g. the
+                   temporary directory the buffer is mapped from (optional)
+        """
+        s = np.asarray(s)
+        if s.ndim != 3 or s.shape[1] != s.shape[2]:
+            raise Exception('S-parameter array must have the shape (fLen, NumPorts, NumPorts)')
+
+        self.f = None if f is None else np.asarray(f)
+        self.s = s if s.flags.c_contiguous else np.ascontiguousarray(s)
+        self.NumPorts = s.shape[1]
+        self.fLen = s.shape[0]
+        self.owner = owner
+
+        if keys is None:
+            keys = [f"S{row+1}{column+1}" for row in range(self.NumPorts)
+                                          for column in range(self.NumPorts)]
+        elif len(keys) != self.NumPorts**2:
+            raise Exception(f"Number of keys ({len(keys)}) does not match number of S-parameters ({self.NumPorts**2})")
+
+        self._index = {key: divmod(idx, self.NumPorts) for idx, key in enumerate(keys)}
+
+    def __getitem__(self, key):
+        [row, column] = self._index[key]
+        return self.s[:, row, column]
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __repr__(self):
+        return f"SParameterSet(NumPorts={self.NumPorts}, fLen={self.fLen})"
+
+    def to_dict(self):
+        return {key: self[key] for key in self._index}
+
+    @classmethod
+    def from_dict(cls, f, dict_in, keys=None):
+
+        """
+        Creates a SParameterSet out of a S-parameter dict. The dict entries
+        are copied once into the common buffer.
+
+        Parameters:
+            f: frequency vector (can be None)
+            dict_in: S-parameter dict (NumPorts**2 entries)
+            keys: order of the keys (row-major). If not given, the order of
+                  the dict is used.
+        """
+        if keys is None:
+            keys = list(dict_in.keys())
+        NumPorts = int(round(np.sqrt(len(keys))))
+        if NumPorts**2 != len(keys):
+            raise Exception('Number of S-parameters in dict is not a square number')
+
+        s = np.stack([dict_in[key] for key in keys], axis=-1)
+        s = s.reshape(s.shape[0], NumPorts, NumPorts)
+
+        return cls(f, s, keys)
+
+
+
+"""
+    A class to access the mixed-mode parameters of a 2N-port by keyword (e.g.
+    MM['Sdd21']), without calculating the whole mixed-mode matrix. Every
+    requested parameter is calculated on its first access out of one row and
+    one column of the (sparse) transform, i.e. out of four single-ended
+    parameters, and then cached:
+
+        Smm[i, j] = 1/2 * (S[a, c] + s_j S[a, d] + s_i S[b, c] + s_i s_j S[b, d])
+
+    with the port pairs (a, b), (c, d) of the modes i, j and the signs
+    s = -1 (differential mode) or s = +1 (common mode). If the network
+    already stores mixed-mode parameters (e.g. a R&S export with the labels
+    're:Sdd11', ...), the parameters are returned as views.
+
+    Attributes:
+        f: frequency vector
+        NumPorts: number of single-ended ports
+        NumPairs: number of mixed-mode ports
+        pairing: port pairing ((positive port, negative port), 1-based)
+        is_mixed_mode: True if the source data is already mixed-mode
+
+    Methods:
+        keys/items/values/get: same as for a dict (keys in the order of
+                               S_to_MM_nport, e.g. 'Sdd11', 'Sdc11', ...)
+        to_SParameterSet: all mixed-mode parameters as SParameterSet
+        from_file: create the object out of a Touchstone file
+        from_network: create the object out of a network object
+"""
+class MixedModeAccessor(Mapping):
+    def __init__(self, SParams, pairing=None, convention='interleaved', keys=None):
+
+        """
+        Initializes the MixedModeAccessor class.
+
+        Parameters:
+            SParams: SParameterSet or network object (single-ended data, or
+                     mixed-mode data if keys is given)
+            pairing: list of port pairs (positive port, negative port),
+                     1-based. Overrides the convention.
+            convention: named port ordering, 'interleaved' for the pairs
+                        (1,2), (3,4), ... or 'grouped' for (1,N+1), (2,N+2), ...
+            keys: if the source already stores mixed-mode parameters, the
+                  keys in the stored (row-major) order, e.g. the labels of
+                  the file. They are validated.
+        """
+        # imported here, SParams itself imports this module
+        from .SParams import _check_pairing, _convention_pairing, _MM_key_order, _MM_keys
+
+        self.f = SParams.f
+        self._s = np.asarray(SParams.s)
+        self.NumPorts = self._s.shape[1]
+        self.NumPairs = self.NumPorts // 2
+        self.is_mixed_mode = keys is not None
+
+        if self.is_mixed_mode:
+            self.pairing = None
+            self._stored = SParameterSet(self.f, self._s, _MM_key_order(self.NumPorts, keys))
+        else:
+            if pairing is None:
+                pairing = _convention_pairing(self.NumPorts, convention)
+            self.pairing = _check_pairing(self.NumPorts, pairing)
+
+        self._keys = _MM_keys(self.NumPairs)
+        self._index = {key: divmod(idx, self.NumPorts) for idx, key in enumerate(self._keys)}
+        self._cache = {}
+
+    def _mode(self, idx):
+        [port_p, port_n] = self.pairing[idx // 2]
+        sign = -1 if idx % 2 == 0 else 1
+        return [port_p - 1, port_n - 1, sign]
+
+    def __getitem__(self, key):
+        if key in self._cache:
+            return self._cache[key]
+
+        if self.is_mixed_mode:
+            value = self._stored[key]
+        else:
+            [row, column] = self._index[key]
+            [a, b, sign_i] = self._mode(row)
+            [c, d, sign_j] = self._mode(column)
+            s = self._s
+            value = 0.5 * (s[:, a, c] + sign_j * s[:, a, d] + sign_i * s[:, b, c] + sign_i * sign_j * s[:, b, d])
+
+        self._cache[key] = value
+        return value
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return f"MixedModeAccessor(NumPairs={self.NumPairs}, cached={len(self._cache)})"
+
+    def to_SParameterSet(self):
+
+        """
+        Returns all mixed-mode parameters as SParameterSet (keys in the order
+        of S_to_MM_nport). For single-ended data, the full transform is
+        calculated in one batched matrix product.
+        """
+        if self.is_mixed_mode:
+            return SParameterSet.from_dict(self.f, self._stored, self._keys)
+
+        from .SParams import S_to_MM_nport
+
+        return S_to_MM_nport(SParameterSet(self.f, self._s), self.pairing)
+
+    @classmethod
+    def from_file(cls, filename, pairing=None, convention='interleaved'):
+
+        """
+        Creates the object out of a Touchstone file. If the header contains
+        mixed-mode labels (e.g. 're:Sdd11'), the data is taken as mixed-mode
+        data in the order of the labels.
+
+        Parameters:
+            filename: string which stores the filename (including path)
+            pairing: list of port pairs (see __init__)
+            convention: named port ordering (see __init__)
+        """
+        from .touchstone import read_touchstone_array, read_touchstone_labels
+
+        [f, s, port_imp] = read_touchstone_array(filename)
+        labels = read_touchstone_labels(filename)
+
+        return cls(SParameterSet(f, s), pairing, convention, _mixed_mode_labels(labels, s.shape[1]))
+
+    @classmethod
+    def from_network(cls, InputNetwork, pairing=None, convention='interleaved'):
+
+        """
+        Creates the object out of a network object. If the comments of the
+        network contain mixed-mode labels (e.g. 're:Sdd11'), the data is taken
+        as mixed-mode data in the order of the labels.
+
+        Parameters:
+            InputNetwork: network object
+            pairing: list of port pairs (see __init__)
+            convention: named port ordering (see __init__)
+        """
+        from .touchstone import _network_labels
+
+        labels = _network_labels(InputNetwork)
+
+        return cls(InputNetwork, pairing, convention, _mixed_mode_labels(labels, InputNetwork.s.shape[1]))
+
+
+
+'''
+    This function checks whether parameter labels are mixed-mode labels.
+
+    Input Parameters:
+        labels: list of labels (e.g. ['Sdd11', ...] or ['S11', ...])
+        NumPorts: number of ports
+
+    Output Parameters:
+        keys: labels if they are a set of mixed-mode labels, otherwise None
+'''
+def _mixed_mode_labels(labels,
+                       NumPorts):
+
+    if len(labels) == NumPorts**2 and all(label[1:3].isalpha() for label in labels):
+        return labels
+
+    return None
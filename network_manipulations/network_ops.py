@@ -0,0 +1,608 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+This file contains functions to convert, cascade and de-embed networks. All
+functions work on the whole (F, N, N) stack at once (batched np.linalg.solve
+and matmul), there are no loops over the frequency points. Cascading uses
+the star product of the S-parameters, de-embedding the T-parameters. The
+blocks of the star product and the T-parameters are small (N x N), for them
+the products are done with einsum and the systems up to 2x2 are solved in
+closed form (np.matmul and np.linalg.solve have a large overhead per matrix).
+
+For cascading, a 2N-port is split into two sides: by default ports 1..N
+(side 1) and ports N+1..2N (side 2). Side 2 of the first network is connected
+to side 1 of the next one (e.g. for a 4-port channel: ports 1, 2 -> ports
+3, 4). Other port orders (e.g. thru paths 1 -> 2 and 3 -> 4) are selected
+with the argument ports=(1, 3), which lists the ports of side 1.
+
+Implemented functions:
+    s2z, z2s: conversion between S- and Z-parameters
+    s2y, y2s: conversion between S- and Y-parameters
+    s2abcd, abcd2s: conversion between S- and ABCD-parameters (2-port)
+    s2t, t2s: conversion between S- and T-parameters (2N-port)
+    flip_ports: swaps side 1 and side 2 of a 2N-port
+    cascade: cascades several 2N-ports
+    deembed: removes fixtures on one or both sides of a measurement
+    split_2xthru: splits a symmetric 2x-thru into its two fixture halves
+"""
+
+# needed packages
+import numpy as np
+
+from .myclasses import SParameterSet
+
+
+'''
+    This function takes the different representations of S-parameters
+    (network object, SParameterSet, dict or (F, N, N) array) and returns the
+    frequency vector and the S-array.
+
+    Input Parameters:
+        SParams: network object, SParameterSet, dict or array
+        f: frequency vector (only used for array input)
+
+    Output Parameters:
+        f: frequency vector (None if not known)
+        s: complex S-array (F, N, N)
+'''
+def _as_array(SParams,
+              f=None):
+
+    if isinstance(SParams, np.ndarray):
+        s = SParams
+    elif isinstance(SParams, dict):
+        SParams = SParameterSet.from_dict(f, SParams)
+        [f, s] = [SParams.f, SParams.s]
+    else:
+        [f, s] = [SParams.f, SParams.s]
+
+    if s.ndim != 3 or s.shape[1] != s.shape[2]:
+        raise Exception('S-parameter array must have the shape (F, N, N)')
+
+    return [f,
+            s]
+
+
+
+'''
+    This function returns the result in the same form as the input: a
+    SParameterSet if the frequency vector is known, otherwise the array.
+
+    Input Parameters:
+        f: frequency vector (or None)
+        s: complex S-array (F, N, N)
+
+    Output Parameters:
+        SParams: SParameterSet or array
+'''
+def _as_result(f,
+               s):
+
+    if f is None:
+        return s
+
+    return SParameterSet(f, s)
+
+
+
+'''
+    This function calculates the port order [side 1, side 2] of a 2N-port.
+
+    Input Parameters:
+        NumPorts: number of ports
+        ports: ports of side 1 (1-based, e.g. (1, 3)). If None, ports 1..N.
+
+    Output Parameters:
+        order: port order (0-based), None for the default order
+'''
+def _port_order(NumPorts,
+                ports=None):
+
+    if ports is None:
+        return None
+
+    side_1 = [port - 1 for port in ports]
+    if 2 * len(side_1) != NumPorts or len(set(side_1)) != len(side_1) or not all(0 <= port < NumPorts for port in side_1):
+        raise Exception('ports must list half of the ' + str(NumPorts) + ' ports (side 1)')
+
+    return np.array(side_1 + [port for port in range(NumPorts) if port not in side_1])
+
+
+
+'''
+    This function reorders the ports of a (F, N, N) array.
+
+    Input Parameters:
+        s: complex array (F, N, N)
+        order: new port order (0-based), None for no reordering
+        inverse: if True, the inverse reordering is done
+
+    Output Parameters:
+        s: reordered array
+'''
+def _reorder(s,
+             order,
+             inverse=False):
+
+    if order is None:
+        return s
+    if inverse:
+        order = np.argsort(order)
+
+    return s[:, order][:, :, order]
+
+
+
+'''
+    This function splits a (F, 2N, 2N) array into its four (F, N, N) blocks.
+
+    Input Parameters:
+        s: complex array (F, 2N, 2N)
+
+    Output Parameters:
+        s11, s12, s21, s22: blocks of side 1 / side 2
+'''
+def _blocks(s):
+
+    NumPorts = s.shape[-1]
+    if NumPorts % 2:
+        raise Exception('Cascading needs an even number of ports (found ' + str(NumPorts) + ')')
+    half = NumPorts // 2
+
+    return [s[:, :half, :half],
+            s[:, :half, half:],
+            s[:, half:, :half],
+            s[:, half:, half:]]
+
+
+
+'''
+    This function assembles a (F, 2N, 2N) array out of four (F, N, N) blocks.
+
+    Input Parameters:
+        b11, b12, b21, b22: blocks
+
+    Output Parameters:
+        s: complex array (F, 2N, 2N)
+'''
+def _assemble(b11,
+              b12,
+              b21,
+              b22):
+
+    return np.concatenate([np.concatenate([b11, b12], axis=-1),
+                           np.concatenate([b21, b22], axis=-1)], axis=-2)
+
+
+
+'''
+    This function multiplies two stacks of small matrices (batched over the
+    first axis, same as a @ b).
+
+    Input Parameters:
+        a: complex array (F, N, M)
+        b: complex array (F, M, K)
+
+    Output Parameters:
+        c: complex array (F, N, K)
+'''
+def _matmul(a,
+            b):
+
+    return np.einsum('fij,fjk->fik', a, b)
+
+
+
+'''
+    This function solves a stack of small linear systems A X = B (same as
+    np.linalg.solve). Systems up to 2x2 are solved in closed form (Cramer's
+    rule), larger ones with np.linalg.solve.
+
+    Input Parameters:
+        A: complex array (F, N, N)
+        B: complex array (F, N, K)
+
+    Output Parameters:
+        X: complex array (F, N, K)
+'''
+def _solve(A,
+           B):
+
+    NumPorts = A.shape[-1]
+    if NumPorts > 2:
+        return np.linalg.solve(A, B)
+
+    if NumPorts == 1:
+        det = A[:, 0, 0]
+        if not np.all(det):
+            raise np.linalg.LinAlgError('Singular matrix')
+        return B / det[:, np.newaxis, np.newaxis]
+
+    [a, b, c, d] = [A[:, 0, 0], A[:, 0, 1], A[:, 1, 0], A[:, 1, 1]]
+    det = a * d - b * c
+    if not np.all(det):
+        raise np.linalg.LinAlgError('Singular matrix')
+    [B1, B2] = [B[:, 0, :], B[:, 1, :]]
+    X = np.empty(B.shape, dtype=np.result_type(A, B))
+    X[:, 0, :] = (d[:, np.newaxis] * B1 - b[:, np.newaxis] * B2) / det[:, np.newaxis]
+    X[:, 1, :] = (a[:, np.newaxis] * B2 - c[:, np.newaxis] * B1) / det[:, np.newaxis]
+
+    return X
+
+
+
+'''
+    This function converts S-parameters into Z-parameters,
+    Z = Z0 * (I - S)^-1 (I + S).
+
+    Input Parameters:
+        SParams: network object, SParameterSet, dict or array (F, N, N)
+        port_imp: port impedance (50 Ohm if not given)
+
+    Output Parameters:
+        Z: complex Z-parameter array (F, N, N)
+'''
+def s2z(SParams,
+        port_imp=50):
+
+    [f, s] = _as_array(SParams)
+    I = np.eye(s.shape[-1])
+
+    return port_imp * np.linalg.solve(I - s, I + s)
+
+
+
+'''
+    This function converts Z-parameters into S-parameters,
+    S = (Z + Z0)^-1 (Z - Z0).
+
+    Input Parameters:
+        Z: complex Z-parameter array (F, N, N)
+        port_imp: port impedance (50 Ohm if not given)
+        f: frequency vector (optional, a SParameterSet is returned if given)
+
+    Output Parameters:
+        SParams: S-parameters as SParameterSet (or array without f)
+'''
+def z2s(Z,
+        port_imp=50,
+        f=None):
+
+    Z0 = port_imp * np.eye(Z.shape[-1])
+
+    return _as_result(f, np.linalg.solve(Z + Z0, Z - Z0))
+
+
+
+'''
+    This function converts S-parameters into Y-parameters,
+    Y = 1/Z0 * (I + S)^-1 (I - S).
+
+    Input Parameters:
+        SParams: network object, SParameterSet, dict or array (F, N, N)
+        port_imp: port impedance (50 Ohm if not given)
+
+    Output Parameters:
+        Y: complex Y-parameter array (F, N, N)
+'''
+def s2y(SParams,
+        port_imp=50):
+
+    [f, s] = _as_array(SParams)
+    I = np.eye(s.shape[-1])
+
+    return np.linalg.solve(I + s, I - s) / port_imp
+
+
+
+'''
+    This function converts Y-parameters into S-parameters,
+    S = (I + Z0*Y)^-1 (I - Z0*Y).
+
+    Input Parameters:
+        Y: complex Y-parameter array (F, N, N)
+        port_imp: port impedance (50 Ohm if not given)
+        f: frequency vector (optional, a SParameterSet is returned if given)
+
+    Output Parameters:
+        SParams: S-parameters as SParameterSet (or array without f)
+'''
+def y2s(Y,
+        port_imp=50,
+        f=None):
+
+    I = np.eye(Y.shape[-1])
+
+    return _as_result(f, np.linalg.solve(I + port_imp * Y, I - port_imp * Y))
+
+
+
+'''
+    This function converts the S-parameters of a 2-port into ABCD-parameters.
+
+    Input Parameters:
+        SParams: network object, SParameterSet, dict or array (F, 2, 2)
+        port_imp: port impedance (50 Ohm if not given)
+
+    Output Parameters:
+        ABCD: complex ABCD-parameter array (F, 2, 2)
+'''
+def s2abcd(SParams,
+           port_imp=50):
+
+    [f, s] = _as_array(SParams)
+    if s.shape[-1] != 2:
+        raise Exception('ABCD-parameters are only defined for 2-ports')
+
+    [S11, S12, S21, S22] = [s[:, 0, 0], s[:, 0, 1], s[:, 1, 0], s[:, 1, 1]]
+    denom = 2 * S21
+    ABCD = np.empty(s.shape, dtype=complex)
+    ABCD[:, 0, 0] = ((1 + S11) * (1 - S22) + S12 * S21) / denom
+    ABCD[:, 0, 1] = port_imp * ((1 + S11) * (1 + S22) - S12 * S21) / denom
+    ABCD[:, 1, 0] = ((1 - S11) * (1 - S22) - S12 * S21) / (denom * port_imp)
+    ABCD[:, 1, 1] = ((1 - S11) * (1 + S22) + S12 * S21) / denom
+
+    return ABCD
+
+
+
+'''
+    This function converts ABCD-parameters of a 2-port into S-parameters.
+
+    Input Parameters:
+        ABCD: complex ABCD-parameter array (F, 2, 2)
+        port_imp: port impedance (50 Ohm if not given)
+        f: frequency vector (optional, a SParameterSet is returned if given)
+
+    Output Parameters:
+        SParams: S-parameters as SParameterSet (or array without f)
+'''
+def abcd2s(ABCD,
+           port_imp=50,
+           f=None):
+
+    [A, B, C, D] = [ABCD[:, 0, 0], ABCD[:, 0, 1] / port_imp, ABCD[:, 1, 0] * port_imp, ABCD[:, 1, 1]]
+    denom = A + B + C + D
+    s = np.empty(ABCD.shape, dtype=complex)
+    s[:, 0, 0] = (A + B - C - D) / denom
+    s[:, 0, 1] = 2 * (A * D - B * C) / denom
+    s[:, 1, 0] = 2 / denom
+    s[:, 1, 1] = (-A + B - C + D) / denom
+
+    return _as_result(f, s)
+
+
+
+'''
+    This function converts S-parameters of a 2N-port into T-parameters
+    (transfer parameters), defined by [b1; a1] = T [a2; b2] with the wave
+    vectors of side 1 (ports 1..N) and side 2 (ports N+1..2N). With this
+    definition, cascading is a plain matrix product T = T_1 @ T_2.
+
+    Input Parameters:
+        SParams: network object, SParameterSet, dict or array (F, 2N, 2N)
+        ports: ports of side 1 (default: ports 1..N)
+
+    Output Parameters:
+        T: complex T-parameter array (F, 2N, 2N), sides in the order
+           [side 1, side 2]
+'''
+def s2t(SParams,
+        ports=None):
+
+    [f, s] = _as_array(SParams)
+    s = _reorder(s, _port_order(s.shape[-1], ports))
+    [s11, s12, s21, s22] = _blocks(s)
+
+    # T22 = S21^-1, T21 = -S21^-1 S22 with one solve
+    [T22, T21] = np.split(_solve(s21, np.concatenate([np.broadcast_to(np.eye(s21.shape[-1]), s21.shape), -s22], axis=-1)), 2, axis=-1)
+    T12 = _matmul(s11, T22)
+    T11 = s12 + _matmul(s11, T21)
+
+    return _assemble(T11, T12, T21, T22)
+
+
+
+'''
+    This function converts T-parameters of a 2N-port into S-parameters.
+
+    Input Parameters:
+        T: complex T-parameter array (F, 2N, 2N)
+        f: frequency vector (optional, a SParameterSet is returned if given)
+        ports: ports of side 1 (default: ports 1..N)
+
+    Output Parameters:
+        SParams: S-parameters as SParameterSet (or array without f)
+'''
+def t2s(T,
+        f=None,
+        ports=None):
+
+    [T11, T12, T21, T22] = _blocks(T)
+
+    # S21 = T22^-1, S22 = -T22^-1 T21 with one solve
+    [s21, s22] = np.split(_solve(T22, np.concatenate([np.broadcast_to(np.eye(T22.shape[-1]), T22.shape), -T21], axis=-1)), 2, axis=-1)
+    s11 = _matmul(T12, s21)
+    s12 = T11 + _matmul(T12, s22)
+    s = _reorder(_assemble(s11, s12, s21, s22), _port_order(T.shape[-1], ports), inverse=True)
+
+    return _as_result(f, np.ascontiguousarray(s))
+
+
+
+'''
+    This function swaps side 1 and side 2 of a 2N-port (e.g. ports 1, 2 and
+    ports 3, 4 of a 4-port). Needed e.g. to use a left fixture on the right
+    side of a DUT.
+
+    Input Parameters:
+        SParams: network object, SParameterSet, dict or array (F, 2N, 2N)
+        ports: ports of side 1 (default: ports 1..N)
+
+    Output Parameters:
+        SParams: S-parameters with swapped sides (SParameterSet or array)
+'''
+def flip_ports(SParams,
+               ports=None):
+
+    [f, s] = _as_array(SParams)
+    NumPorts = s.shape[-1]
+    order = _port_order(NumPorts, ports)
+    if order is None:
+        order = np.arange(NumPorts)
+    half = NumPorts // 2
+
+    # port order[k] of side 1 takes the place of port order[k + half]
+    swap = np.empty(NumPorts, dtype=int)
+    swap[order] = np.r_[order[half:], order[:half]]
+
+    return _as_result(f, np.ascontiguousarray(_reorder(s, swap)))
+
+
+
+'''
+    This function connects side 2 of network A to side 1 of network B
+    (Redheffer star product). Compared to the product of the T-parameters,
+    S21 does not need to be inverted, so also networks with weak transmission
+    can be cascaded. Only one batched solve is needed:
+        X = (I - A22 B11)^-1 [A21, A22 B12]
+
+    Input Parameters:
+        a: S-array of network A (F, 2N, 2N), sides in the order [1, 2]
+        b: S-array of network B (F, 2N, 2N), sides in the order [1, 2]
+
+    Output Parameters:
+        s: S-array of the cascade (F, 2N, 2N)
+'''
+def _star_product(a,
+                  b):
+
+    [a11, a12, a21, a22] = _blocks(a)
+    [b11, b12, b21, b22] = _blocks(b)
+    I = np.eye(a11.shape[-1])
+
+    X = _solve(I - _matmul(a22, b11), np.concatenate([a21, _matmul(a22, b12)], axis=-1))
+    [X1, X2] = np.split(X, 2, axis=-1)
+    a12_b11 = _matmul(a12, b11)
+
+    return _assemble(a11 + _matmul(a12_b11, X1),
+                     _matmul(a12, b12) + _matmul(a12_b11, X2),
+                     _matmul(b21, X1),
+                     b22 + _matmul(b21, X2))
+
+
+
+'''
+    This function cascades several 2N-ports (side 2 of every network is
+    connected to side 1 of the next one).
+
+    Input Parameters:
+        *networks: network objects, SParameterSets, dicts or arrays
+                   (F, 2N, 2N) on the same frequency grid
+        ports: ports of side 1 (keyword only, default: ports 1..N)
+
+    Output Parameters:
+        SParams: S-parameters of the cascade (SParameterSet, or array if no
+                 frequency vector was given)
+'''
+def cascade(*networks,
+            ports=None):
+
+    if len(networks) < 2:
+        raise Exception('At least two networks are needed for cascading')
+
+    f = None
+    s_cascade = None
+    for ntwk in networks:
+        [f_ntwk, s] = _as_array(ntwk)
+        order = _port_order(s.shape[-1], ports)
+        if f is None:
+            f = f_ntwk
+        if s_cascade is None:
+            s_cascade = _reorder(s, order)
+        else:
+            if s_cascade.shape != s.shape:
+                raise Exception('The number of ports or measurement points of the networks do not agree')
+            s_cascade = _star_product(s_cascade, _reorder(s, order))
+
+    s_cascade = np.ascontiguousarray(_reorder(s_cascade, order, inverse=True))
+
+    return _as_result(f, s_cascade)
+
+
+
+'''
+    This function removes fixtures from a measurement:
+    T_DUT = T_left^-1 @ T_meas @ T_right^-1.
+
+    Input Parameters:
+        SMeas: measured S-parameters (network object, SParameterSet, dict or
+               array (F, 2N, 2N))
+        SLeft: fixture on side 1 (None if there is no fixture)
+        SRight: fixture on side 2 (None if there is no fixture). For a
+                symmetric setup, this is flip_ports(SLeft).
+        ports: ports of side 1 (default: ports 1..N)
+
+    Output Parameters:
+        SParams: de-embedded S-parameters of the DUT (SParameterSet, or array
+                 if no frequency vector was given)
+'''
+def deembed(SMeas,
+            SLeft=None,
+            SRight=None,
+            ports=None):
+
+    [f, s] = _as_array(SMeas)
+    T = s2t(s, ports)
+
+    if SLeft is not None:
+        T = np.linalg.solve(s2t(_as_array(SLeft)[1], ports), T)
+    if SRight is not None:
+        # T @ T_right^-1 = (T_right^-T @ T^T)^T
+        T_right = s2t(_as_array(SRight)[1], ports)
+        T = np.linalg.solve(T_right.swapaxes(-1, -2), T.swapaxes(-1, -2)).swapaxes(-1, -2)
+
+    return t2s(T, f, ports)
+
+
+
+'''
+    This function splits the measurement of a symmetric 2x-thru (two equal,
+    mirrored fixture halves connected directly) into the fixture halves. The
+    halves are assumed to be reciprocal and symmetric (S11 = S22), then
+        S11_half = S11_2x / (1 + S21_2x)
+        S21_half = sqrt(S21_2x * (1 - S11_half^2))
+    The root is taken with the unwrapped phase, so there are no jumps of 180
+    degree along the frequency axis.
+
+    Input Parameters:
+        S2xThru: S-parameters of the 2x-thru (2-port, network object,
+                 SParameterSet, dict or array (F, 2, 2))
+
+    Output Parameters:
+        SLeft: S-parameters of the left fixture half
+        SRight: S-parameters of the right fixture half (flipped left half)
+'''
+def split_2xthru(S2xThru):
+
+    [f, s] = _as_array(S2xThru)
+    if s.shape[-1] != 2:
+        raise Exception('The 2x-thru split is only implemented for 2-ports')
+
+    S11_2x = 0.5 * (s[:, 0, 0] + s[:, 1, 1])
+    S21_2x = 0.5 * (s[:, 1, 0] + s[:, 0, 1])
+
+    S11 = S11_2x / (1 + S21_2x)
+    S21_square = S21_2x * (1 - S11**2)
+    S21 = np.sqrt(np.abs(S21_square)) * np.exp(0.5j * np.unwrap(np.angle(S21_square)))
+
+    half = np.empty(s.shape, dtype=complex)
+    half[:, 0, 0] = S11
+    half[:, 1, 1] = S11
+    half[:, 0, 1] = S21
+    half[:, 1, 0] = S21
+
+    return [_as_result(f, half),
+            flip_ports(_as_result(f, half))]
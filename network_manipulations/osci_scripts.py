@@ -1,22 +1,225 @@
 # -*- coding: utf-8 -*-
 """
 author: Maier Christoph
-date: 18.06.2025
+date: 17.10.2026
 
 This module is a selection of functions for the manipulation of generated
 measurement data with an oscilloscope.
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib as mpl5
+
+# definition of constants
+DELIMITERS = [',', ';', '\t']      # candidates for the delimiter detection
+BLOCKSIZE = 16 * 2**20             # bytes read at once by the csv reader
+
+
+'''
+    This function detects the delimiter of an oscilloscope .csv file out of
+    its data lines (the header, e.g. 's,CH1[V]' in a ';' separated file, is
+    not used). A candidate is valid if it splits every data line into the
+    same number of numbers; of the valid candidates the one with the most
+    data lines and columns is taken (order of DELIMITERS on a tie, ' ' for
+    whitespace separated files last).
+    
+    Input Parameters:
+        lines       first lines of the file
+        
+    Output Parameters:
+        delimiter   detected delimiter
+'''
+def _sniff_delimiter(lines):
+    
+    def numbers(line, candidate):
+        fields = line.split(None if candidate == ' ' else candidate)
+        try:
+            [float(x) for x in fields]
+        except ValueError:
+            return 0
+        return len(fields)
+    
+    best = [' ', (0, 0)]
+    for candidate in DELIMITERS + [' ']:
+        counts = [numbers(line, candidate) for line in lines if line.strip()]
+        # data block: from the first line of numbers to the end
+        start = next((cnt for cnt, ncol in enumerate(counts) if ncol), None)
+        if start is None or len(set(counts[start:])) != 1:
+            continue
+        score = (len(counts) - start, counts[start])
+        if score > best[1]:
+            best = [candidate, score]
+    
+    return best[0]
+
+
+'''
+    This function detects the format of an oscilloscope .csv file: the
+    delimiter, the number of header lines and the names of the columns (taken
+    from the last header line, e.g. 's,CH1[V]', split by the delimiter which
+    yields one name per column).
+    
+    Input Parameters:
+        filename    string which stores the filename (including path) of the
+                    .csv file
+        header_num  number of header lines (None for automatic detection)
+        delimiter   delimiter (None for automatic detection, ' ' for
+                    whitespace separated files)
+        
+    Output Parameters:
+        header_num  number of header lines
+        delimiter   delimiter
+        names       list of column names (empty if no header was found)
+        ncol        number of columns
+'''
+def _csv_format(filename, header_num=None, delimiter=None):
+    
+    with open(filename, 'r') as file:
+        lines = [line for line, cnt in zip(file, range(100))]
+    
+    if delimiter is None:
+        delimiter = _sniff_delimiter(lines)
+    
+    def is_data(line):
+        try:
+            [float(x) for x in line.replace(delimiter, ' ').split()]
+            return bool(line.strip())
+        except ValueError:
+            return False
+    
+    if header_num is None:
+        header_num = 0
+        while header_num < len(lines) and not is_data(lines[header_num]):
+            header_num += 1
+    
+    if header_num >= len(lines):
+        raise Exception('No data found in ' + str(filename))
+    
+    ncol = len(lines[header_num].replace(delimiter, ' ').split())
+    names = []
+    if header_num > 0:
+        header = lines[header_num - 1].strip()
+        # the header may use another delimiter than the data lines
+        for candidate in [delimiter] + DELIMITERS + [' ']:
+            names = [name.strip() for name in header.split(candidate.strip() or None)]
+            if len(names) == ncol:
+                break
+        else:
+            names = [name.strip() for name in header.split(delimiter.strip() or None)]
+    
+    return [header_num, delimiter, names, ncol]
+
+
+'''
+    This generator reads the data part of an oscilloscope .csv file in blocks
+    of raw bytes and converts every block in bulk into a NumPy array. The
+    blocks are cut at line ends, so every yielded array holds complete rows.
+    
+    Input Parameters:
+        filename    string which stores the filename (including path) of the
+                    .csv file
+        header_num  number of header lines
+        delimiter   delimiter
+        ncol        number of columns
+        blocksize   number of bytes read at once
+        
+    Output Parameters:
+        data        (yield) float64 array of shape (rows, ncol)
+'''
+def _iter_csv_blocks(filename, header_num, delimiter, ncol, blocksize=BLOCKSIZE):
+    
+    delimiter = delimiter.encode('ascii')
+    
+    with open(filename, 'rb') as file:
+        for cnt in range(header_num):
+            file.readline()
+        
+        rest = b''
+        while True:
+            block = file.read(blocksize)
+            if not block:
+                break
+            block = rest + block
+            end = block.rfind(b'\n') + 1
+            if end == 0:
+                rest = block
+                continue
+            rest = block[end:]
+            yield _convert_block(block[:end], delimiter, ncol)
+        
+        if rest.strip():
+            yield _convert_block(rest, delimiter, ncol)
+
+
+'''
+    This function converts a block of csv rows (bytes) into an array.
+'''
+def _convert_block(block, delimiter, ncol):
+    
+    if delimiter != b' ':
+        block = block.replace(delimiter, b' ')
+    data = np.fromstring(block, sep=' ')
+    
+    if data.size % ncol != 0:
+        raise Exception('Number of values does not match the number of columns (' + str(ncol) + ')')
+    
+    return data.reshape(-1, ncol)
+
+
+'''
+    This function reads a .csv file from an oscilloscope measurement with one
+    or more traces. The data is parsed in blocks directly into NumPy arrays
+    (no Python lists). Delimiter and header lines are detected automatically
+    if not given. The first column is the time vector, all further columns
+    are measured channels.
+    
+    Input Parameters:
+        filename    string which stores the filename (including path) of the
+                    .csv file
+        header_num  number of header lines (None for automatic detection)
+        delimiter   delimiter (None for automatic detection)
+        dtype       data type of the output arrays (np.float64 or np.float32)
+        
+    Output parameters:
+        time        vector (array) containing the time points
+        yval        array containing the measured values. One channel: vector
+                    of length L, more channels: array of shape (channels, L)
+        names       list of the column names (from the header)
+'''
+def read_csv_traces(filename, header_num=None, delimiter=None, dtype=np.float64):
+    
+    [header_num, delimiter, names, ncol] = _csv_format(filename, header_num, delimiter)
+    
+    filesize = os.path.getsize(filename)
+    data = np.empty((ncol, 0), dtype=dtype)
+    rows = 0
+    
+    for block in _iter_csv_blocks(filename, header_num, delimiter, ncol):
+        if rows + len(block) > data.shape[1]:
+            # first block: estimate the number of rows out of the file size,
+            # afterwards: grow by 50 %
+            if rows == 0:
+                size = int(1.1 * len(block) * filesize / min(filesize, BLOCKSIZE)) + 1
+            else:
+                size = int(1.5 * data.shape[1])
+            new_data = np.empty((ncol, max(size, rows + len(block))), dtype=dtype)
+            new_data[:, :rows] = data[:, :rows]
+            data = new_data
+        data[:, rows:rows + len(block)] = block.T
+        rows += len(block)
+    
+    time = data[0, :rows]
+    yval = data[1, :rows] if ncol == 2 else data[1:, :rows]
+    
+    return [time, yval, names]
 
 
 '''
     This function reads a .csv file from a Oscilloscope measurement with one
-    trace. The csv needs to be separated with a comma (','), at the moment. No
-    check is present if this is not the case! The first column is the time 
-    vector and the second column is the measured value.
+    trace. The csv needs to be separated with a comma (','). The first column
+    is the time vector and the second column is the measured value. The
+    reading is done with read_csv_traces.
     
     Input Parameters:
         filename    string which stores the filename (including path) of the
@@ -26,29 +229,155 @@ import matplotlib as mpl5
                     flexible
     
     Output parameters:
-        time        vector (list) containing the time points
-        yval        vector (list) containing the measured voltage points
+        time        vector (array) containing the time points
+        yval        vector (array) containing the measured voltage points
 '''
 def read_csv_1trace(filename, header_num):
     
-    data = []
-    time = []
-    yval = []
-    
-    with open(filename, 'r') as file:
-        for cnt in range(header_num):
-            file.readline()
-        for line in file:
-            row = [float(x) for x in line.split(',')]
-            data.append(row)
+    [time, yval, names] = read_csv_traces(filename, header_num, delimiter=',')
     
-    for cnt in range(len(data)):
-        time.append(data[cnt][0])
-        yval.append(data[cnt][1])
+    if yval.ndim > 1:
+        yval = yval[0]
                             
     return [time, yval]
 
 
+'''
+    This generator reads an oscilloscope .csv file in chunks of a fixed number
+    of rows. Only one chunk (plus one raw block of the file) is held in memory,
+    so files larger than the RAM can be processed.
+    
+    Input Parameters:
+        filename    string which stores the filename (including path) of the
+                    .csv file
+        chunksize   number of rows per chunk (the last chunk can be shorter)
+        header_num  number of header lines (None for automatic detection)
+        delimiter   delimiter (None for automatic detection)
+        dtype       data type of the output arrays (np.float64 or np.float32)
+        
+    Output parameters (yield):
+        time        vector (array) containing the time points of the chunk
+        yval        array containing the measured values of the chunk. One
+                    channel: vector, more channels: array (channels, chunksize)
+'''
+def iter_csv_chunks(filename, chunksize=1_000_000, header_num=None, delimiter=None, dtype=np.float64):
+    
+    [header_num, delimiter, names, ncol] = _csv_format(filename, header_num, delimiter)
+    
+    def split(chunk):
+        chunk = np.ascontiguousarray(chunk.T, dtype=dtype)
+        return [chunk[0], chunk[1] if ncol == 2 else chunk[1:]]
+    
+    pending = np.empty((0, ncol))
+    
+    for block in _iter_csv_blocks(filename, header_num, delimiter, ncol):
+        if len(pending):
+            block = np.concatenate([pending, block])
+        full = len(block) - len(block) % chunksize
+        for start in range(0, full, chunksize):
+            yield split(block[start:start + chunksize])
+        pending = block[full:]
+    
+    if len(pending):
+        yield split(pending)
+
+
+'''
+    This function runs over an oscilloscope .csv file in chunks (see
+    iter_csv_chunks) and calculates different values in one single pass with
+    bounded memory:
+        - number of samples, min, max, mean and RMS value of every channel
+        - the time offset used by time_normalizer (minimum of the time vector)
+        - peaks (local maxima above a threshold) of one channel
+        - a decimated version of the traces (every n-th sample)
+    
+    Input Parameters:
+        filename    string which stores the filename (including path) of the
+                    .csv file
+        threshold   minimum value of a peak (None: no peak detection)
+        decimate    decimation factor (None: no decimated trace)
+        peak_channel  channel used for the peak detection (0 = first channel)
+        chunksize   number of rows per chunk
+        header_num  number of header lines (None for automatic detection)
+        delimiter   delimiter (None for automatic detection)
+        
+    Output parameters:
+        stats       dict with the keys 'n', 'min', 'max', 'mean', 'rms' (float
+                    or array with one value per channel), 'time_offset',
+                    'peak_time', 'peak_val' (arrays, empty without threshold),
+                    'time_dec', 'yval_dec' (decimated traces, None without
+                    decimation)
+'''
+def stream_csv_stats(filename, threshold=None, decimate=None, peak_channel=0,
+                     chunksize=1_000_000, header_num=None, delimiter=None):
+    
+    num = 0
+    time_offset = np.inf
+    val_min = val_max = val_sum = val_sumsq = None
+    peak_time = []
+    peak_val = []
+    time_dec = []
+    yval_dec = []
+    carry_time = np.empty(0)
+    carry_val = np.empty(0)
+    
+    for [time, yval] in iter_csv_chunks(filename, chunksize, header_num, delimiter):
+        yval_2d = np.atleast_2d(yval)
+        
+        # statistics (per channel)
+        if val_min is None:
+            val_min = yval_2d.min(axis=1)
+            val_max = yval_2d.max(axis=1)
+            val_sum = np.zeros(len(yval_2d))
+            val_sumsq = np.zeros(len(yval_2d))
+        else:
+            val_min = np.minimum(val_min, yval_2d.min(axis=1))
+            val_max = np.maximum(val_max, yval_2d.max(axis=1))
+        val_sum += yval_2d.sum(axis=1)
+        val_sumsq += np.einsum('ij,ij->i', yval_2d, yval_2d)
+        time_offset = min(time_offset, time.min())
+        
+        # peak detection, the last two samples of the previous chunk are
+        # prepended, so peaks at the chunk borders are found as well
+        if threshold is not None:
+            buf_time = np.concatenate([carry_time, time])
+            buf_val = np.concatenate([carry_val, yval_2d[peak_channel]])
+            is_peak = ((buf_val[1:-1] > buf_val[:-2]) & (buf_val[1:-1] >= buf_val[2:]) &
+                       (buf_val[1:-1] >= threshold))
+            # (index 1 of the buffer is the first sample not checked before)
+            idx = np.flatnonzero(is_peak) + 1
+            peak_time.append(buf_time[idx])
+            peak_val.append(buf_val[idx])
+            carry_time = buf_time[-2:]
+            carry_val = buf_val[-2:]
+        
+        # decimation with a global sample counter
+        if decimate is not None:
+            start = (-num) % decimate
+            time_dec.append(time[start::decimate])
+            yval_dec.append(yval_2d[:, start::decimate])
+        
+        num += len(time)
+    
+    if num == 0:
+        raise Exception('No data found in ' + str(filename))
+    
+    squeeze = (lambda val: val[0]) if len(val_min) == 1 else (lambda val: val)
+    
+    stats = {'n': num,
+             'min': squeeze(val_min),
+             'max': squeeze(val_max),
+             'mean': squeeze(val_sum / num),
+             'rms': squeeze(np.sqrt(val_sumsq / num)),
+             'time_offset': time_offset,
+             'peak_time': np.concatenate(peak_time) if peak_time else np.empty(0),
+             'peak_val': np.concatenate(peak_val) if peak_val else np.empty(0),
+             'time_dec': np.concatenate(time_dec) if time_dec else None,
+             'yval_dec': squeeze(np.concatenate(yval_dec, axis=1)) if yval_dec else None}
+    
+    return stats
+
+
 '''
     This function takes the filename of multiple .csv file from a 1 channel
     osci measurement, extracts the data and stores them in a matrix. It uses
@@ -79,6 +408,67 @@ def mul_measurements_1ch(filename, filepath, header_num):
     return [time, yval]
 
 
+'''
+    This function reads multiple .csv files of repeated oscilloscope
+    measurements concurrently (thread or process pool) and stacks them into
+    one 2-D array. If the traces have different lengths, the shorter ones are
+    padded (or masked). If all files share the same time vector, only one time
+    vector is returned.
+    
+    Input Parameters:
+        filename        list of filenames of the .csv files
+        filepath        filepath for the stored data (joined with os.path.join)
+        header_num      number of header lines (None for automatic detection)
+        channel         channel to extract (0 = first measured channel)
+        workers         number of threads/processes
+        use_processes   False: thread pool, True: process pool
+        masked          True: return masked arrays instead of padded ones
+        fill            value used for the padding
+        dtype           data type of the output arrays
+                        
+    Output parameters:
+        time        shared time vector (L,) or time matrix (N, L)
+        yval        matrix (N, L) containing the measured voltage points
+'''
+def load_csv_measurements(filename, filepath='', header_num=None, channel=0, workers=4,
+                          use_processes=False, masked=False, fill=np.nan, dtype=np.float64):
+    
+    paths = [os.path.join(filepath, file) for file in filename]
+    
+    Executor = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    with Executor(max_workers=workers) as executor:
+        results = list(executor.map(read_csv_traces, paths, [header_num] * len(paths),
+                                    [None] * len(paths), [dtype] * len(paths)))
+    
+    time_list = [time for [time, yval, names] in results]
+    yval_list = [yval if yval.ndim == 1 else yval[channel] for [time, yval, names] in results]
+    
+    lengths = np.array([len(yval) for yval in yval_list])
+    NumFiles = len(paths)
+    L = lengths.max() if NumFiles else 0
+    
+    yval = np.full((NumFiles, L), fill, dtype=dtype)
+    for cnt, trace in enumerate(yval_list):
+        yval[cnt, :len(trace)] = trace
+    
+    shared = all(len(time) == len(time_list[0]) and np.array_equal(time, time_list[0])
+                 for time in time_list)
+    if shared and NumFiles:
+        time = time_list[0]
+    else:
+        time = np.full((NumFiles, L), fill, dtype=dtype)
+        for cnt, trace in enumerate(time_list):
+            time[cnt, :len(trace)] = trace
+    
+    if masked:
+        mask = np.arange(L)[np.newaxis, :] >= lengths[:, np.newaxis]
+        yval = np.ma.masked_array(yval, mask=mask)
+        if time.ndim == 2:
+            time = np.ma.masked_array(time, mask=mask)
+    
+    return [time, yval]
+
+
 '''
     This function normalizes the time vector. Often it starts at negative time
     values (depending on the trigger). This function shift the time vector, so
@@ -105,23 +495,40 @@ def time_normalizer(time_old):
     This function plots multiple traces in one plot.
     
     Input Parameters:
-        time       time matrix, consisting of the time data vectors
+        time       time matrix, consisting of the time data vectors (or one
+                   time vector shared by all traces)
         yval       voltage matrix, consisting of the measured voltage vecotrs
         title      string consisting the title of the plot
         xlabel     string including the label of the x-axis
         ylabel     string including the label of the y-axis
         legend     vector of strings consisting of the legend
         xfit       optional argument for the left and right xlim
+        decimate   optional number of buckets for the min/max decimation of
+                   every trace ('auto' for one bucket per pixel)
         
     Output Parameters:
         NONE
 '''
-def multiplot(time, yval, title, xlabel, ylabel, legend, xfit = None):
+def multiplot(time, yval, title, xlabel, ylabel, legend, xfit = None, decimate = None):
+    
+    # imported here, the csv functions are used without matplotlib
+    import matplotlib.pyplot as plt
+    from .plot_functions import decimate_trace
         
     plt.figure()
+    
+    # one time vector for all traces
+    if isinstance(time, np.ndarray) and time.ndim == 1:
+        time = [time] * len(yval)
+    
+    if decimate == 'auto':
+        decimate = max(1, int(np.ceil(plt.gca().get_window_extent().width)))
 
     for cnt in range(len(time)):
-        plt.plot(time[cnt], yval[cnt])
+        if decimate is not None:
+            plt.plot(*decimate_trace(time[cnt], yval[cnt], decimate))
+        else:
+            plt.plot(time[cnt], yval[cnt])
         
     plt.title(title)
     plt.xlabel(xlabel)
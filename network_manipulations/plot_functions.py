@@ -1,20 +1,24 @@
 # -*- coding: utf-8 -*-
 """
-last change: 17.12.2025
+last change: 17.10.2026
 Author(s): Christoph Maier
 
 This file contains plotting functions for S-Parameters.
 
 The following functions are implemented:
     conv_plot_values: helper function to plot in dB or abs values
+    decimate_trace: helper function to reduce the number of plotted points
     plot_values: helper function to plot in lin or log frequency grid
     plot_Sparam: to plot S-parameter in one single plot or subplots
+    plot_Sparam_batch: to save the subplots of many S-parameter sets as files
     plot_comp_Sparam: to plot comparison of S-parameter in one single plot or subplots
     plot_impedance: to plot impedances in one single plot
 """
 
 # import needed packages
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import numpy as np 
 
 
@@ -45,6 +49,60 @@ def conv_plot_values(values,
 
 
 
+'''
+    Function to reduce the number of points of a trace before plotting. The
+    x-axis is divided into buckets (e.g. one per pixel), of every bucket only
+    the minimum and the maximum point are kept. So peaks and resonances stay
+    visible. For logarithmic x-axes, the buckets are spaced logarithmically.
+    
+    Input Parameters:
+        x: array of x-values (sorted ascending, e.g. frequency or time)
+        y: array of y-values (real)
+        buckets: number of buckets (None: no decimation)
+        spacing: 'lin' for linear bucket spacing
+                 'log' or 'loglog' for logarithmic bucket spacing
+                 
+    Output Parameters:
+        x_dec: decimated x-values
+        y_dec: decimated y-values
+'''
+def decimate_trace(x,
+                   y,
+                   buckets,
+                   spacing='lin'):
+    
+    x = np.asarray(x)
+    y = np.asarray(y)
+    
+    # nothing to gain (or not sorted)
+    if buckets is None or len(x) <= 2 * buckets or np.any(np.diff(x) < 0):
+        return [x, y]
+    
+    if spacing in ('log', 'loglog') and x[0] > 0:
+        edges = np.geomspace(x[0], x[-1], buckets + 1)
+    else:
+        edges = np.linspace(x[0], x[-1], buckets + 1)
+    
+    # first sample of every (non-empty) bucket
+    starts = np.unique(np.searchsorted(x, edges[:-1]))
+    starts = starts[starts < len(x)]
+    bucket = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, len(x))))
+    
+    y_min = np.fmin.reduceat(y, starts)
+    y_max = np.fmax.reduceat(y, starts)
+    
+    # position of the first minimum/maximum in every bucket
+    pos_min = np.flatnonzero(y == y_min[bucket])
+    pos_max = np.flatnonzero(y == y_max[bucket])
+    pos_min = pos_min[np.unique(bucket[pos_min], return_index=True)[1]]
+    pos_max = pos_max[np.unique(bucket[pos_max], return_index=True)[1]]
+    
+    keep = np.unique(np.concatenate([[0, len(x) - 1], pos_min, pos_max]))
+    
+    return [x[keep], y[keep]]
+
+
+
 '''
     Function to plot input values in logarithmic or linear frequency grid.
     
@@ -56,6 +114,9 @@ def conv_plot_values(values,
                  'log' for plot with logarithmic spacing 
                  'loglog' for plot with logarithmic x and y axis
                    Raises Error, if no valid keyword is found
+        decimate: None for no decimation
+                  number of buckets for min/max decimation (see decimate_trace)
+                  'auto' for one bucket per pixel of the axes width
                    
     Output Parameters:
         None
@@ -64,7 +125,13 @@ def plot_values(ax,
                 frequency,
                 values,
                 key,
-                spacing):
+                spacing,
+                decimate=None):
+    if decimate == 'auto':
+        decimate = max(1, int(np.ceil(ax.get_window_extent().width)))
+    if decimate is not None:
+        [frequency, values] = decimate_trace(frequency, values, decimate, spacing)
+    
     if spacing == 'log':
         ax.semilogx(frequency, values, label=key)
     elif spacing == 'lin':
@@ -100,6 +167,8 @@ def plot_values(ax,
         save: 'on' plot is saved as .png
               'off' plot is not saved
         savename: string containing the name of the .png
+        decimate: None for no decimation, number of buckets or 'auto' for
+                  min/max decimation of every trace (see decimate_trace)
         
     Output Parameters:
         None
@@ -116,7 +185,8 @@ def plot_Sparam(f,
                 legend='legoff',
                 legpos='best',
                 save='off',
-                savename='save.png'):
+                savename='save.png',
+                decimate=None):
     
     ### single plot ###
     if how == 'allinone':
@@ -124,7 +194,7 @@ def plot_Sparam(f,
         
         for key, values in SParams.items():
             yval = conv_plot_values(values, valuetype)
-            plot_values(ax, f, yval, key, spacing)
+            plot_values(ax, f, yval, key, spacing, decimate)
                 
         # let frequency start at min and end at max
         plt.xlim(min(f), max(f))
@@ -152,7 +222,7 @@ def plot_Sparam(f,
         
         for ax, key in zip(axes, SParams.keys()):
             yval = conv_plot_values(SParams[key], valuetype)
-            plot_values(ax, f, yval, key, spacing)
+            plot_values(ax, f, yval, key, spacing, decimate)
                 
             ax.set_title(str(key))
             ax.set_xlim(min(f), max(f))
@@ -178,6 +248,138 @@ def plot_Sparam(f,
 
 
 
+'''
+    This function takes many S-Parameter sets (e.g. of a lot of DUTs) and
+    saves the subplots of every set as a file (same layout as plot_Sparam with
+    how='subplot'). Only one figure is created: for every set, the data of the
+    existing lines is updated instead of creating new artists. The
+    object-oriented Agg API is used, pyplot is not involved (no GUI, no
+    figure management).
+    
+    Input Parameters:
+        f: frequency vector (shared by all sets) or list of frequency vectors
+        SParams_list: list of S-parameter sets (SParameterSet or dict in form
+                      {'S11':Numpy array, 'S12':Numpy array,...}), all with
+                      the same keys
+        NumPorts: gives the number of ports of the S-Parameters
+        savenames: list of filenames (one for every set)
+        spacing: allow control of frequency grid
+        valuetype: allow control of y-axis grid
+        title: string containing the overall title, or list of strings (one
+               for every set)
+        xlabel: string containing the x-axis labeling
+        ylabel: string containing the y-axis labeling
+        dpi: resolution of the saved files
+        fmt: file format (e.g. 'png', 'pdf', 'svg'). If not given, the format
+             is taken from the file extension.
+        shared_ylim: if True, all sets use the same axis limits. Then the
+                     axes are rendered only once and only the lines are drawn
+                     for every set (raster formats, one common title).
+        decimate: None for no decimation, number of buckets or 'auto' for
+                  min/max decimation of every trace (see decimate_trace)
+        
+    Output Parameters:
+        None
+'''
+def plot_Sparam_batch(f,
+                      SParams_list,
+                      NumPorts,
+                      savenames,
+                      spacing='lin',
+                      valuetype='lin',
+                      title='',
+                      xlabel='',
+                      ylabel='',
+                      dpi=150,
+                      fmt=None,
+                      shared_ylim=False,
+                      decimate=None):
+    
+    if len(savenames) != len(SParams_list):
+        raise ValueError('Number of savenames does not match the number of S-parameter sets.')
+    
+    if isinstance(title, str):
+        title = [title] * len(SParams_list)
+    
+    if isinstance(f, np.ndarray) and f.ndim == 1:
+        f = [f] * len(SParams_list)
+    
+    fig = Figure(figsize=(4*NumPorts, 4*NumPorts), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    axes = fig.subplots(NumPorts, NumPorts, squeeze=False).flatten()
+    suptitle = fig.suptitle(title[0])
+    keys = list(SParams_list[0].keys())
+    lines = {}
+    
+    # create the artists only once (with the first set)
+    for ax, key in zip(axes, keys):
+        yval = conv_plot_values(SParams_list[0][key], valuetype)
+        plot_values(ax, f[0], yval, key, spacing, decimate)
+        lines[key] = ax.lines[-1]
+        ax.set_title(str(key))
+        ax.grid(which='major')
+        ax.grid(which='minor')
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+    
+    # same axes limits for all sets: the static part of the figure (axes,
+    # ticks, grid, labels) is rendered only once and the lines are blitted
+    # on top of it (only for raster formats)
+    blit = shared_ylim and len(set(title)) == 1 and all(
+        (fmt or name.rsplit('.', 1)[-1]).lower() in ('png', 'jpg', 'jpeg', 'tif', 'tiff')
+        for name in savenames)
+    
+    if shared_ylim:
+        for ax, key in zip(axes, keys):
+            yval = [conv_plot_values(SParams[key], valuetype) for SParams in SParams_list]
+            ymin = min(np.nanmin(val) for val in yval)
+            ymax = max(np.nanmax(val) for val in yval)
+            if ax.get_yscale() == 'log':
+                ax.set_ylim(ymin / 1.2, ymax * 1.2)
+            else:
+                margin = 0.05 * (ymax - ymin)
+                ax.set_ylim(ymin - margin, ymax + margin)
+            ax.set_xlim(min(np.min(f_part) for f_part in f), max(np.max(f_part) for f_part in f))
+    
+    fig.tight_layout()
+    
+    if blit:
+        from matplotlib.image import imsave
+        for line in lines.values():
+            line.set_visible(False)
+        canvas.draw()
+        background = canvas.copy_from_bbox(fig.bbox)
+        for line in lines.values():
+            line.set_visible(True)
+    
+    for cnt, SParams in enumerate(SParams_list):
+        
+        for ax, key in zip(axes, keys):
+            if cnt > 0:
+                yval = conv_plot_values(SParams[key], valuetype)
+                if decimate is not None:
+                    buckets = decimate
+                    if decimate == 'auto':
+                        buckets = max(1, int(np.ceil(ax.get_window_extent().width)))
+                    lines[key].set_data(*decimate_trace(f[cnt], yval, buckets, spacing))
+                else:
+                    lines[key].set_data(f[cnt], yval)
+            if not shared_ylim:
+                ax.relim()
+                ax.autoscale_view()
+                ax.set_xlim(np.min(f[cnt]), np.max(f[cnt]))
+        
+        if blit:
+            canvas.restore_region(background)
+            for ax, key in zip(axes, keys):
+                ax.draw_artist(lines[key])
+            imsave(savenames[cnt], np.asarray(canvas.buffer_rgba()), format=fmt, dpi=dpi)
+        else:
+            suptitle.set_text(title[cnt])
+            fig.savefig(savenames[cnt], dpi=dpi, format=fmt)
+
+
+
 '''
     This function takes two S-Parameter sets, which need to have the same
     number of and make a comparison plot. Single plots are possible, which just 
@@ -207,6 +409,8 @@ def plot_Sparam(f,
         save: 'on' plot is saved as .png
               'off' plot is not saved
         savename: string containing the name of the .png
+        decimate: None for no decimation, number of buckets or 'auto' for
+                  min/max decimation of every trace (see decimate_trace)
         
     Output Parameters:
         None
@@ -226,7 +430,8 @@ def plot_comp_Sparam(f_1,
                      legpos='best',
                      labels=['measurement 1','measurement 2'],
                      save='off',
-                     savename='save.png'):
+                     savename='save.png',
+                     decimate=None):
     
     ### single plot ###
     if how == 'allinone':
@@ -242,8 +447,8 @@ def plot_comp_Sparam(f_1,
             yval_1 = conv_plot_values(values_1, valuetype)
             yval_2 = conv_plot_values(values_2, valuetype)
             
-            plot_values(ax, f_1, yval_1, key, spacing)
-            plot_values(ax, f_2, yval_2, key, spacing)      
+            plot_values(ax, f_1, yval_1, key, spacing, decimate)
+            plot_values(ax, f_2, yval_2, key, spacing, decimate)      
             
         # let frequency start at min and end at max
         plt.xlim(min(min(f_1), min(f_2)), max(max(f_1), max(f_2)))
@@ -279,8 +484,8 @@ def plot_comp_Sparam(f_1,
             yval_1 = conv_plot_values(values_1, valuetype)
             yval_2 = conv_plot_values(values_2, valuetype)
             
-            plot_values(ax, f_1, yval_1, key, spacing)
-            plot_values(ax, f_2, yval_2, key, spacing)
+            plot_values(ax, f_1, yval_1, key, spacing, decimate)
+            plot_values(ax, f_2, yval_2, key, spacing, decimate)
             
             ax.set_title(str(key))
             ax.set_xlim(min(min(f_1), min(f_2)), max(max(f_1), max(f_2)))
@@ -332,6 +537,8 @@ def plot_comp_Sparam(f_1,
         save: 'on' plot is saved as .png
               'off' plot is not saved
         savename: string containing the name of the .png
+        decimate: None for no decimation, number of buckets or 'auto' for
+                  min/max decimation of every trace (see decimate_trace)
         
     Output Parameters:
         None
@@ -346,7 +553,8 @@ def plot_impedance(f,
                    legend='legoff',
                    legpos='best',
                    save='off',
-                   savename='save.png'):
+                   savename='save.png',
+                   decimate=None):
     
     fig, ax = plt.subplots()
     
@@ -355,7 +563,7 @@ def plot_impedance(f,
     
     for key, values in impedance.items():
         yval = conv_plot_values(values, valuetype)
-        plot_values(ax, f[key], yval, key, spacing)
+        plot_values(ax, f[key], yval, key, spacing, decimate)
             
     # let frequency start at min and end at max
     plt.xlim(
@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+This file contains a quality check of measured S-parameters, before they are
+used further (e.g. stored in a database). For every frequency point the
+following indicators are calculated (all N^2 parameters at once):
+
+    passivity:   largest singular value of S (must not exceed 1)
+    reciprocity: norm of S - S^T (zero for reciprocal networks)
+    causality:   deviation of S from its causal part. The impulse response is
+                 calculated with an inverse FFT, the part at negative times is
+                 removed and the result is transformed back (Kramers-Kronig
+                 consistency). Causal data is not changed by this step.
+
+Implemented functions:
+    check_passivity: passivity indicator and violating bands
+    check_reciprocity: reciprocity error and violating bands
+    check_causality: causality error and violating bands
+    qa_Sparam: all checks of one network
+    qa_directory: all checks of all Touchstone files of a directory (parallel)
+"""
+
+# needed packages
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import numpy as np
+
+from .myclasses import SParameterSet
+
+# definition of constants
+TOL_PASSIVITY = 1e-2    # allowed excess of the largest singular value over 1
+TOL_RECIPROCITY = 1e-2  # allowed norm of S - S^T
+TOL_CAUSALITY = 5e-2    # allowed relative deviation from the causal part
+GUARD_CAUSALITY = 1     # guard time before t = 0 in units of 1/f_max
+
+
+'''
+    This function finds the frequency bands where a violation occurs.
+
+    Input Parameters:
+        f: frequency vector (F,)
+        mask: bool array (F,), True where the check is violated
+
+    Output Parameters:
+        bands: array (B, 2) with start and stop frequency of every band
+'''
+def _violating_bands(f,
+                     mask):
+
+    edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+    start = np.flatnonzero(edges == 1)
+    stop = np.flatnonzero(edges == -1) - 1
+
+    return np.column_stack([f[start], f[stop]])
+
+
+
+'''
+    This function checks the passivity of a network: the largest singular
+    value of S (square root of the largest eigenvalue of S^H S) must not
+    exceed 1 at any frequency.
+
+    Input Parameters:
+        SParams: network object or SParameterSet
+        tol: allowed excess over 1
+
+    Output Parameters:
+        sigma_max: largest singular value for every frequency (F,)
+        passive: True if the network is passive at all frequencies
+        bands: violating frequency bands (B, 2)
+'''
+def check_passivity(SParams,
+                    tol=TOL_PASSIVITY):
+
+    s = np.asarray(SParams.s)
+    Gram = np.conj(s.swapaxes(-1, -2)) @ s
+    sigma_max = np.sqrt(np.maximum(np.linalg.eigvalsh(Gram)[:, -1], 0))
+
+    mask = sigma_max > 1 + tol
+
+    return [sigma_max,
+            not mask.any(),
+            _violating_bands(np.asarray(SParams.f), mask)]
+
+
+
+'''
+    This function checks the reciprocity of a network with the Frobenius norm
+    of S - S^T for every frequency.
+
+    Input Parameters:
+        SParams: network object or SParameterSet
+        tol: allowed norm of S - S^T
+
+    Output Parameters:
+        error: reciprocity error for every frequency (F,)
+        reciprocal: True if the network is reciprocal at all frequencies
+        bands: violating frequency bands (B, 2)
+'''
+def check_reciprocity(SParams,
+                      tol=TOL_RECIPROCITY):
+
+    s = np.asarray(SParams.s)
+    error = np.linalg.norm((s - s.swapaxes(-1, -2)).reshape(len(s), -1), axis=-1)
+    # every pair is counted twice in the norm
+    error /= np.sqrt(2)
+
+    mask = error > tol
+
+    return [error,
+            not mask.any(),
+            _violating_bands(np.asarray(SParams.f), mask)]
+
+
+
+'''
+    This function checks the causality of a network. The S-parameters are
+    interpolated onto a uniform grid from DC to the maximum frequency (the DC
+    point is taken from the real part of the lowest measured point), windowed
+    and transformed into impulse responses with one irfft of all N^2
+    parameters. The part at negative times is removed and the difference of
+    the back-transformed data to the original data is the causality error. It
+    is normalized to the maximum magnitude of every parameter and mapped back
+    onto the measured frequency grid. Due to the limited bandwidth, also a
+    causal response spreads a little to negative times (main lobe of the
+    windowed sinc), so a short guard time before t = 0 is kept.
+
+    Input Parameters:
+        SParams: network object or SParameterSet
+        tol: allowed relative deviation from the causal part
+        nfft: number of points of the uniform grid (default: next power of 2
+              of the number of measured points)
+        guard: guard time before t = 0 in units of 1/f_max
+
+    Output Parameters:
+        error: causality error for every frequency (F,), maximum over all
+               parameters
+        causal: True if the network is causal at all frequencies
+        bands: violating frequency bands (B, 2)
+'''
+def check_causality(SParams,
+                    tol=TOL_CAUSALITY,
+                    nfft=None,
+                    guard=GUARD_CAUSALITY):
+
+    f = np.asarray(SParams.f, dtype=np.float64)
+    s = np.asarray(SParams.s)
+    [fLen, NumPorts, _] = s.shape
+    H = s.reshape(fLen, -1)
+
+    if nfft is None:
+        nfft = max(1024, 1 << int(np.ceil(np.log2(fLen))))
+    f_uni = np.linspace(0, f[-1], nfft + 1)
+
+    # linear interpolation of all parameters, DC from the lowest point
+    idx = np.clip(np.searchsorted(f, f_uni, side='right') - 1, 0, fLen - 2)
+    weight = np.clip((f_uni - f[idx]) / (f[idx + 1] - f[idx]), 0, 1)[:, np.newaxis]
+    H_uni = H[idx] + weight * (H[idx + 1] - H[idx])
+    below = f_uni < f[0]
+    H_uni[below] = H[0].real + (H[0] - H[0].real) * (f_uni[below] / f[0])[:, np.newaxis]
+
+    # half Hann window, suppresses the truncation at the maximum frequency
+    window = (0.5 + 0.5 * np.cos(np.pi * f_uni / f[-1]))[:, np.newaxis]
+    H_uni *= window
+
+    # impulse response (time step 1/(2 f_max)), negative times are in the
+    # second half
+    h = np.fft.irfft(H_uni, n=2 * nfft, axis=0)
+    h[nfft:2 * nfft - int(round(2 * guard))] = 0
+    H_causal = np.fft.rfft(h, axis=0)
+
+    norm = np.maximum(np.max(np.abs(H_uni), axis=0), np.finfo(np.float64).tiny)
+    error_uni = np.max(np.abs(H_causal - H_uni) / norm, axis=1)
+    error = np.interp(f, f_uni, error_uni)
+
+    mask = error > tol
+
+    return [error,
+            not mask.any(),
+            _violating_bands(f, mask)]
+
+
+
+'''
+    This function runs all checks of one network.
+
+    Input Parameters:
+        SParams: network object or SParameterSet
+        tol_passivity: allowed excess of the largest singular value over 1
+        tol_reciprocity: allowed norm of S - S^T
+        tol_causality: allowed relative deviation from the causal part
+
+    Output Parameters:
+        result: dict with the indicators ('sigma_max', 'reciprocity_error',
+                'causality_error', arrays (F,)), the verdicts ('passive',
+                'reciprocal', 'causal', 'valid') and the violating bands
+                ('passivity_bands', 'reciprocity_bands', 'causality_bands',
+                arrays (B, 2))
+'''
+def qa_Sparam(SParams,
+              tol_passivity=TOL_PASSIVITY,
+              tol_reciprocity=TOL_RECIPROCITY,
+              tol_causality=TOL_CAUSALITY):
+
+    result = {}
+    [result['sigma_max'],
+     result['passive'],
+     result['passivity_bands']] = check_passivity(SParams, tol_passivity)
+    [result['reciprocity_error'],
+     result['reciprocal'],
+     result['reciprocity_bands']] = check_reciprocity(SParams, tol_reciprocity)
+    [result['causality_error'],
+     result['causal'],
+     result['causality_bands']] = check_causality(SParams, tol_causality)
+    result['valid'] = result['passive'] and result['reciprocal'] and result['causal']
+
+    return result
+
+
+
+'''
+    This function is executed in the worker processes. It reads one file and
+    runs all checks.
+
+    Input Parameters:
+        filename: Touchstone file
+        tols: tolerances (passivity, reciprocity, causality)
+
+    Output Parameters:
+        filename: checked file
+        result: result dict of qa_Sparam (None on error)
+        error: error message (None on success)
+'''
+def _qa_worker(filename,
+               tols):
+
+    from .touchstone import read_touchstone_array
+
+    try:
+        [f, s, port_imp] = read_touchstone_array(filename)
+        result = qa_Sparam(SParameterSet(f, s), *tols)
+    except Exception as error:
+        return [filename, None, f"{type(error).__name__}: {error}"]
+
+    return [filename, result, None]
+
+
+
+'''
+    This function checks all Touchstone files of a directory (or a given list
+    of files) in a process pool.
+
+    Input Parameters:
+        path: directory with the Touchstone files, or list of filenames
+        workers: number of worker processes (default: number of CPUs)
+        recursive: if True, also the subdirectories are searched
+        tol_passivity: allowed excess of the largest singular value over 1
+        tol_reciprocity: allowed norm of S - S^T
+        tol_causality: allowed relative deviation from the causal part
+
+    Output Parameters:
+        results: dict {filename: result dict of qa_Sparam}
+        failed: dict {filename: error message} of the files which could not
+                be read
+'''
+def qa_directory(path,
+                 workers=None,
+                 recursive=True,
+                 tol_passivity=TOL_PASSIVITY,
+                 tol_reciprocity=TOL_RECIPROCITY,
+                 tol_causality=TOL_CAUSALITY):
+
+    from .bulk_loader import find_touchstone_files
+
+    if isinstance(path, (str, os.PathLike)):
+        filenames = find_touchstone_files(path, recursive)
+    else:
+        filenames = [os.fspath(filename) for filename in path]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    results = {}
+    failed = {}
+
+    if not filenames:
+        return [results,
+                failed]
+
+    tols = (tol_passivity, tol_reciprocity, tol_causality)
+    chunksize = max(1, len(filenames) // (4 * workers))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for [filename, result, error] in executor.map(_qa_worker, filenames, repeat(tols),
+                                                      chunksize=chunksize):
+            if error is not None:
+                failed[filename] = error
+            else:
+                results[filename] = result
+
+    return [results,
+            failed]
@@ -0,0 +1,451 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+This file contains a headless report generator for a lot of DUTs. For every
+DUT the following pages are rendered:
+
+    S-parameters: subplots of all S-parameters (same layout as plot_Sparam
+                  with how='subplot')
+    comparison:   subplots of the DUT and a golden device (same layout as
+                  plot_comp_Sparam with how='subplot'), if a golden device
+                  is given. If the number of ports does not match, only
+                  this page is skipped and a note is written instead.
+    impedance:    impedance of the DUT (same as plot_impedance), if an
+                  impedance method is given
+
+The pages are rendered in a process pool with the object-oriented Agg API
+(no pyplot, no GUI backend, no plt.show()) and sent back as images. The
+main process writes them in order into one multi-page PDF (matplotlib
+PdfPages, one image page per rendered page) or a static HTML bundle. DUTs
+which could not be rendered get an error page. Only a limited number of DUTs is in flight at once, so the memory
+stays bounded also for very large lots.
+
+Implemented functions:
+    build_report: renders the report of many DUTs into a PDF or HTML file
+"""
+
+# needed packages
+import html
+import io
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from .myclasses import SParameterSet
+
+# definition of constants
+REPORT_FORMATS = ('pdf', 'html') # supported output formats
+INFLIGHT_PER_WORKER = 2          # DUTs in flight per worker (memory bound)
+
+# state of the worker processes (set once by _init_worker)
+_worker_state = {}
+
+
+'''
+    This function initializes a worker process: the non-interactive Agg
+    backend is selected and the settings of the report (and the golden
+    device, which is needed for every DUT) are stored once per process.
+
+    Input Parameters:
+        golden: [f, s] of the golden device or None
+        options: dict with the settings of the pages (see build_report)
+
+    Output Parameters:
+        None
+'''
+def _init_worker(golden,
+                 options):
+
+    import matplotlib
+    matplotlib.use('Agg')
+
+    _worker_state['golden'] = golden
+    _worker_state['options'] = options
+
+
+
+'''
+    This function renders one page into an image. Every worker creates the
+    figure of every page type only once (with the first DUT, including the
+    layout); for the following DUTs only the data of the existing lines is
+    updated (same as in plot_Sparam_batch), the axes, labels and the layout
+    are reused.
+
+    Input Parameters:
+        kind: page type (used with the shape as key of the figure)
+        rows: number of rows of subplots
+        columns: number of columns of subplots
+        size: size of one subplot in inches
+        traces: list (one entry per subplot) of lists of [x, y, label]
+        spacing: frequency grid ('lin', 'log', 'loglog')
+        titles: list of the subplot titles
+        xlabel: string containing the x-axis labeling
+        ylabel: string containing the y-axis labeling
+        title: title of the page
+
+    Output Parameters:
+        image: PNG file content (bytes) for the HTML report, RGB array
+               (uint8) for the PDF report
+'''
+def _render_page(kind,
+                 rows,
+                 columns,
+                 size,
+                 traces,
+                 spacing,
+                 titles,
+                 xlabel,
+                 ylabel,
+                 title):
+
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from .plot_functions import decimate_trace, plot_values
+
+    options = _worker_state['options']
+    decimate = options['decimate']
+    figures = _worker_state.setdefault('figures', {})
+    key = (kind, rows, columns)
+
+    if key not in figures:
+        fig = Figure(figsize=(size * columns, size * rows), dpi=options['dpi'])
+        FigureCanvasAgg(fig)
+        axes = fig.subplots(rows, columns, squeeze=False).flatten()
+        lines = []
+        for ax, ax_traces, ax_title in zip(axes, traces, titles):
+            for [x, y, label] in ax_traces:
+                plot_values(ax, x, y, label, spacing, decimate)
+            lines.append(ax.lines)
+            ax.set_title(ax_title)
+            ax.set_xlabel(xlabel)
+            ax.set_ylabel(ylabel)
+            ax.grid(which='both')
+            if len(ax_traces) > 1:
+                ax.legend()
+        suptitle = fig.suptitle(title)
+        fig.tight_layout()
+        figures[key] = [fig, axes, lines, suptitle]
+    else:
+        [fig, axes, lines, suptitle] = figures[key]
+        for ax, ax_traces, ax_lines in zip(axes, traces, lines):
+            for [x, y, label], line in zip(ax_traces, ax_lines):
+                buckets = decimate
+                if decimate == 'auto':
+                    buckets = max(1, int(np.ceil(ax.get_window_extent().width)))
+                line.set_data(*decimate_trace(x, y, buckets, spacing))
+            ax.relim()
+            ax.autoscale_view()
+        suptitle.set_text(title)
+
+    if options['fmt'] == 'pdf':
+        # the PDF writer embeds the pixels, no PNG round trip
+        fig.canvas.draw()
+        return np.array(np.asarray(fig.canvas.buffer_rgba())[:, :, :3])
+
+    buffer = io.BytesIO()
+    fig.canvas.print_png(buffer)
+
+    return buffer.getvalue()
+
+
+
+'''
+    This function renders the pages of one DUT.
+
+    Input Parameters:
+        name: name of the DUT (used in the titles)
+        f: frequency vector (F,)
+        s: complex S-array (F, N, N)
+
+    Output Parameters:
+        pages: list of [page title, image] (see _render_page)
+        notes: list of notes about skipped pages
+'''
+def _render_pages(name,
+                  f,
+                  s):
+
+    from .plot_functions import conv_plot_values
+    from .resample import _same_grid, interp_Sparam
+    from .SParams import calc_imp_batch
+
+    options = _worker_state['options']
+    golden = _worker_state['golden']
+    NumPorts = s.shape[1]
+    keys = [f"S{row + 1}{column + 1}" for row in range(NumPorts) for column in range(NumPorts)]
+    valuetype = options['valuetype']
+    values = conv_plot_values(s, valuetype)
+    pages = []
+    notes = []
+
+    # S-parameters
+    traces = [[[f, values[:, idx // NumPorts, idx % NumPorts], key]] for idx, key in enumerate(keys)]
+    title = f"{name}: S-parameters"
+    pages.append([title, _render_page('Sparam', NumPorts, NumPorts, 4, traces, options['spacing'],
+                                      keys, 'Frequency in Hz', valuetype, title)])
+
+    # comparison with the golden device (on the grid of the DUT)
+    if golden is not None and golden[1].shape[1:] != s.shape[1:]:
+        notes.append(f"comparison skipped, the DUT has {NumPorts} ports, "
+                     f"the golden device {golden[1].shape[1]}")
+    elif golden is not None:
+        [f_gold, s_gold] = golden
+        if not _same_grid(f, f_gold):
+            s_gold = interp_Sparam(s_gold, f, f=f_gold)
+        values_gold = conv_plot_values(s_gold, valuetype)
+        traces = [[[f, values[:, idx // NumPorts, idx % NumPorts], 'DUT'],
+                   [f, values_gold[:, idx // NumPorts, idx % NumPorts], 'golden']]
+                  for idx in range(NumPorts**2)]
+        title = f"{name}: comparison"
+        pages.append([title, _render_page('comparison', NumPorts, NumPorts, 4, traces, options['spacing'],
+                                          keys, 'Frequency in Hz', valuetype,
+                                          f"{name}: comparison with golden device")])
+
+    # impedance
+    if options['imp_method'] is not None:
+        Z = calc_imp_batch(s, options['imp_method'], options['port_imp'], options['imp_param'])
+        traces = [[[f, np.abs(Z), options['imp_method']]]]
+        title = f"{name}: impedance"
+        pages.append([title, _render_page('impedance', 1, 1, 6, traces, 'loglog', [options['imp_method']],
+                                          'Frequency in Hz', 'Impedance in Ohm', title)])
+
+    return [pages,
+            notes]
+
+
+
+'''
+    This function is executed in the worker processes. It reads one DUT (if
+    needed) and renders its pages.
+
+    Input Parameters:
+        item: filename of a Touchstone file or [name, f, s]
+
+    Output Parameters:
+        name: name of the DUT (basename of the file)
+        pages: list of [page title, image] (None on error)
+        notes: list of notes about skipped pages (None on error)
+        error: error message (None on success)
+'''
+def _report_worker(item):
+
+    from .touchstone import read_touchstone_array
+
+    name = os.path.basename(item) if isinstance(item, str) else item[0]
+
+    try:
+        if isinstance(item, str):
+            [f, s, port_imp] = read_touchstone_array(item)
+        else:
+            [f, s] = item[1:]
+        [pages, notes] = _render_pages(name, f, s)
+    except Exception as error:
+        return [name, None, None, f"{type(error).__name__}: {error}"]
+
+    return [name, pages, notes, None]
+
+
+
+'''
+    This class writes the pages into a multi-page PDF with matplotlib
+    PdfPages. Every page is placed as an image (figimage) on a figure of the
+    size of the page. DUTs which could not be rendered get a page with the
+    error message, notes about skipped pages get a page as well.
+'''
+class _PdfWriter:
+    def __init__(self, filename, dpi):
+        from matplotlib.backends.backend_pdf import PdfPages
+
+        self.dpi = dpi
+        self.pdf = PdfPages(filename)
+        self.pdf.infodict()['Title'] = 'S-parameter report'
+
+    def add_page(self, title, image):
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=(image.shape[1] / self.dpi, image.shape[0] / self.dpi), dpi=self.dpi)
+        fig.figimage(image, resize=False)
+        self.pdf.savefig(fig, dpi=self.dpi)
+
+    def add_error(self, name, error):
+        self.add_note(f"{name}: not rendered", error)
+
+    def add_note(self, name, note):
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=(8.27, 11.69), dpi=self.dpi)
+        fig.text(0.1, 0.9, name, fontsize=16, weight='bold', va='top')
+        fig.text(0.1, 0.85, note, fontsize=10, va='top', wrap=True)
+        self.pdf.savefig(fig)
+
+    def close(self, summary):
+        self.pdf.infodict()['Subject'] = summary
+        self.pdf.close()
+
+
+
+'''
+    This class writes the pages into a static HTML bundle: one index file and
+    a directory with the PNG images (<name>_files). The index is written
+    while the pages arrive.
+'''
+class _HtmlWriter:
+    def __init__(self, filename, dpi):
+        self.img_dir = os.path.splitext(filename)[0] + '_files'
+        os.makedirs(self.img_dir, exist_ok=True)
+        self.cnt = 0
+        self.index = open(filename, 'w', encoding='utf-8')
+        self.index.write('<!DOCTYPE html>\n<html>\n<head><meta charset="utf-8">'
+                         '<title>S-parameter report</title></head>\n<body>\n')
+
+    def add_page(self, title, png):
+        name = f"page_{self.cnt:05d}.png"
+        with open(os.path.join(self.img_dir, name), 'wb') as file:
+            file.write(png)
+        self.cnt += 1
+        src = html.escape(os.path.basename(self.img_dir) + '/' + name)
+        self.index.write(f'<h2>{html.escape(title)}</h2>\n<img src="{src}" style="max-width:100%">\n')
+
+    def add_error(self, name, error):
+        self.add_note(name, error)
+
+    def add_note(self, name, note):
+        self.index.write(f'<h2>{html.escape(name)}</h2>\n<p>{html.escape(note)}</p>\n')
+
+    def close(self, summary):
+        self.index.write(f'<p>{html.escape(summary)}</p>\n</body>\n</html>\n')
+        self.index.close()
+
+
+
+'''
+    This function renders the report of many DUTs into one multi-page PDF or
+    a static HTML bundle. The DUTs are rendered in a process pool; at most
+    INFLIGHT_PER_WORKER DUTs per worker are in flight, the finished pages are
+    written in the order of the DUTs and then released.
+
+    Input Parameters:
+        path: directory with Touchstone files, or list of filenames, network
+              objects or SParameterSets
+        output: filename of the report (.pdf or .html)
+        golden: golden device for the comparison page (filename, network
+                object or SParameterSet), no comparison if not given. DUTs
+                with another number of ports get a note instead of the
+                comparison page.
+        imp_method: 'oneport', 'seriesthru' or 'shuntthru' for the impedance
+                    page (see calc_imp_batch), no impedance page if None
+        imp_param: S-parameter used for the impedance (default of
+                   calc_imp_batch if not given)
+        port_imp: port impedance (50 Ohm if not given)
+        spacing: frequency grid of the S-parameter pages ('lin', 'log')
+        valuetype: y-axis of the S-parameter pages ('dB', 'lin')
+        dpi: resolution of the pages
+        decimate: min/max decimation of the traces (see decimate_trace),
+                  'auto' for one bucket per pixel
+        workers: number of worker processes (default: number of CPUs)
+        recursive: if True, also the subdirectories are searched
+        fmt: 'pdf' or 'html'. If not given, the format is taken from the
+             file extension of output.
+
+    Output Parameters:
+        NumPages: number of rendered pages
+        pages_per_second: rendering speed of the whole report
+        failed: dict {DUT: error message} of the DUTs which could not be
+                rendered (DUT: basename of the file or name of the object)
+'''
+def build_report(path,
+                 output,
+                 golden=None,
+                 imp_method=None,
+                 imp_param=None,
+                 port_imp=50,
+                 spacing='lin',
+                 valuetype='dB',
+                 dpi=100,
+                 decimate='auto',
+                 workers=None,
+                 recursive=True,
+                 fmt=None):
+
+    from .bulk_loader import find_touchstone_files
+    from .touchstone import read_touchstone_array
+
+    start = time.perf_counter()
+
+    if fmt is None:
+        fmt = os.path.splitext(output)[1].lstrip('.').lower()
+    if fmt not in REPORT_FORMATS:
+        raise ValueError('ERROR: No valid keyword for fmt found.')
+
+    if isinstance(path, (str, os.PathLike)):
+        items = find_touchstone_files(path, recursive)
+    else:
+        items = []
+        for cnt, entry in enumerate(path):
+            if isinstance(entry, (str, os.PathLike)):
+                items.append(os.fspath(entry))
+            else:
+                name = getattr(entry, 'name', None) or f"DUT {cnt + 1}"
+                items.append([name, np.asarray(entry.f), np.asarray(entry.s)])
+
+    if isinstance(golden, (str, os.PathLike)):
+        [f_gold, s_gold, port_imp_gold] = read_touchstone_array(golden)
+        golden = SParameterSet(f_gold, s_gold)
+    if golden is not None:
+        golden = [np.asarray(golden.f), np.asarray(golden.s)]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    options = {'spacing': spacing,
+               'valuetype': valuetype,
+               'dpi': dpi,
+               'decimate': decimate,
+               'imp_method': imp_method,
+               'imp_param': imp_param,
+               'port_imp': port_imp,
+               'fmt': fmt}
+
+    writer = _PdfWriter(output, dpi) if fmt == 'pdf' else _HtmlWriter(output, dpi)
+    NumPages = 0
+    NumNotes = 0
+    failed = {}
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(golden, options)) as executor:
+            pending = deque()
+            items = iter(items)
+            while True:
+                # keep the pool busy, but only a limited number of DUTs in flight
+                while len(pending) < INFLIGHT_PER_WORKER * workers:
+                    item = next(items, None)
+                    if item is None:
+                        break
+                    pending.append(executor.submit(_report_worker, item))
+                if not pending:
+                    break
+
+                [name, pages, notes, error] = pending.popleft().result()
+                if error is not None:
+                    failed[name] = error
+                    writer.add_error(name, error)
+                    continue
+                for [title, image] in pages:
+                    writer.add_page(title, image)
+                for note in notes:
+                    writer.add_note(name, note)
+                NumPages += len(pages)
+                NumNotes += len(notes)
+    finally:
+        pages_per_second = NumPages / (time.perf_counter() - start)
+        writer.close(f"{NumPages} pages, {NumNotes} notes, {len(failed)} failed DUTs, "
+                     f"{pages_per_second:.1f} pages/s")
+
+    return [NumPages,
+            pages_per_second,
+            failed]
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+This file contains functions to map S-parameters onto another frequency grid.
+All N^2 parameters are interpolated at once (linear interpolation of the real
+and imaginary part). The interpolation indices and weights only depend on the
+source and the target grid, they are cached per grid pair. Repeated
+comparisons against the same golden grid therefore only cost a gather and a
+multiply. The cache is shared by all threads and guarded by a lock.
+
+Implemented functions:
+    common_grid: calculates a frequency grid covered by all given grids
+    interp_Sparam: interpolates S-parameters onto a new frequency grid
+    align_Sparam: maps two S-parameter objects onto the same frequency grid
+"""
+
+# needed packages
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+
+from .myclasses import SParameterSet
+
+# definition of constants
+WEIGHT_CACHE_SIZE = 64 # number of cached (source grid, target grid) pairs
+RTOL_GRID = 1e-9       # relative tolerance for equal frequency points
+
+# cache for the interpolation weights {(key_src, key_tgt): [idx, weight]}
+_weight_cache = OrderedDict()
+_weight_lock = threading.Lock()
+
+
+'''
+    This function calculates a key for a frequency grid (used for the cache of
+    the interpolation weights).
+
+    Input Parameters:
+        f: frequency vector
+
+    Output Parameters:
+        key: tuple of length and hash of the frequency values
+'''
+def _grid_key(f):
+
+    f = np.ascontiguousarray(f, dtype=np.float64)
+
+    return (f.size, hashlib.sha1(f.tobytes()).hexdigest())
+
+
+
+'''
+    This function checks whether two frequency grids are the same (within a
+    relative tolerance).
+
+    Input Parameters:
+        f_1: first frequency vector
+        f_2: second frequency vector
+
+    Output Parameters:
+        equal: True if the grids agree
+'''
+def _same_grid(f_1,
+               f_2):
+
+    if len(f_1) != len(f_2):
+        return False
+
+    return bool(np.allclose(f_1, f_2, rtol=RTOL_GRID, atol=0))
+
+
+
+'''
+    This function calculates the indices and weights for the linear
+    interpolation from the source grid onto the target grid. The results are
+    cached per (source grid, target grid) pair.
+
+    Input Parameters:
+        f_src: source frequency vector (sorted ascending)
+        f_tgt: target frequency vector
+        extrapolate: if False, target points outside the source grid raise an
+                     error. If True, the values at the borders are held.
+
+    Output Parameters:
+        idx: index of the lower neighbour in the source grid for every target
+             point
+        weight: weight of the upper neighbour for every target point
+'''
+def _interp_weights(f_src,
+                    f_tgt,
+                    extrapolate=False):
+
+    key = (_grid_key(f_src), _grid_key(f_tgt), extrapolate)
+    with _weight_lock:
+        if key in _weight_cache:
+            _weight_cache.move_to_end(key)
+            return _weight_cache[key]
+
+    f_src = np.asarray(f_src, dtype=np.float64)
+    f_tgt = np.asarray(f_tgt, dtype=np.float64)
+
+    if len(f_src) < 2:
+        raise Exception('At least two frequency points are needed for the interpolation')
+    if np.any(np.diff(f_src) <= 0):
+        raise Exception('The source frequency vector is not strictly increasing')
+
+    tol = RTOL_GRID * np.max(np.abs(f_src))
+    if not extrapolate and (np.min(f_tgt) < f_src[0] - tol or np.max(f_tgt) > f_src[-1] + tol):
+        raise Exception('The target frequency range exceeds the source frequency range')
+
+    idx = np.clip(np.searchsorted(f_src, f_tgt, side='right') - 1, 0, len(f_src) - 2)
+    weight = (f_tgt - f_src[idx]) / (f_src[idx + 1] - f_src[idx])
+    weight = np.clip(weight, 0, 1)
+
+    idx.flags.writeable = False
+    weight.flags.writeable = False
+
+    with _weight_lock:
+        _weight_cache[key] = [idx, weight]
+        _weight_cache.move_to_end(key)
+        if len(_weight_cache) > WEIGHT_CACHE_SIZE:
+            _weight_cache.popitem(last=False)
+
+    return [idx, weight]
+
+
+
+'''
+    This function calculates a frequency grid which is covered by all given
+    grids (the overlapping frequency range).
+
+    Input Parameters:
+        f_list: list of frequency vectors
+        fLen: number of points of the new grid. If not given, the points of
+              the first grid inside the overlapping range are taken.
+        spacing: 'lin' or 'log' spacing of the new grid (only used with fLen)
+
+    Output Parameters:
+        f: common frequency vector
+'''
+def common_grid(f_list,
+                fLen=None,
+                spacing='lin'):
+
+    f_list = [np.asarray(f, dtype=np.float64) for f in f_list]
+
+    f_start = max(np.min(f) for f in f_list)
+    f_stop = min(np.max(f) for f in f_list)
+    if f_start > f_stop:
+        raise Exception('The frequency ranges of the given grids do not overlap')
+
+    if fLen is None:
+        tol = RTOL_GRID * f_stop
+        f = f_list[0]
+        return f[(f >= f_start - tol) & (f <= f_stop + tol)]
+
+    if spacing == 'log':
+        return np.geomspace(f_start, f_stop, fLen)
+    elif spacing == 'lin':
+        return np.linspace(f_start, f_stop, fLen)
+    else:
+        raise ValueError('ERROR: No valid keyword for spacing found.')
+
+
+
+'''
+    This function interpolates S-parameters onto a new frequency grid. All
+    parameters are interpolated in one vectorized step, a (F, N, N) array or
+    a stacked (K, F, N, N) array is interpolated along the frequency axis.
+
+    Input Parameters:
+        SParams: network object, SParameterSet or complex array (F, N, N) /
+                 (K, F, N, N)
+        f_new: target frequency vector
+        f: frequency vector of SParams (only needed for array input)
+        extrapolate: if False, points outside the measured range raise an
+                     error. If True, the values at the borders are held.
+
+    Output Parameters:
+        SParams_new: interpolated S-parameters as SParameterSet (or as array,
+                     if an array was given)
+'''
+def interp_Sparam(SParams,
+                  f_new,
+                  f=None,
+                  extrapolate=False):
+
+    f_new = np.asarray(f_new, dtype=np.float64)
+
+    if isinstance(SParams, np.ndarray):
+        s = SParams
+        axis = s.ndim - 3
+    else:
+        f = SParams.f
+        s = SParams.s
+        axis = 0
+
+    if f is None:
+        raise Exception('Frequency vector of the S-parameters is missing')
+
+    if _same_grid(f, f_new):
+        s_new = s
+    else:
+        [idx, weight] = _interp_weights(f, f_new, extrapolate)
+        weight = weight[:, np.newaxis, np.newaxis]
+        s_low = np.take(s, idx, axis=axis)
+        s_new = np.take(s, idx + 1, axis=axis)
+        # s_new = s_low + weight * (s_high - s_low), without further temporaries
+        s_new -= s_low
+        s_new *= weight
+        s_new += s_low
+
+    if isinstance(SParams, np.ndarray):
+        return s_new
+
+    return SParameterSet(f_new, s_new)
+
+
+
+'''
+    This function maps two S-parameter objects onto the same frequency grid.
+
+    Input Parameters:
+        SComp: network object or SParameterSet
+        SRef: network object or SParameterSet
+        grid: 'ref' interpolates SComp onto the grid of SRef, SRef is
+              returned unchanged. If the grid of SRef exceeds the range of
+              SComp, an Exception is raised.
+              'common' maps both onto the overlapping part of the SRef grid
+              (SRef is only cropped, SComp is interpolated)
+              An array maps both onto the given frequency vector
+
+    Output Parameters:
+        SComp_new: SParameterSet of SComp on the common grid
+        SRef_new: SParameterSet of SRef on the common grid
+'''
+def align_Sparam(SComp,
+                 SRef,
+                 grid='ref'):
+
+    if isinstance(grid, str):
+        if grid == 'ref':
+            if not isinstance(SRef, SParameterSet):
+                SRef = SParameterSet(SRef.f, SRef.s)
+            return [interp_Sparam(SComp, SRef.f),
+                    SRef]
+        elif grid == 'common':
+            f_new = common_grid([SRef.f, SComp.f])
+        else:
+            raise ValueError('ERROR: No valid keyword for grid found.')
+    else:
+        f_new = grid
+
+    return [interp_Sparam(SComp, f_new),
+            interp_Sparam(SRef, f_new)]
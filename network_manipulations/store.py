@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+This file contains a columnar on-disk store for the results of many DUTs
+(S-parameters, mixed-mode parameters and scalar metrics like the NMSE),
+keyed by DUT id. The arrays are stored as chunked .npy files, which are
+memory-mapped for reading, so a query only reads the needed part of the
+files:
+
+    store_dir/index.json                       DUT ids, groups, free slots, scalars
+    store_dir/<group>/f.npy                    frequency vector of the group
+    store_dir/<group>/<field>_<chunk>.npy      (P, F, CHUNK_SIZE) complex
+
+DUTs with the same frequency grid and number of ports form a group. The
+arrays are stored parameter-major: for a fixed parameter and frequency the
+values of CHUNK_SIZE DUTs are contiguous. So e.g. Sdd21 at 1 GHz across all
+DUTs, or a frequency band of one parameter, is read with a few contiguous
+reads per chunk; reading all parameters of a single DUT is strided.
+
+The fields are 'S' (keys 'S11', 'S12', ...) and for 2N-ports 'MM' (keys
+'Sdd11', 'Sdc11', ..., see S_to_MM_nport). Impedances are not stored, they
+follow from the stored parameters (e.g. calc_imp_batch on the (K, F) output
+of read_param).
+
+Implemented classes:
+    ResultStore: store object (add DUTs, query by DUT, parameter and band)
+"""
+
+# needed packages
+import hashlib
+import json
+import numbers
+import os
+import numpy as np
+
+from .myclasses import SParameterSet
+
+# definition of constants
+CHUNK_SIZE = 64      # DUTs per chunk file
+FIELDS = ('S', 'MM') # stored parameter fields
+
+
+"""
+    A class to store the results of many DUTs in a chunked, parameter-major
+    layout of memory-mapped .npy files (see the description of this file).
+    New DUTs are written into the chunk files directly; the index is written
+    by flush (or close, or at the end of a with block).
+
+    Attributes:
+        store_dir: directory of the store
+        dtype: complex dtype of the stored arrays (np.complex64 halves the
+               size)
+        pairing: port pairing used for the mixed-mode parameters (see
+                 S_to_MM_nport)
+
+    Methods:
+        add: store the results of one DUT
+        duts: list of the stored DUT ids
+        read: all parameters of one DUT
+        read_param: one parameter across many DUTs (full, band or single
+                    frequency)
+        read_scalar: one scalar metric across many DUTs
+        flush: write the index
+        close: write the index and release the memory maps
+"""
+class ResultStore:
+    def __init__(self, store_dir, dtype=np.complex128, pairing=None):
+
+        self.store_dir = os.fspath(store_dir)
+        self.dtype = np.dtype(dtype)
+        self.pairing = pairing
+
+        os.makedirs(self.store_dir, exist_ok=True)
+        self._index_file = os.path.join(self.store_dir, 'index.json')
+        self._index = self._read_index()
+        self._maps = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _read_index(self):
+        try:
+            with open(self._index_file, 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {'groups': {}, 'duts': {}}
+
+    def flush(self):
+        for array in self._maps.values():
+            array.flush()
+        tmp_file = self._index_file + '.tmp'
+        with open(tmp_file, 'w') as file:
+            json.dump(self._index, file)
+        os.replace(tmp_file, self._index_file)
+
+    def close(self):
+        self.flush()
+        self._maps = {}
+
+    def duts(self):
+        return list(self._index['duts'])
+
+    def _group(self, f, NumPorts):
+        # groups are named after the frequency grid and the number of ports
+        f = np.ascontiguousarray(f, dtype=np.float64)
+        name = f"{NumPorts}p_{len(f)}_{hashlib.sha1(f.tobytes()).hexdigest()[:12]}"
+        if name not in self._index['groups']:
+            os.makedirs(os.path.join(self.store_dir, name), exist_ok=True)
+            np.save(os.path.join(self.store_dir, name, 'f.npy'), f)
+            fields = {'S': [f"S{row + 1}{column + 1}" for row in range(NumPorts)
+                                                     for column in range(NumPorts)]}
+            if NumPorts % 2 == 0:
+                from .SParams import _MM_keys
+                fields['MM'] = _MM_keys(NumPorts // 2)
+            self._index['groups'][name] = {'NumPorts': NumPorts,
+                                           'fLen': len(f),
+                                           'fields': fields,
+                                           'count': 0,
+                                           'free': [],
+                                           'dtype': self.dtype.str}
+        return name
+
+    def _chunk(self, group, field, chunk, mode='r'):
+        key = (group, field, chunk)
+        if key in self._maps and (mode == 'r' or self._maps[key].mode != 'r'):
+            return self._maps[key]
+
+        path = os.path.join(self.store_dir, group, f"{field}_{chunk}.npy")
+        entry = self._index['groups'][group]
+        if mode == 'r+' and not os.path.isfile(path):
+            shape = (entry['NumPorts']**2, entry['fLen'], CHUNK_SIZE)
+            array = np.lib.format.open_memmap(path, mode='w+', dtype=np.dtype(entry['dtype']), shape=shape)
+        else:
+            array = np.load(path, mmap_mode=mode)
+
+        self._maps[key] = array
+        return array
+
+    def add(self, dut_id, SParams, scalars=None):
+
+        """
+        Stores the results of one DUT. An existing DUT id is overwritten (in
+        place, if the frequency grid and the number of ports did not change,
+        otherwise its old slot is freed and reused by the next DUT of that
+        group).
+
+        Parameters:
+            dut_id: id of the DUT (string)
+            SParams: network object or SParameterSet
+            scalars: dict with scalar metrics (e.g. {'NMSE_transm': -42.0}).
+                     Entries with the value None are skipped, other values
+                     must be numbers (bools are stored as 0/1).
+        For 2N-ports, the mixed-mode parameters are calculated and stored
+        as well.
+        """
+        values = {}
+        for key, value in (scalars or {}).items():
+            if value is None:
+                continue
+            if not isinstance(value, (numbers.Real, np.bool_)):
+                raise Exception(f"Scalar {key} of DUT {dut_id} is not a number: {value!r}")
+            values[key] = float(value)
+
+        f = np.asarray(SParams.f, dtype=np.float64)
+        s = np.asarray(SParams.s)
+        NumPorts = s.shape[1]
+
+        group = self._group(f, NumPorts)
+        entry = self._index['groups'][group]
+        free = entry.setdefault('free', [])
+
+        old = self._index['duts'].get(dut_id)
+        if old is not None and old['group'] == group:
+            slot = old['slot']
+        else:
+            if old is not None:
+                self._index['groups'][old['group']].setdefault('free', []).append(old['slot'])
+            if free:
+                slot = free.pop(0)
+            else:
+                slot = entry['count']
+                entry['count'] += 1
+
+        [chunk, pos] = divmod(slot, CHUNK_SIZE)
+        # (F, N, N) -> (N*N, F)
+        self._chunk(group, 'S', chunk, 'r+')[:, :, pos] = s.reshape(len(f), -1).T
+        if 'MM' in entry['fields']:
+            from .SParams import S_to_MM_nport
+            MM = S_to_MM_nport(SParameterSet(f, s), self.pairing)
+            self._chunk(group, 'MM', chunk, 'r+')[:, :, pos] = MM.s.reshape(len(f), -1).T
+
+        self._index['duts'][dut_id] = {'group': group,
+                                       'slot': slot,
+                                       'scalars': values}
+
+    def read(self, dut_id, field='S'):
+
+        """
+        Reads all parameters of one DUT.
+
+        Parameters:
+            dut_id: id of the DUT
+            field: 'S' or 'MM'
+
+        Returns:
+            SParams: SParameterSet (keys of the field)
+        """
+        if field not in FIELDS:
+            raise ValueError('ERROR: No valid keyword for field found.')
+
+        dut = self._index['duts'][dut_id]
+        entry = self._index['groups'][dut['group']]
+        if field not in entry['fields']:
+            raise Exception(f"No {field}-parameters stored for DUT {dut_id}")
+
+        [chunk, pos] = divmod(dut['slot'], CHUNK_SIZE)
+        NumPorts = entry['NumPorts']
+        s = np.array(self._chunk(dut['group'], field, chunk)[:, :, pos].T)
+        f = np.load(os.path.join(self.store_dir, dut['group'], 'f.npy'))
+
+        return SParameterSet(f, s.reshape(-1, NumPorts, NumPorts), entry['fields'][field])
+
+    def read_param(self, key, duts=None, f=None, band=None):
+
+        """
+        Reads one parameter (e.g. 'S21' or 'Sdd21') across many DUTs. Only
+        the chunks and the frequency range of the requested data are read.
+
+        Parameters:
+            key: parameter key
+            duts: list of DUT ids (default: all DUTs with this parameter)
+            f: single frequency. The values are interpolated linearly per
+               DUT (the DUTs may have different frequency grids), outside
+               the grid the border values are held.
+            band: frequency band [f_start, f_stop] (all points inside),
+                  ignored if f is given
+            For band or the full trace (neither f nor band given), all DUTs
+            must have the same frequency grid.
+
+        Returns:
+            dut_ids: list of the DUT ids (order of the rows)
+            f: frequency (scalar f) or frequency vector of the band
+            values: complex array (K,) for a single frequency, (K, F)
+                    otherwise
+        """
+        groups = self._index['groups']
+        if duts is None:
+            duts = [dut_id for dut_id, dut in self._index['duts'].items()
+                    if any(key in keys for keys in groups[dut['group']]['fields'].values())]
+
+        # DUTs per group, the order of the output is kept
+        by_group = {}
+        for row, dut_id in enumerate(duts):
+            dut = self._index['duts'][dut_id]
+            by_group.setdefault(dut['group'], []).append([row, dut['slot']])
+
+        if f is None and len(by_group) > 1:
+            raise Exception('The selected DUTs have different frequency grids, select one grid or a single frequency')
+
+        values = None
+        f_out = f
+        for group, rows in by_group.items():
+            entry = groups[group]
+            field = next((name for name, keys in entry['fields'].items() if key in keys), None)
+            if field is None:
+                raise Exception(f"Parameter {key} is not stored for all selected DUTs")
+            param = entry['fields'][field].index(key)
+            f_grid = np.load(os.path.join(self.store_dir, group, 'f.npy'), mmap_mode='r')
+
+            if f is not None:
+                idx = int(np.clip(np.searchsorted(f_grid, f, side='right') - 1, 0, len(f_grid) - 2))
+                weight = np.clip((f - f_grid[idx]) / (f_grid[idx + 1] - f_grid[idx]), 0, 1)
+                start = idx
+                stop = idx + 2
+            else:
+                [start, stop] = [0, len(f_grid)]
+                if band is not None:
+                    start = int(np.searchsorted(f_grid, band[0], side='left'))
+                    stop = int(np.searchsorted(f_grid, band[1], side='right'))
+                f_out = np.array(f_grid[start:stop])
+
+            if values is None:
+                shape = (len(duts),) if f is not None else (len(duts), stop - start)
+                values = np.empty(shape, dtype=np.dtype(entry['dtype']))
+
+            rows = np.array(rows)
+            [chunks, pos] = np.divmod(rows[:, 1], CHUNK_SIZE)
+            for chunk in np.unique(chunks):
+                select = chunks == chunk
+                # (stop - start, CHUNK_SIZE) block, contiguous per frequency
+                block = self._chunk(group, field, int(chunk))[param, start:stop, :]
+                part = block[:, pos[select]].T
+                if f is not None:
+                    part = part[:, 0] + weight * (part[:, 1] - part[:, 0])
+                values[rows[select, 0]] = part
+
+        if values is None:
+            values = np.empty((0,), dtype=self.dtype)
+
+        return [list(duts),
+                f_out,
+                values]
+
+    def read_scalar(self, name, duts=None):
+
+        """
+        Reads one scalar metric across many DUTs.
+
+        Parameters:
+            name: name of the metric
+            duts: list of DUT ids (default: all DUTs)
+
+        Returns:
+            dut_ids: list of the DUT ids
+            values: array (K,), NaN for DUTs without this metric
+        """
+        if duts is None:
+            duts = self.duts()
+
+        values = np.array([self._index['duts'][dut_id]['scalars'].get(name, np.nan) for dut_id in duts],
+                          dtype=np.float64)
+
+        return [list(duts),
+                values]
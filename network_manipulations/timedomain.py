@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+This file contains functions to transform S-parameters into the time domain
+(impulse and step responses, TDR/TDT). All N^2 parameters are transformed
+with one FFT call along the frequency axis of the stacked (F, N, N) array.
+
+Two modes are available:
+    lowpass:  the data is extrapolated to DC and placed on a harmonic grid
+              (f = k * df). The responses are real, step responses and TDR
+              impedance profiles are possible.
+    bandpass: only the measured band is used. The result is the magnitude of
+              the complex envelope of the impulse response (no DC needed,
+              but no step response).
+
+The returned time vector starts at 0 s and is shared by all traces, so it
+can be passed directly to multiplot (and to time_normalizer) together with
+measured oscilloscope traces.
+
+Implemented functions:
+    time_response: impulse or step responses of all S-parameters
+    tdr_impedance: TDR impedance profiles of all ports
+"""
+
+# needed packages
+import numpy as np
+
+from .resample import interp_Sparam
+
+# definition of constants
+MAX_FFT_POINTS = 2**18 # upper limit of the frequency points of the FFT grid
+KAISER_BETA = 6        # beta of the Kaiser window
+
+
+'''
+    This function calculates a window for the frequency points of the FFT
+    grid. In lowpass mode, the right half of the window is used (maximum at
+    DC), in bandpass mode the full window over the measured band.
+
+    Input Parameters:
+        window: 'hann', 'kaiser' or None (rectangular)
+        n: number of frequency points
+        half: True for the right half of the window (lowpass mode)
+
+    Output Parameters:
+        w: window (n,)
+'''
+def _window(window,
+            n,
+            half):
+
+    length = 2 * n - 1 if half else n
+
+    if window is None:
+        w = np.ones(length)
+    elif window == 'hann':
+        w = np.hanning(length + 2)[1:-1]
+    elif window == 'kaiser':
+        w = np.kaiser(length, KAISER_BETA)
+    else:
+        raise ValueError('ERROR: No valid keyword for window found.')
+
+    if half:
+        w = w[n - 1:]
+
+    return w
+
+
+
+'''
+    This function extrapolates the S-parameters to DC and maps them onto a
+    harmonic frequency grid 0, df, 2*df, ..., f_max. The DC value is the real
+    part of the linear extrapolation of the two lowest measured points (or a
+    given value), the points between DC and the lowest measured point are
+    interpolated linearly.
+
+    Input Parameters:
+        f: frequency vector (F,)
+        s: complex S-array (F, N, N)
+        df: frequency step of the grid (default: lowest measured frequency)
+        dc: DC value (scalar or (N, N)), None for extrapolation
+
+    Output Parameters:
+        f_uni: harmonic frequency grid
+        s_uni: S-array on the harmonic grid
+'''
+def _lowpass_grid(f,
+                  s,
+                  df=None,
+                  dc=None):
+
+    if df is None:
+        df = max(f[0], f[-1] / MAX_FFT_POINTS)
+    nfft = int(round(f[-1] / df))
+    f_uni = np.arange(nfft + 1) * df
+
+    s_uni = interp_Sparam(s, f_uni, f=f, extrapolate=True)
+    # on the same grid interp_Sparam returns s itself (e.g. a read-only
+    # memmap of the cache), it is changed in place below
+    if np.may_share_memory(s_uni, s):
+        s_uni = s_uni.copy()
+
+    if dc is None:
+        dc = (s[0] - f[0] * (s[1] - s[0]) / (f[1] - f[0])).real
+    below = f_uni < f[0]
+    weight = (f_uni[below] / f[0])[:, np.newaxis, np.newaxis]
+    s_uni[below] = dc + weight * (s[0] - dc)
+
+    return [f_uni,
+            s_uni]
+
+
+
+'''
+    This function transforms the S-parameters into impulse or step responses.
+    The impulse response is scaled to h(t)*dt, so its sum is the DC value and
+    the step response (cumulative sum) ends at the DC value.
+
+    Input Parameters:
+        SParams: network object or SParameterSet
+        response: 'impulse' or 'step' (lowpass mode only)
+        mode: 'lowpass' or 'bandpass'
+        window: 'hann', 'kaiser' or None (rectangular)
+        df: frequency step of the FFT grid (default: lowest measured
+            frequency, lowpass mode; the measured band is divided into as
+            many points as measured, bandpass mode). The time span is 1/df.
+        upsample: factor for zero padding (finer time step)
+        dc: DC value for the lowpass mode (scalar or (N, N)), None for
+            extrapolation out of the lowest points
+        t_stop: only the times up to t_stop are returned (optional)
+
+    Output Parameters:
+        time: time vector, starting at 0 s (T,)
+        h: responses of all parameters (T, N, N), real in lowpass mode,
+           magnitude of the envelope in bandpass mode
+'''
+def time_response(SParams,
+                  response='impulse',
+                  mode='lowpass',
+                  window='hann',
+                  df=None,
+                  upsample=1,
+                  dc=None,
+                  t_stop=None):
+
+    f = np.asarray(SParams.f, dtype=np.float64)
+    s = np.asarray(SParams.s)
+
+    if response not in ('impulse', 'step'):
+        raise ValueError('ERROR: No valid keyword for response found.')
+
+    if mode == 'lowpass':
+        [f_uni, s_uni] = _lowpass_grid(f, s, df, dc)
+        s_uni *= _window(window, len(f_uni), half=True)[:, np.newaxis, np.newaxis]
+        nTime = 2 * (len(f_uni) - 1) * upsample
+        h = np.fft.irfft(s_uni, n=nTime, axis=0)
+        if response == 'step':
+            h = np.cumsum(h, axis=0)
+    elif mode == 'bandpass':
+        if response == 'step':
+            raise Exception('Step responses need the lowpass mode')
+        if df is None:
+            df = (f[-1] - f[0]) / (len(f) - 1)
+        f_uni = np.arange(f[0], f[-1] + 0.5 * df, df)
+        s_uni = interp_Sparam(s, f_uni, f=f, extrapolate=True)
+        if np.may_share_memory(s_uni, s):
+            s_uni = s_uni.copy()
+        s_uni *= _window(window, len(f_uni), half=False)[:, np.newaxis, np.newaxis]
+        nTime = len(f_uni) * upsample
+        # envelope of the real response (positive and negative frequencies)
+        h = 2 * np.abs(np.fft.ifft(s_uni, n=nTime, axis=0))
+    else:
+        raise ValueError('ERROR: No valid keyword for mode found.')
+
+    time = np.arange(nTime) / (nTime * (f_uni[1] - f_uni[0]))
+
+    if t_stop is not None:
+        stop = np.searchsorted(time, t_stop, side='right')
+        time = time[:stop]
+        h = h[:stop]
+
+    return [time,
+            h]
+
+
+
+'''
+    This function calculates the TDR impedance profiles of all ports out of
+    the step responses of the reflection coefficients,
+        Z(t) = Z0 * (1 + rho(t)) / (1 - rho(t)).
+
+    Input Parameters:
+        SParams: network object or SParameterSet
+        port_imp: port impedance (50 Ohm if not given)
+        window: 'hann', 'kaiser' or None (rectangular)
+        df: frequency step of the FFT grid (see time_response)
+        upsample: factor for zero padding (finer time step)
+        t_stop: only the times up to t_stop are returned (optional)
+
+    Output Parameters:
+        time: time vector, starting at 0 s (T,)
+        Z: impedance profiles of all ports (T, N), NaN where rho = 1
+'''
+def tdr_impedance(SParams,
+                  port_imp=50,
+                  window='hann',
+                  df=None,
+                  upsample=1,
+                  t_stop=None):
+
+    from .SParams import calc_imp_batch
+
+    [time, rho] = time_response(SParams, 'step', 'lowpass', window, df, upsample, t_stop=t_stop)
+    rho = np.ascontiguousarray(np.diagonal(rho, axis1=1, axis2=2))
+
+    Z = calc_imp_batch(rho, 'oneport', port_imp).real
+
+    return [time,
+            Z]
@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+This file contains a dedicated reader for Touchstone (.sNp) files. It parses
+the file straight into NumPy arrays, without building a scikit-rf network
+object first.
+
+Implemented functions:
+    read_touchstone_array: reads a .sNp file into frequency and S-array
+    read_touchstone: reads a .sNp file and returns the extract_Sparam structure
+    read_touchstone_labels: reads the parameter labels out of the header
+"""
+
+# needed packages
+import os
+import re
+import numpy as np
+
+from .myclasses import SParameterSet
+
+# definition of constants
+FREQ_UNITS = {'HZ': 1.0, 'KHZ': 1e3, 'MHZ': 1e6, 'GHZ': 1e9}
+DATA_FORMATS = ('RI', 'MA', 'DB')
+LABEL_PATTERN = re.compile(r'\b(?:re|mag|db):(S\w+)', flags=re.IGNORECASE)
+
+
+'''
+    This function extracts the number of ports out of the file extension
+    (e.g. '.s4p' -> 4).
+
+    Input Parameters:
+        filename: string which stores the filename (including path)
+
+    Output Parameters:
+        NumPorts: number of ports
+'''
+def _ports_from_extension(filename):
+
+    match = re.search(r'\.s(\d+)p$', filename, flags=re.IGNORECASE)
+    if match is None:
+        raise Exception('File extension of ' + str(filename) + ' is not a valid .sNp extension')
+
+    return int(match.group(1))
+
+
+
+'''
+    This function interprets the option line of a Touchstone file
+    (e.g. '# HZ S RI R 50'). Missing entries are set to the defaults given by
+    the Touchstone specification (GHZ, S, MA, R 50).
+
+    Input Parameters:
+        line: option line (starting with '#')
+
+    Output Parameters:
+        freq_mult: multiplier for the frequency column
+        data_format: 'RI', 'MA' or 'DB'
+        port_imp: reference impedance
+'''
+def _parse_option_line(line):
+
+    freq_mult = FREQ_UNITS['GHZ']
+    data_format = 'MA'
+    port_imp = 50.0
+
+    tokens = line[1:].upper().split()
+    cnt = 0
+    while cnt < len(tokens):
+        token = tokens[cnt]
+        if token in FREQ_UNITS:
+            freq_mult = FREQ_UNITS[token]
+        elif token in DATA_FORMATS:
+            data_format = token
+        elif token == 'R':
+            cnt += 1
+            port_imp = float(tokens[cnt])
+        elif token != 'S':
+            raise Exception('Only S-parameter files are supported (found ' + token + ' in option line)')
+        cnt += 1
+
+    return [freq_mult,
+            data_format,
+            port_imp]
+
+
+
+'''
+    This function reads a Touchstone file (version 1, as written by e.g.
+    R&S network analyzers) into NumPy arrays. Comments, the option line and
+    the line wrapping of the data rows (a 4-port record is spread over 4 lines)
+    are handled, all numbers are converted in one vectorized call.
+
+    Input Parameters:
+        filename: string which stores the filename (including path) of the
+                  .sNp file
+
+    Output Parameters:
+        f: frequency vector in Hz
+        s: complex S-parameter array of shape (fLen, NumPorts, NumPorts)
+        port_imp: reference impedance given in the option line
+'''
+def read_touchstone_array(filename):
+
+    filename = os.fspath(filename)
+    NumPorts = _ports_from_extension(filename)
+
+    option_line = None
+
+    with open(filename, 'r') as file:
+        text = file.read()
+
+    # walk through the header until the first data line is found
+    pos = 0
+    while pos < len(text):
+        end = text.find('\n', pos)
+        if end == -1:
+            end = len(text)
+        line = text[pos:end].split('!', 1)[0].strip()
+        if line.startswith('#'):
+            option_line = line
+        elif line.startswith('['):
+            raise Exception('Touchstone version 2 keywords are not supported')
+        elif line:
+            break
+        pos = end + 1
+    body = text[pos:]
+
+    # usually there are no comments between the data lines, otherwise
+    # strip them line by line
+    if '!' in body or '#' in body or '[' in body:
+        data_lines = []
+        for line in body.splitlines():
+            line = line.split('!', 1)[0]
+            if line.lstrip().startswith(('#', '[')):
+                raise Exception('Option line or keywords inside the data block of ' + filename)
+            data_lines.append(line)
+        body = ' '.join(data_lines)
+
+    if option_line is None:
+        option_line = '#'
+    [freq_mult, data_format, port_imp] = _parse_option_line(option_line)
+
+    data = np.fromstring(body, sep=' ')
+
+    RecordLen = 1 + 2 * NumPorts**2
+    if data.size == 0:
+        raise Exception('File ' + filename + ' contains no data')
+    if data.size % RecordLen != 0:
+        raise Exception('Number of values in ' + filename + ' does not match a ' + str(NumPorts) + '-port file')
+
+    data = data.reshape(-1, RecordLen)
+    f = data[:, 0] * freq_mult
+    val_1 = data[:, 1::2]
+    val_2 = data[:, 2::2]
+
+    if data_format == 'RI':
+        s = val_1 + 1j * val_2
+    elif data_format == 'MA':
+        s = val_1 * np.exp(1j * np.deg2rad(val_2))
+    else:
+        s = 10**(val_1 / 20) * np.exp(1j * np.deg2rad(val_2))
+
+    s = s.reshape(-1, NumPorts, NumPorts)
+
+    # 2-port files are stored column-wise (S11 S21 S12 S22)
+    if NumPorts == 2:
+        s = s.transpose(0, 2, 1)
+
+    s = np.ascontiguousarray(s)
+
+    return [f,
+            s,
+            port_imp]
+
+
+
+'''
+    This function reads a Touchstone file and extracts the important
+    parameters out of it. It returns the same structure as extract_Sparam,
+    but skips the creation of a network object.
+
+    Input Parameters:
+        filename: string which stores the filename (including path) of the
+                  .sNp file
+
+    Output Parameters:
+        NumPorts: number of ports
+        fLen: number of measured points
+        f: frequency vector
+        SParams: S-Parameters as SParameterSet, can be accessed by
+                 keyword(e.g. SParams['S11'])
+'''
+def read_touchstone(filename):
+
+    [f, s, port_imp] = read_touchstone_array(filename)
+
+    SParams = SParameterSet(f, s)
+    NumPorts = SParams.NumPorts
+    fLen = SParams.fLen
+
+    return [NumPorts,
+            fLen,
+            f,
+            SParams]
+
+
+
+'''
+    This function extracts the parameter labels out of comment lines (e.g.
+    '! freq[Hz]  re:S11  im:S11  re:S12 ...' or 're:Sdd11 ...' for files with
+    mixed-mode parameters, as written by R&S network analyzers).
+
+    Input Parameters:
+        text: header text (comment lines, e.g. also the comments of a network
+              object)
+
+    Output Parameters:
+        labels: list of the labels in the order of the data (e.g. ['S11',
+                'S12', ...]), empty if no labels are found
+'''
+def parse_labels(text):
+
+    labels = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith('!'):
+            line = line[1:]
+        labels += LABEL_PATTERN.findall(line)
+
+    # the mode letters are lower case, the port numbers are kept
+    return [label[0].upper() + label[1:].lower() for label in labels]
+
+
+
+'''
+    This function extracts the parameter labels out of the comments of a
+    network object. scikit-rf stores the comments after the option line
+    (where R&S writes the labels) separately.
+
+    Input Parameters:
+        InputNetwork: network object
+
+    Output Parameters:
+        labels: list of the labels in the order of the data, empty if no
+                labels are found
+'''
+def _network_labels(InputNetwork):
+
+    text = (getattr(InputNetwork, 'comments', '') or '') + '\n' + \
+           (getattr(InputNetwork, 'comments_after_option_line', '') or '')
+
+    return parse_labels(text)
+
+
+
+'''
+    This function reads the parameter labels out of the header of a
+    Touchstone file (only the header is read).
+
+    Input Parameters:
+        filename: string which stores the filename (including path) of the
+                  .sNp file
+
+    Output Parameters:
+        labels: list of the labels in the order of the data (e.g. ['S11',
+                'S12', ...] or ['Sdd11', 'Sdc11', ...]), empty if the file has
+                no labels
+'''
+def read_touchstone_labels(filename):
+
+    header = []
+    with open(os.fspath(filename), 'r') as file:
+        for line in file:
+            stripped = line.strip()
+            if stripped and not stripped.startswith(('!', '#')):
+                break
+            header.append(stripped)
+
+    return parse_labels('\n'.join(header))
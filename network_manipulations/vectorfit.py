@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+This file contains a vector fitting implementation (relaxed vector fitting
+after Gustavsen/Semlyen) to compress S-parameter sets into rational models
+
+    S(s) = d + sum_p r_p / (s - a_p)
+
+with one pole set a_p shared by all N^2 parameters. Poles are either real or
+come in complex-conjugate pairs, so the model is real in the time domain.
+A model needs only a few KB and can be evaluated on any frequency grid.
+
+Implemented functions:
+    vector_fit: fits a rational model to a network / SParameterSet
+    eval_model: evaluates a model on a frequency grid
+    save_model: stores a model in a .npz file
+    load_model: loads a model out of a .npz file
+"""
+
+# needed packages
+import numpy as np
+
+from .myclasses import SParameterSet
+
+
+'''
+    This function generates the starting poles: complex-conjugate pairs with
+    imaginary parts spread over the frequency range and small damping.
+
+    Input Parameters:
+        omega: normalized angular frequency vector
+        NumPoles: number of poles (rounded up to an even number)
+
+    Output Parameters:
+        poles: starting poles, one pole per conjugate pair (imag > 0)
+'''
+def _init_poles(omega,
+                NumPoles):
+
+    beta = np.linspace(omega[0], omega[-1], (NumPoles + 1) // 2)
+    beta = np.maximum(beta, omega[-1] * 1e-3)
+
+    return -beta / 100 + 1j * beta
+
+
+
+'''
+    This function builds the real-valued basis functions of the pole set. A
+    real pole a gives 1/(s - a), a complex pair (a, a*) gives the two
+    functions 1/(s - a) + 1/(s - a*) and j/(s - a) - j/(s - a*).
+
+    Input Parameters:
+        s: complex (normalized) frequency points j*omega
+        poles: poles, one pole per conjugate pair (imag > 0) or real poles
+
+    Output Parameters:
+        Phi: complex basis matrix (F, P) with P = number of all poles
+        is_real: bool array (number of given poles), True for real poles
+'''
+def _basis(s,
+           poles):
+
+    is_real = poles.imag == 0
+    Phi = []
+    for pole, real in zip(poles, is_real):
+        if real:
+            Phi.append(1 / (s - pole.real))
+        else:
+            frac_1 = 1 / (s - pole)
+            frac_2 = 1 / (s - np.conj(pole))
+            Phi.append(frac_1 + frac_2)
+            Phi.append(1j * frac_1 - 1j * frac_2)
+
+    return [np.stack(Phi, axis=1),
+            is_real]
+
+
+
+'''
+    This function stacks the real and the imaginary part of a complex matrix
+    (along the first axis after the batch axes).
+
+    Input Parameters:
+        A: complex array (..., F, X)
+
+    Output Parameters:
+        A_real: real array (..., 2F, X)
+'''
+def _real_stack(A):
+
+    return np.concatenate([A.real, A.imag], axis=-2)
+
+
+
+'''
+    This function performs one pole relocation step of the relaxed vector
+    fitting. Every response gets its own least-squares block; only the part of
+    the QR decomposition belonging to the common weighting function sigma is
+    kept, so the system for sigma stays small.
+
+    Input Parameters:
+        s: complex (normalized) frequency points
+        H: responses (F, M)
+        poles: current poles
+        W: weights (F, M)
+
+    Output Parameters:
+        poles: relocated (stable) poles
+'''
+def _relocate_poles(s,
+                    H,
+                    poles,
+                    W):
+
+    [Phi, is_real] = _basis(s, poles)
+    [fLen, M] = H.shape
+    P = Phi.shape[1]
+
+    # unknowns per response: [c_m, d_m, c_sigma, d_sigma]
+    Left = np.concatenate([Phi, np.ones((fLen, 1))], axis=1)
+    A = np.empty((M, fLen, 2 * (P + 1)), dtype=complex)
+    A[:, :, :P + 1] = W.T[:, :, np.newaxis] * Left
+    A[:, :, P + 1:] = -(W * H).T[:, :, np.newaxis] * Left
+    R = np.linalg.qr(_real_stack(A), mode='r')
+    R22 = R[:, P + 1:, P + 1:].reshape(-1, P + 1)
+
+    # relaxation: the real part of sigma summed over frequency is fixed
+    scale = np.linalg.norm(W * H) / fLen
+    Constraint = scale * np.concatenate([Phi.real.sum(axis=0), [fLen]])
+    System = np.vstack([R22, Constraint])
+    rhs = np.zeros(System.shape[0])
+    rhs[-1] = scale * fLen
+
+    x = np.linalg.lstsq(System, rhs, rcond=None)[0]
+    c_sigma = x[:P]
+    d_sigma = x[P]
+    if abs(d_sigma) < 1e-8:
+        d_sigma = np.sign(d_sigma) * 1e-8 if d_sigma else 1e-8
+
+    # zeros of sigma = eigenvalues of (A - b c^T / d) in real state-space form
+    Apol = np.zeros((P, P))
+    b = np.zeros(P)
+    cnt = 0
+    for pole, real in zip(poles, is_real):
+        if real:
+            Apol[cnt, cnt] = pole.real
+            b[cnt] = 1
+            cnt += 1
+        else:
+            Apol[cnt:cnt + 2, cnt:cnt + 2] = [[pole.real, pole.imag], [-pole.imag, pole.real]]
+            b[cnt] = 2
+            cnt += 2
+
+    zeros = np.linalg.eigvals(Apol - np.outer(b, c_sigma) / d_sigma)
+
+    # flip unstable poles, keep one pole per conjugate pair (eigvals of a
+    # real matrix returns exact conjugate pairs and real values)
+    zeros = zeros[zeros.imag >= 0]
+    zeros = -np.abs(zeros.real) + 1j * zeros.imag
+
+    return np.sort_complex(zeros)
+
+
+
+'''
+    This function fits a rational model with a common pole set to all N^2
+    S-parameters of a network.
+
+    Input Parameters:
+        SParams: network object or SParameterSet
+        NumPoles: number of poles (complex pairs count as two poles)
+        n_iter: number of pole relocation steps
+        weight: 'none' for uniform weighting, 'relative' for 1/|S| weighting
+        calc_NMSE: if True, the fit error is calculated with
+                   calc_Sparam_NMSE_batch and stored in the model
+
+    Output Parameters:
+        model: dict with the keys
+               'poles' complex poles in rad/s (one per conjugate pair),
+               'residues' complex residues (P, N, N), 'd' constant term
+               (N, N), 'f_range' fitted frequency range and (if calculated)
+               'NMSERef' / 'NMSETrans' of the fit
+'''
+def vector_fit(SParams,
+               NumPoles=40,
+               n_iter=5,
+               weight='none',
+               calc_NMSE=True):
+
+    f = np.asarray(SParams.f, dtype=np.float64)
+    s_meas = np.asarray(SParams.s)
+    [fLen, NumPorts, _] = s_meas.shape
+
+    # normalize the frequency for a better conditioning
+    omega_scale = 2 * np.pi * f[-1]
+    s = 1j * 2 * np.pi * f / omega_scale
+    H = s_meas.reshape(fLen, -1)
+
+    if weight == 'none':
+        W = np.ones(H.shape)
+    elif weight == 'relative':
+        W = 1 / np.maximum(np.abs(H), 1e-6)
+    else:
+        raise ValueError('ERROR: No valid keyword for weight found.')
+
+    poles = _init_poles(s.imag, NumPoles)
+    for cnt in range(n_iter):
+        poles = _relocate_poles(s, H, poles, W)
+
+    # residues of all responses in one least-squares solution
+    [Phi, is_real] = _basis(s, poles)
+    Left = _real_stack(np.concatenate([Phi, np.ones((fLen, 1))], axis=1))
+    Coeff = np.linalg.lstsq(Left, _real_stack(H), rcond=None)[0]
+
+    residues = []
+    cnt = 0
+    for real in is_real:
+        if real:
+            residues.append(Coeff[cnt].astype(complex))
+            cnt += 1
+        else:
+            residues.append(Coeff[cnt] + 1j * Coeff[cnt + 1])
+            cnt += 2
+
+    model = {'poles': poles * omega_scale,
+             'residues': np.array(residues).reshape(-1, NumPorts, NumPorts) * omega_scale,
+             'd': Coeff[-1].reshape(NumPorts, NumPorts),
+             'f_range': np.array([f[0], f[-1]])}
+
+    if calc_NMSE:
+        from .SParams import calc_Sparam_NMSE_batch
+        [NMSERef, NMSETrans] = calc_Sparam_NMSE_batch(eval_model(model, f).s, s_meas)
+        model['NMSERef'] = NMSERef[0]
+        model['NMSETrans'] = NMSETrans[0]
+
+    return model
+
+
+
+'''
+    This function evaluates a rational model on a frequency grid (one matrix
+    product for all parameters).
+
+    Input Parameters:
+        model: model dict (see vector_fit)
+        f: frequency vector in Hz
+
+    Output Parameters:
+        SParams: SParameterSet of the model on the frequency grid f
+'''
+def eval_model(model,
+               f):
+
+    f = np.asarray(f, dtype=np.float64)
+    poles = model['poles']
+    residues = model['residues']
+    NumPorts = residues.shape[-1]
+    is_real = poles.imag == 0
+
+    s = 1j * 2 * np.pi * f[:, np.newaxis]
+    Frac = 1 / (s - poles)
+    s_model = Frac @ residues.reshape(len(poles), -1)
+    s_model += (1 / (s - poles[~is_real].conj())) @ residues[~is_real].reshape(-1, NumPorts**2).conj()
+    s_model += model['d'].reshape(1, -1)
+
+    return SParameterSet(f, s_model.reshape(-1, NumPorts, NumPorts))
+
+
+
+'''
+    This function stores a model in a compressed .npz file.
+
+    Input Parameters:
+        model: model dict (see vector_fit)
+        filename: name of the .npz file
+
+    Output Parameters:
+        None
+'''
+def save_model(model,
+               filename):
+
+    np.savez_compressed(filename, **model)
+
+
+
+'''
+    This function loads a model out of a .npz file.
+
+    Input Parameters:
+        filename: name of the .npz file
+
+    Output Parameters:
+        model: model dict (see vector_fit)
+'''
+def load_model(filename):
+
+    with np.load(filename) as data:
+        model = {key: data[key] for key in data.files}
+
+    return model
@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+This file contains an incremental watch-folder mode for Touchstone exports
+(e.g. a share the VNA writes into). A persistent manifest (JSON) stores for
+every processed file its size, modification time, content hash and the
+calculated metrics. A pass over the folder only processes the files which
+are new or changed since the last pass; their results are appended to a
+results table (CSV). So every pass costs time proportional to the new data,
+not to the whole archive.
+
+A file is treated as changed if its size or modification time differs from
+the manifest entry and its content hash differs as well (a file which was
+only touched is not processed again). Files which were modified less than
+settle seconds ago are skipped, they may still be written by the VNA.
+
+Implemented classes/functions:
+    default_metrics: metrics of one network (QA checks, NMSE, MM loss)
+    FolderWatcher: watcher object with manifest and results table
+"""
+
+# needed packages
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import numpy as np
+
+from .cache import _file_hash
+from .myclasses import SParameterSet
+
+# definition of constants
+MANIFEST_NAME = '.netman_manifest.json' # default manifest file in the folder
+RESULTS_NAME = 'netman_results.csv'     # default results table in the folder
+SETTLE_TIME = 2.0                       # minimum age of a file in seconds
+RESULT_COLUMNS = ['file', 'size', 'mtime', 'sha1', 'processed', 'error'] # columns before the metrics
+
+
+'''
+    This function calculates the default metrics of one network: the size of
+    the data, the verdicts of the quality checks (see qa_Sparam), the NMSE
+    to a reference network (if given and of the same size, see
+    calc_Sparam_NMSE_batch, which does not print the result) and for
+    2N-ports the worst differential insertion loss Sdd21 (see
+    S_to_MM_nport).
+
+    Input Parameters:
+        SParams: SParameterSet
+        reference: SParameterSet used as reference for the NMSE (optional)
+
+    Output Parameters:
+        metrics: dict with the metrics (numbers, bools or strings)
+'''
+def default_metrics(SParams,
+                    reference=None):
+
+    from .qa import qa_Sparam
+    from .SParams import S_to_MM_nport, calc_Sparam_NMSE_batch
+
+    qa = qa_Sparam(SParams)
+    metrics = {'NumPorts': SParams.NumPorts,
+               'fLen': SParams.fLen,
+               'f_start': float(SParams.f[0]),
+               'f_stop': float(SParams.f[-1]),
+               'passive': qa['passive'],
+               'reciprocal': qa['reciprocal'],
+               'causal': qa['causal'],
+               'valid': qa['valid']}
+
+    if reference is not None and reference.NumPorts == SParams.NumPorts:
+        [NMSERef, NMSETrans] = calc_Sparam_NMSE_batch(SParams, reference, valuetype='dB', interpolate=True)
+        metrics['NMSE_reflect'] = float(NMSERef[0])
+        metrics['NMSE_transm'] = float(NMSETrans[0])
+
+    if SParams.NumPorts >= 4 and SParams.NumPorts % 2 == 0:
+        Sdd21 = S_to_MM_nport(SParams)['Sdd21']
+        metrics['IL_dd21_dB'] = float(-20 * np.log10(np.max([np.min(np.abs(Sdd21)), 1e-15])))
+
+    return metrics
+
+
+
+'''
+    This function is executed for every new or changed file (in the worker
+    processes, if workers > 1). It reads the file and calculates its metrics.
+
+    Input Parameters:
+        filename: Touchstone file
+        reference: SParameterSet used as reference (optional)
+        metrics: function which calculates the metrics (see default_metrics)
+
+    Output Parameters:
+        filename: processed file
+        metrics: dict with the metrics (None on error)
+        error: error message (None on success)
+'''
+def _watch_worker(filename,
+                  reference,
+                  metrics):
+
+    from .touchstone import read_touchstone_array
+
+    try:
+        [f, s, port_imp] = read_touchstone_array(filename)
+        result = metrics(SParameterSet(f, s), reference)
+    except Exception as error:
+        return [filename, None, f"{type(error).__name__}: {error}"]
+
+    return [filename, result, None]
+
+
+
+"""
+    A class to process the Touchstone files of a folder incrementally. The
+    manifest ('.netman_manifest.json' in the folder, if not given) maps the
+    relative path of every processed file to its size, modification time,
+    SHA-1 hash, metrics and error message. Every processed file appends one
+    row to the results table ('netman_results.csv' in the folder, if not
+    given); a changed file appends a new row, older rows are kept. If a pass
+    yields new metrics, the table is rewritten with the extended header.
+
+    Attributes:
+        path: watched folder
+        manifest_file: filename of the manifest
+        results_file: filename of the results table
+        reference: SParameterSet used as reference for the NMSE (optional)
+        metrics: function which calculates the metrics of one network,
+                 metrics(SParams, reference) -> dict (default_metrics if not
+                 given, must be picklable for workers > 1)
+        recursive: if True, also the subdirectories are watched
+        settle: minimum age of a file in seconds before it is processed
+        workers: number of worker processes (1: in the calling process)
+        stats: dict with the counters 'passes', 'processed', 'failed',
+               'skipped' (unchanged) and 'pending' (too young) of the last
+               pass and the summed time 'time' (in seconds)
+
+    Methods:
+        scan: one pass over the folder
+        run: repeated passes (watch mode)
+        results: the manifest entries (metrics of all processed files)
+"""
+class FolderWatcher:
+    def __init__(self, path, manifest_file=None, results_file=None, reference=None,
+                 metrics=None, recursive=True, settle=SETTLE_TIME, workers=1):
+
+        self.path = os.path.abspath(os.fspath(path))
+        self.manifest_file = manifest_file or os.path.join(self.path, MANIFEST_NAME)
+        self.results_file = results_file or os.path.join(self.path, RESULTS_NAME)
+        self.metrics = metrics or default_metrics
+        self.recursive = recursive
+        self.settle = settle
+        self.workers = workers
+        self.stats = {'passes': 0, 'processed': 0, 'failed': 0, 'skipped': 0,
+                      'pending': 0, 'time': 0.0}
+
+        if isinstance(reference, (str, os.PathLike)):
+            from .touchstone import read_touchstone_array
+            [f, s, port_imp] = read_touchstone_array(reference)
+            reference = SParameterSet(f, s)
+        self.reference = reference
+
+        self._manifest = self._read_manifest()
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_file, 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self):
+        tmp_file = self.manifest_file + '.tmp'
+        with open(tmp_file, 'w') as file:
+            # numpy scalars of user-defined metrics are stored as numbers
+            json.dump(self._manifest, file, default=lambda value: value.item() if hasattr(value, 'item') else str(value))
+        os.replace(tmp_file, self.manifest_file)
+
+    def _append_results(self, rows):
+        columns = None
+        if os.path.isfile(self.results_file) and os.path.getsize(self.results_file) > 0:
+            with open(self.results_file, 'r', newline='') as file:
+                columns = next(csv.reader(file), None)
+        new_file = columns is None
+        if new_file:
+            columns = list(RESULT_COLUMNS)
+
+        new_keys = []
+        for row in rows:
+            new_keys += [key for key in row if key not in columns and key not in new_keys]
+
+        if new_file or not new_keys:
+            with open(self.results_file, 'a', newline='') as file:
+                writer = csv.DictWriter(file, fieldnames=columns + new_keys, restval='')
+                if new_file:
+                    writer.writeheader()
+                writer.writerows(rows)
+            return
+
+        # new metrics: the table is rewritten with the merged header, the
+        # older rows get empty cells for the new columns
+        with open(self.results_file, 'r', newline='') as file:
+            old_rows = list(csv.DictReader(file))
+        tmp_file = self.results_file + '.tmp'
+        with open(tmp_file, 'w', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=columns + new_keys, restval='')
+            writer.writeheader()
+            writer.writerows(old_rows)
+            writer.writerows(rows)
+        os.replace(tmp_file, self.results_file)
+
+    def results(self):
+        return self._manifest
+
+    def scan(self):
+
+        """
+        Runs one pass over the folder: new and changed files are processed,
+        their results are appended to the results table and the manifest is
+        updated. Files which were removed from the folder are removed from
+        the manifest.
+
+        Returns:
+            processed: dict {filename: metrics} of the processed files
+            failed: dict {filename: error message} of the files which could
+                    not be processed
+        """
+        from .bulk_loader import find_touchstone_files
+
+        start = time.perf_counter()
+        now = time.time()
+        filenames = find_touchstone_files(self.path, self.recursive)
+        todo = {}
+        skipped = 0
+        pending = 0
+        found = set()
+
+        for filename in filenames:
+            name = os.path.relpath(filename, self.path)
+            found.add(name)
+            try:
+                stat = os.stat(filename)
+            except OSError:
+                continue
+            entry = self._manifest.get(name)
+            if entry is not None and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                skipped += 1
+                continue
+            if now - stat.st_mtime < self.settle:
+                pending += 1
+                continue
+            digest = _file_hash(filename)
+            if entry is not None and entry['sha1'] == digest:
+                # only touched: the metrics are still valid
+                entry['size'] = stat.st_size
+                entry['mtime_ns'] = stat.st_mtime_ns
+                skipped += 1
+                continue
+            todo[filename] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha1': digest}
+
+        for name in set(self._manifest) - found:
+            del self._manifest[name]
+
+        if self.workers > 1 and len(todo) > 1:
+            chunksize = max(1, len(todo) // (4 * self.workers))
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                outputs = list(executor.map(_watch_worker, todo, repeat(self.reference),
+                                            repeat(self.metrics), chunksize=chunksize))
+        else:
+            outputs = [_watch_worker(filename, self.reference, self.metrics) for filename in todo]
+
+        processed = {}
+        failed = {}
+        rows = []
+        for [filename, metrics, error] in outputs:
+            name = os.path.relpath(filename, self.path)
+            entry = dict(todo[filename], metrics=metrics, error=error, processed=now)
+            self._manifest[name] = entry
+            rows.append(dict(metrics or {}, file=name, size=entry['size'],
+                             mtime=entry['mtime_ns'] / 1e9, sha1=entry['sha1'],
+                             processed=now, error=error or ''))
+            if error is not None:
+                failed[filename] = error
+            else:
+                processed[filename] = metrics
+
+        if rows:
+            self._append_results(rows)
+        self._write_manifest()
+
+        self.stats['passes'] += 1
+        self.stats['processed'] = len(processed)
+        self.stats['failed'] = len(failed)
+        self.stats['skipped'] = skipped
+        self.stats['pending'] = pending
+        self.stats['time'] += time.perf_counter() - start
+
+        return [processed,
+                failed]
+
+    def run(self, interval=10.0, max_passes=None, callback=None):
+
+        """
+        Watches the folder: runs a pass every interval seconds, until
+        max_passes passes are done (forever if not given) or the watcher is
+        stopped with Ctrl+C.
+
+        Parameters:
+            interval: time between two passes in seconds
+            max_passes: number of passes (optional)
+            callback: function called after every pass with the output of
+                      scan (optional)
+        """
+        cnt = 0
+        try:
+            while max_passes is None or cnt < max_passes:
+                [processed, failed] = self.scan()
+                if callback is not None:
+                    callback(processed, failed)
+                cnt += 1
+                if max_passes is None or cnt < max_passes:
+                    time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
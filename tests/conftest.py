@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+Common settings of the tests: the package is imported from the repository
+(no installation needed) and the example files are found via path_ntwk.
+"""
+
+# needed packages
+import os
+import subprocess
+import sys
+import textwrap
+
+import matplotlib
+matplotlib.use('Agg')
+
+# definition of constants
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+path_ntwk = os.path.join(REPO_DIR, 'Examples', 'Touchstone') + os.sep
+
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+
+'''
+    This function writes a copy of a Touchstone file with only the first
+    points (the header is kept). It is used to change a file in place, like
+    a VNA which overwrites an export with a shorter sweep.
+
+    Input Parameters:
+        source: Touchstone file to copy
+        target: filename of the copy
+        fLen: number of points to keep
+
+    Output Parameters:
+        None
+'''
+def write_truncated(source,
+                    target,
+                    fLen):
+
+    NumPorts = int(os.path.splitext(source)[1][2:-1])
+    # R&S wraps the record of a 4-port over 4 lines
+    lines_per_point = NumPorts if NumPorts > 2 else 1
+
+    with open(source, 'r') as file:
+        lines = file.read().splitlines()
+    header = [line for line in lines if line.strip() and line.lstrip()[0] in '!#']
+    data = [line for line in lines if line.strip() and line.lstrip()[0] not in '!#']
+
+    with open(target, 'w') as file:
+        file.write('\n'.join(header + data[:fLen * lines_per_point]) + '\n')
+
+
+
+'''
+    This function runs a script in a new interpreter and checks that it
+    finished without a signal or an error.
+
+    Input Parameters:
+        script: Python source code
+        args: command line arguments of the script
+
+    Output Parameters:
+        None
+'''
+def run_isolated(script,
+                 *args):
+
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    result = subprocess.run([sys.executable, '-c', textwrap.dedent(script)] + [str(arg) for arg in args],
+                            env=env, capture_output=True, text=True, timeout=300)
+
+    assert result.returncode == 0, f"returncode {result.returncode}\n{result.stderr}"
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+Tests of the bulk loader: the loaded sets give the same data as the reader,
+the temporary directory is removed with the sets, and arrays which are
+still memory-mapped survive a second load into the same out_dir after the
+file got shorter. A .npy file which is overwritten in place makes the old
+maps raise SIGBUS, so this check runs in a subprocess.
+"""
+
+# needed packages
+import gc
+import os
+import shutil
+
+import numpy as np
+
+import network_manipulations as netman
+from conftest import REPO_DIR, path_ntwk, run_isolated
+
+
+def test_bulk_loader_matches_reader(tmp_path):
+
+    shutil.copy(path_ntwk + 'exam_4.s2p', tmp_path)
+    shutil.copy(path_ntwk + 'exam_6.s1p', tmp_path)
+    shutil.copy(path_ntwk + 'exam_5.s4p', tmp_path)
+
+    [SParamSets, failed] = netman.load_touchstone_dir(tmp_path, workers=1)
+
+    assert list(failed) == [str(tmp_path / 'exam_5.s4p')]
+    for name in ['exam_4.s2p', 'exam_6.s1p']:
+        [f, s, port_imp] = netman.read_touchstone_array(path_ntwk + name)
+        np.testing.assert_array_equal(SParamSets[str(tmp_path / name)].s, s)
+
+
+def test_bulk_loader_removes_temporary_directory(tmp_path):
+
+    shutil.copy(path_ntwk + 'exam_4.s2p', tmp_path)
+
+    [SParamSets, failed] = netman.load_touchstone_dir(tmp_path, workers=1)
+    tmp_dir = SParamSets[str(tmp_path / 'exam_4.s2p')].owner.name
+    assert os.path.isdir(tmp_dir)
+
+    del SParamSets
+    gc.collect()
+    assert not os.path.isdir(tmp_dir)
+
+
+def test_bulk_loader_reload_keeps_old_maps(tmp_path):
+
+    run_isolated('''
+        import os, sys
+        import numpy as np
+        import network_manipulations as netman
+        sys.path.insert(0, os.path.join(sys.argv[1], 'tests'))
+        from conftest import write_truncated, path_ntwk
+
+        data_dir = os.path.join(sys.argv[2], 'data')
+        out_dir = os.path.join(sys.argv[2], 'out')
+        os.makedirs(data_dir)
+        source = os.path.join(data_dir, 'dut.s4p')
+        write_truncated(path_ntwk + 'exam_1.s4p', source, 4001)
+        [old, failed] = netman.load_touchstone_dir(data_dir, workers=1, out_dir=out_dir)
+        total = np.abs(old[source].s).sum()
+
+        write_truncated(path_ntwk + 'exam_1.s4p', source, 10)
+        [new, failed] = netman.load_touchstone_dir(data_dir, workers=1, out_dir=out_dir)
+
+        assert new[source].fLen == 10
+        assert np.abs(old[source].s).sum() == total
+    ''', REPO_DIR, tmp_path)
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+Tests of the Touchstone cache: reloads give the same data as the reader,
+arrays which are still memory-mapped survive a reload of a changed
+(shorter) file and concurrent misses leave no orphaned sidecars. A sidecar
+which is overwritten in place makes the old maps raise SIGBUS, so this
+check runs in a subprocess.
+"""
+
+# needed packages
+import os
+
+import numpy as np
+
+import network_manipulations as netman
+from conftest import REPO_DIR, path_ntwk, run_isolated
+
+
+def test_cache_hit_matches_reader(tmp_path):
+
+    cache = netman.TouchstoneCache(tmp_path / 'cache')
+    [f, s, port_imp] = netman.read_touchstone_array(path_ntwk + 'exam_4.s2p')
+
+    for cnt in range(2):
+        [NumPorts, fLen, f_cache, SParams] = cache.load(path_ntwk + 'exam_4.s2p')
+        np.testing.assert_array_equal(f_cache, f)
+        np.testing.assert_array_equal(SParams.s, s)
+
+    assert [cache.stats['misses'], cache.stats['hits']] == [1, 1]
+
+
+def test_cache_index_survives_new_object(tmp_path):
+
+    with netman.TouchstoneCache(tmp_path / 'cache') as cache:
+        cache.load(path_ntwk + 'exam_4.s2p')
+        cache.load(path_ntwk + 'exam_6.s1p')
+
+    cache = netman.TouchstoneCache(tmp_path / 'cache')
+    cache.load(path_ntwk + 'exam_4.s2p')
+
+    assert [cache.stats['misses'], cache.stats['hits']] == [0, 1]
+
+
+def test_cache_reload_of_changed_file_keeps_old_maps(tmp_path):
+
+    run_isolated('''
+        import os, sys
+        import numpy as np
+        import network_manipulations as netman
+        sys.path.insert(0, os.path.join(sys.argv[1], 'tests'))
+        from conftest import write_truncated, path_ntwk
+
+        source = os.path.join(sys.argv[2], 'dut.s4p')
+        write_truncated(path_ntwk + 'exam_1.s4p', source, 4001)
+        cache = netman.TouchstoneCache(os.path.join(sys.argv[2], 'cache'))
+        [NumPorts, fLen, f_old, SParams_old] = cache.load(source)
+        total = np.abs(SParams_old.s).sum()
+
+        write_truncated(path_ntwk + 'exam_1.s4p', source, 10)
+        os.utime(source, ns=(0, os.stat(source).st_mtime_ns + 10**9))
+        [NumPorts, fLen, f_new, SParams_new] = cache.load(source)
+
+        assert fLen == 10
+        assert np.abs(SParams_old.s).sum() == total
+        assert len(f_old) == 4001
+    ''', REPO_DIR, tmp_path)
+
+
+def test_concurrent_misses_leave_no_orphans(tmp_path):
+
+    # both objects read the (empty) index before the first miss, like two
+    # processes which load the same file at the same time
+    first = netman.TouchstoneCache(tmp_path / 'cache')
+    second = netman.TouchstoneCache(tmp_path / 'cache')
+    first.load(path_ntwk + 'exam_4.s2p')
+    second.load(path_ntwk + 'exam_4.s2p')
+
+    sidecars = [name for name in os.listdir(tmp_path / 'cache') if name.endswith('.npy')]
+    nbytes = sum(os.path.getsize(tmp_path / 'cache' / name) for name in sidecars)
+
+    assert len(sidecars) == 2
+    assert netman.TouchstoneCache(tmp_path / 'cache').size() == nbytes
+
+
+def test_size_limit_holds_for_merged_index(tmp_path):
+
+    first = netman.TouchstoneCache(tmp_path / 'cache')
+    first.load(path_ntwk + 'exam_4.s2p')
+    size = first.size()
+    second = netman.TouchstoneCache(tmp_path / 'cache', max_size=size + 1)
+    second.load(path_ntwk + 'exam_6.s1p')
+
+    sidecars = [name for name in os.listdir(tmp_path / 'cache') if name.endswith('.npy')]
+    nbytes = sum(os.path.getsize(tmp_path / 'cache' / name) for name in sidecars)
+
+    assert nbytes <= size + 1
+    assert second.stats['evictions'] == 1
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+Tests of the equivalent-circuit fit: known RLC values are recovered out of
+the curves of eval_series_RLC.
+"""
+
+# needed packages
+import numpy as np
+import pytest
+
+import network_manipulations as netman
+
+# definition of constants
+R = np.array([0.01, 0.1, 1.0])
+L = np.array([0.5e-9, 1e-9, 2e-9])
+C = np.array([100e-9, 10e-9, 1e-9])
+
+
+def test_fit_series_RLC_recovers_values():
+
+    f = np.geomspace(1e5, 1e10, 801)
+    Z = netman.eval_series_RLC(f, R, L, C)
+
+    [R_fit, L_fit, C_fit] = netman.fit_series_RLC(f, Z)
+
+    np.testing.assert_allclose(R_fit, R, rtol=1e-9)
+    np.testing.assert_allclose(L_fit, L, rtol=1e-9)
+    np.testing.assert_allclose(C_fit, C, rtol=1e-9)
+
+
+def test_fit_ignores_dc_and_nan_points():
+
+    f = np.concatenate([[0], np.geomspace(1e5, 1e10, 400)])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Z = netman.eval_series_RLC(f, R, L, C)
+    Z[1, 10:20] = complex(np.nan, np.nan)
+
+    with np.errstate(all='raise'):
+        [C_fit, ESR, ESL, SRF] = netman.fit_capacitor(f, Z)
+
+    np.testing.assert_allclose(C_fit, C, rtol=1e-9)
+    np.testing.assert_allclose(ESR, R, rtol=1e-9)
+    np.testing.assert_allclose(ESL, L, rtol=1e-9)
+    np.testing.assert_allclose(SRF, 1 / (2 * np.pi * np.sqrt(L * C)), rtol=1e-9)
+
+
+def test_find_SRF_skips_nan_points():
+
+    f = np.linspace(1e6, 1e9, 2001)
+    Z = netman.eval_series_RLC(f, R, L, C)
+    SRF_true = 1 / (2 * np.pi * np.sqrt(L * C))
+    # the points around the resonance of the second part are missing
+    Z[1, np.abs(f - SRF_true[1]) < 1e6] = complex(np.nan, np.nan)
+
+    SRF = netman.find_SRF(f, Z)
+
+    np.testing.assert_allclose(SRF, SRF_true, rtol=2e-2)
+    assert np.isfinite(SRF).all()
+
+
+def test_find_SRF_without_crossing():
+
+    f = np.linspace(1e6, 1e7, 101)
+    Z = netman.eval_series_RLC(f, 0.1, 1e-9, 1e-3)
+
+    assert np.isnan(netman.find_SRF(f, Z)).all()
+
+
+def test_fit_capacitor_without_capacitance():
+
+    # inductive over the whole range: the fitted 1/C is negative
+    f = np.geomspace(1e5, 1e10, 201)
+    Z = netman.eval_series_RLC(f, 0.1, 1e-9, -1e-6)
+
+    [C_fit, ESR, ESL, SRF] = netman.fit_capacitor(f, Z)
+
+    assert np.isinf(C_fit).all()
+    assert np.isnan(SRF).all()
+    assert ESL[0] == pytest.approx(1e-9, rel=1e-9)
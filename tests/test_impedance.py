@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+Tests of the batch impedance calculation against the formulas of the single
+DUTs (calc_imp_oneport, calc_imp_seriesthru, calc_imp_shuntthru).
+"""
+
+# needed packages
+import numpy as np
+import pytest
+
+import network_manipulations as netman
+from network_manipulations.myclasses import SParameterSet
+from conftest import path_ntwk
+
+
+@pytest.fixture
+def networks():
+
+    [f, s, port_imp] = netman.read_touchstone_array(path_ntwk + 'exam_4.s2p')
+    rng = np.random.default_rng(0)
+
+    return [SParameterSet(f, s * (1 + 0.05 * rng.standard_normal((1, 2, 2)))) for cnt in range(4)]
+
+
+@pytest.mark.parametrize('method, function, param', [('oneport', netman.calc_imp_oneport, 'S11'),
+                                                     ('seriesthru', netman.calc_imp_seriesthru, 'S21'),
+                                                     ('shuntthru', netman.calc_imp_shuntthru, 'S21')])
+def test_batch_matches_single_dut(networks, method, function, param):
+
+    impedance = netman.calc_imp_batch(networks, method, port_imp=50)
+
+    for cnt, SParams in enumerate(networks):
+        expected = function(SParams.f, SParams[param], 'Z', port_imp=50)['Z']
+        np.testing.assert_allclose(impedance[cnt], expected, rtol=1e-9)
+
+
+def test_param_of_many_ports():
+
+    rng = np.random.default_rng(1)
+    s = rng.standard_normal((5, 12, 12)) + 1j * rng.standard_normal((5, 12, 12))
+
+    impedance = netman.calc_imp_batch(s, 'seriesthru', param='S1112')
+
+    np.testing.assert_allclose(impedance, 100 * (1 / s[:, 10, 11] - 1), rtol=1e-12)
+
+    # 'S111' is S1,11 or S11,1 for a 12-port
+    with pytest.raises(Exception):
+        netman.calc_imp_batch(s, 'seriesthru', param='S111')
+
+
+def test_param_by_set_keys(networks):
+
+    SParams = SParameterSet(networks[0].f, networks[0].s, keys=['Sa', 'Sb', 'Sc', 'Sd'])
+
+    impedance = netman.calc_imp_batch([SParams], 'seriesthru', param='Sc')
+
+    np.testing.assert_allclose(impedance[0], 100 * (1 / SParams.s[:, 1, 0] - 1), rtol=1e-12)
+
+
+def test_out_is_validated(networks):
+
+    shape = (len(networks), networks[0].fLen)
+
+    out = np.empty(shape, dtype=np.complex64)
+    impedance = netman.calc_imp_batch(networks, 'seriesthru', out=out)
+    assert impedance is out
+    np.testing.assert_allclose(out, netman.calc_imp_batch(networks, 'seriesthru'), rtol=1e-5)
+
+    with pytest.raises(Exception):
+        netman.calc_imp_batch(networks, 'seriesthru', out=np.empty(shape))
+    with pytest.raises(Exception):
+        netman.calc_imp_batch(networks, 'seriesthru', out=np.empty(shape[1:], dtype=np.complex128))
+
+
+def test_singular_points_are_nan():
+
+    S21 = np.array([0.5, 0, 1e-15, 0.25j])
+
+    with np.errstate(all='raise'):
+        impedance = netman.calc_imp_batch(S21, 'seriesthru')
+
+    assert np.isnan(impedance[1:3]).all()
+    np.testing.assert_allclose(impedance[[0, 3]], 100 * (1 / S21[[0, 3]] - 1), rtol=1e-12)
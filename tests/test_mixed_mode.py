@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+Tests of the mixed-mode transformation (S_to_MM_nport, MM_to_S_nport,
+MixedModeAccessor, extract_MMparam).
+"""
+
+# needed packages
+import numpy as np
+import pytest
+import skrf as rf
+
+import network_manipulations as netman
+from conftest import path_ntwk
+
+
+@pytest.mark.parametrize('pairing', [None, [(1, 3), (2, 4)]])
+def test_mixed_mode_round_trip(pairing):
+
+    [NumPorts, fLen, f, SParams] = netman.read_touchstone(path_ntwk + 'exam_1.s4p')
+
+    MMParams = netman.S_to_MM_nport(SParams, pairing)
+    SBack = netman.MM_to_S_nport(MMParams, pairing)
+
+    np.testing.assert_allclose(SBack.s, SParams.s, atol=1e-14)
+
+
+def test_mixed_mode_formulas():
+
+    [NumPorts, fLen, f, SParams] = netman.read_touchstone(path_ntwk + 'exam_1.s4p')
+    s = SParams.s
+
+    MMParams = netman.S_to_MM_nport(SParams)
+
+    # pairs (1, 2) and (3, 4)
+    np.testing.assert_allclose(MMParams['Sdd11'], 0.5 * (s[:, 0, 0] - s[:, 0, 1] - s[:, 1, 0] + s[:, 1, 1]), atol=1e-14)
+    np.testing.assert_allclose(MMParams['Sdd21'], 0.5 * (s[:, 2, 0] - s[:, 2, 1] - s[:, 3, 0] + s[:, 3, 1]), atol=1e-14)
+    np.testing.assert_allclose(MMParams['Scd21'], 0.5 * (s[:, 2, 0] - s[:, 2, 1] + s[:, 3, 0] - s[:, 3, 1]), atol=1e-14)
+
+
+@pytest.mark.parametrize('convention, pairing', [('interleaved', None), ('grouped', [(1, 3), (2, 4)])])
+def test_accessor_matches_full_transform(convention, pairing):
+
+    [NumPorts, fLen, f, SParams] = netman.read_touchstone(path_ntwk + 'exam_1.s4p')
+
+    MM = netman.MixedModeAccessor(SParams, convention=convention)
+    MMParams = netman.S_to_MM_nport(SParams, pairing)
+
+    assert list(MM.keys()) == list(MMParams.keys())
+    for key in MMParams:
+        np.testing.assert_allclose(MM[key], MMParams[key], atol=1e-14)
+
+
+def test_extract_MMparam_rejects_single_ended_network():
+
+    ntwk = rf.Network(path_ntwk + 'exam_1.s4p')
+
+    with pytest.raises(ValueError):
+        netman.extract_MMparam(ntwk)
+
+
+def test_extract_MMparam_given_key_order():
+
+    ntwk = rf.Network(path_ntwk + 'exam_1.s4p')
+    keys = ['Sdd11', 'Sdc11', 'Sdd12', 'Sdc12', 'Scd11', 'Scc11', 'Scd12', 'Scc12',
+            'Sdd21', 'Sdc21', 'Sdd22', 'Sdc22', 'Scd21', 'Scc21', 'Scd22', 'Scc22']
+
+    [NumPorts, fLen, f, MMParams] = netman.extract_MMparam(ntwk, keys)
+
+    np.testing.assert_array_equal(MMParams['Sdd21'], ntwk.s[:, 2, 0])
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+Tests of cascading and de-embedding against scikit-rf.
+"""
+
+# needed packages
+import numpy as np
+import skrf as rf
+
+import network_manipulations as netman
+from conftest import path_ntwk
+
+
+def test_cascade_2port_matches_skrf():
+
+    [NumPorts, fLen, f, SParams] = netman.read_touchstone(path_ntwk + 'exam_4.s2p')
+    ntwk = rf.Network(path_ntwk + 'exam_4.s2p')
+
+    result = netman.cascade(SParams, SParams, SParams)
+
+    np.testing.assert_allclose(result.s, (ntwk ** ntwk ** ntwk).s, atol=1e-12)
+
+
+def test_cascade_4port_matches_skrf():
+
+    [NumPorts, fLen, f, SParams] = netman.read_touchstone(path_ntwk + 'exam_1.s4p')
+    # thru paths 1 -> 2 and 3 -> 4, skrf connects ports 0, 1 -> 2, 3
+    ntwk = rf.Network(path_ntwk + 'exam_1.s4p')
+    ntwk.renumber([0, 1, 2, 3], [0, 2, 1, 3])
+    reference = rf.network.connect(ntwk, 2, ntwk, 0, num=2)
+    reference.renumber([0, 1, 2, 3], [0, 2, 1, 3])
+
+    result = netman.cascade(SParams, SParams, ports=(1, 3))
+
+    np.testing.assert_allclose(result.s, reference.s, atol=1e-12)
+
+
+def test_deembed_recovers_dut():
+
+    [NumPorts, fLen, f, SParams] = netman.read_touchstone(path_ntwk + 'exam_1.s4p')
+    ntwk = rf.Network(path_ntwk + 'exam_1.s4p')
+    ntwk.renumber([0, 1, 2, 3], [0, 2, 1, 3])
+    # fixture - DUT - fixture, cascaded with skrf
+    chain = rf.network.connect(rf.network.connect(ntwk, 2, ntwk, 0, num=2), 2, ntwk, 0, num=2)
+    chain.renumber([0, 1, 2, 3], [0, 2, 1, 3])
+
+    result = netman.deembed(chain, SParams, SParams, ports=(1, 3))
+
+    np.testing.assert_allclose(result.s, SParams.s, atol=1e-6)
+
+
+def test_deembed_2port_matches_skrf():
+
+    [NumPorts, fLen, f, SParams] = netman.read_touchstone(path_ntwk + 'exam_4.s2p')
+    ntwk = rf.Network(path_ntwk + 'exam_4.s2p')
+    chain = ntwk ** ntwk ** ntwk
+
+    result = netman.deembed(chain, SParams, SParams)
+    reference = ntwk.inv ** chain ** ntwk.inv
+
+    np.testing.assert_allclose(result.s, reference.s, atol=1e-6)
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+Tests of the batch NMSE against the per-pair calculation (calc_Sparam_NMSE).
+"""
+
+# needed packages
+import numpy as np
+import pytest
+
+import network_manipulations as netman
+from network_manipulations.myclasses import SParameterSet
+from conftest import path_ntwk
+
+
+@pytest.fixture
+def networks():
+
+    [NumPorts, fLen, f, SParams] = netman.read_touchstone(path_ntwk + 'exam_4.s2p')
+    rng = np.random.default_rng(0)
+    SComp = [SParameterSet(f, SParams.s * (1 + 0.05 * rng.standard_normal((1, 2, 2)))) for cnt in range(5)]
+
+    return [SParams, SComp]
+
+
+@pytest.mark.parametrize('valuetype', [' ', 'dB'])
+def test_batch_matches_per_pair_loop(networks, valuetype):
+
+    [SRef, SComp] = networks
+
+    [NMSERef, NMSETrans] = netman.calc_Sparam_NMSE_batch(SComp, SRef, valuetype)
+
+    for cnt, SParams in enumerate(SComp):
+        [LoopRef, LoopTrans] = netman.calc_Sparam_NMSE(SParams, SRef, valuetype)
+        assert NMSERef[cnt] == pytest.approx(LoopRef, rel=1e-9)
+        assert NMSETrans[cnt] == pytest.approx(LoopTrans, rel=1e-9)
+
+
+def test_batch_matches_unity_line(networks):
+
+    [SRef, SComp] = networks
+
+    [NMSERef, NMSETrans] = netman.calc_Sparam_NMSE_batch(SComp)
+    [LoopRef, LoopTrans] = netman.calc_Sparam_NMSE(SComp[0], None)
+
+    assert NMSERef[0] == pytest.approx(LoopRef, rel=1e-9)
+    assert NMSETrans[0] == pytest.approx(LoopTrans, rel=1e-9)
+
+
+def test_pairwise_matches_per_pair_loop(networks):
+
+    [SRef, SComp] = networks
+
+    [NMSERef, NMSETrans, PairRef, PairTrans] = netman.calc_Sparam_NMSE_batch(SComp, SRef, pairwise=True)
+
+    for row in range(len(SComp)):
+        for column in range(len(SComp)):
+            [LoopRef, LoopTrans] = netman.calc_Sparam_NMSE(SComp[row], SComp[column])
+            assert PairRef[row, column] == pytest.approx(LoopRef, rel=1e-6, abs=1e-12)
+            assert PairTrans[row, column] == pytest.approx(LoopTrans, rel=1e-6, abs=1e-12)
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+Tests of the oscilloscope .csv reader against np.loadtxt.
+"""
+
+# needed packages
+import os
+
+import numpy as np
+import pytest
+
+import network_manipulations as netman
+from conftest import REPO_DIR
+
+# definition of constants
+path_osci = os.path.join(REPO_DIR, 'Examples', 'Osci') + os.sep
+
+
+'''
+    This function writes a synthetic oscilloscope .csv file (time and two
+    channels).
+
+    Input Parameters:
+        filename: filename of the .csv file
+        delimiter: delimiter of the data lines
+        header: header lines
+
+    Output Parameters:
+        data: written values (L, 3)
+'''
+def write_csv(filename,
+              delimiter,
+              header):
+
+    time = np.arange(1000) * 1e-9 - 5e-7
+    data = np.column_stack([time, np.sin(2e7 * time), np.cos(3e7 * time)])
+    with open(filename, 'w') as file:
+        file.write(''.join(line + '\n' for line in header))
+        for row in data:
+            file.write(delimiter.join(f"{value:.9E}" for value in row) + '\n')
+
+    return data
+
+
+def test_read_csv_traces_example_file():
+
+    [time, yval, names] = netman.read_csv_traces(path_osci + 'exam_1.CSV')
+    data = np.loadtxt(path_osci + 'exam_1.CSV', delimiter=',', skiprows=1)
+
+    assert names == ['s', 'CH1[V]']
+    np.testing.assert_array_equal(time, data[:, 0])
+    np.testing.assert_array_equal(yval, data[:, 1])
+
+
+@pytest.mark.parametrize('delimiter', [',', ';', '\t', ' '])
+def test_read_csv_traces_delimiters(tmp_path, delimiter):
+
+    filename = tmp_path / 'trace.csv'
+    data = write_csv(filename, delimiter, ['Model,DSO', 's,CH1[V],CH2[V]'])
+
+    [time, yval, names] = netman.read_csv_traces(filename)
+
+    np.testing.assert_allclose(time, data[:, 0], rtol=1e-9)
+    np.testing.assert_allclose(yval, data[:, 1:].T, rtol=1e-9)
+
+
+def test_delimiter_detected_from_data_lines(tmp_path):
+
+    # the header contains ',' but the data is ';' separated
+    filename = tmp_path / 'trace.csv'
+    write_csv(filename, ';', ['s,CH1[V],CH2[V]'])
+
+    [header_num, delimiter, names, ncol] = netman.osci_scripts._csv_format(filename)
+
+    assert [header_num, delimiter, ncol] == [1, ';', 3]
+    assert names == ['s', 'CH1[V]', 'CH2[V]']
+
+
+def test_read_csv_traces_float32(tmp_path):
+
+    filename = tmp_path / 'trace.csv'
+    data = write_csv(filename, ',', ['s,CH1[V],CH2[V]'])
+
+    [time, yval, names] = netman.read_csv_traces(filename, dtype=np.float32)
+
+    assert yval.dtype == np.float32
+    np.testing.assert_allclose(yval, data[:, 1:].T, rtol=1e-6, atol=1e-6)
+
+
+@pytest.mark.parametrize('chunksize', [7, 100, 5000])
+def test_stream_csv_stats_matches_full_read(tmp_path, chunksize):
+
+    filename = tmp_path / 'trace.csv'
+    data = write_csv(filename, ';', ['s,CH1[V],CH2[V]'])
+    yval = data[:, 1:].T
+
+    stats = netman.stream_csv_stats(filename, threshold=0.5, decimate=3, chunksize=chunksize)
+
+    assert stats['n'] == len(data)
+    np.testing.assert_allclose(stats['min'], yval.min(axis=1), rtol=1e-9)
+    np.testing.assert_allclose(stats['max'], yval.max(axis=1), rtol=1e-9)
+    np.testing.assert_allclose(stats['mean'], yval.mean(axis=1), rtol=1e-6, atol=1e-12)
+    np.testing.assert_allclose(stats['rms'], np.sqrt(np.mean(yval**2, axis=1)), rtol=1e-9)
+    assert stats['time_offset'] == pytest.approx(data[0, 0], rel=1e-9)
+    np.testing.assert_allclose(stats['time_dec'], data[::3, 0], rtol=1e-9)
+    np.testing.assert_allclose(stats['yval_dec'], yval[:, ::3], rtol=1e-9)
+
+    # local maxima of the first channel above the threshold
+    val = yval[0]
+    idx = np.flatnonzero((val[1:-1] > val[:-2]) & (val[1:-1] >= val[2:]) & (val[1:-1] >= 0.5)) + 1
+    np.testing.assert_allclose(stats['peak_time'], data[idx, 0], rtol=1e-9)
+    np.testing.assert_allclose(stats['peak_val'], val[idx], rtol=1e-9)
+    assert len(idx) > 0
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+Tests of the quality checks (passivity, reciprocity, causality).
+"""
+
+# needed packages
+import os
+import shutil
+
+import numpy as np
+
+import network_manipulations as netman
+from network_manipulations.myclasses import SParameterSet
+from conftest import path_ntwk
+
+
+'''
+    This function generates a matched 2-port delay line (S21 = S12 =
+    a * exp(-j*w*delay)).
+
+    Input Parameters:
+        delay: delay in seconds (negative for a non-causal line)
+        a: magnitude of the transmission
+
+    Output Parameters:
+        SParams: SParameterSet of the line (1 MHz ... 10 GHz)
+'''
+def delay_line(delay,
+               a=0.9):
+
+    f = np.linspace(1e6, 1e10, 1001)
+    s = np.zeros((len(f), 2, 2), dtype=complex)
+    s[:, 0, 1] = s[:, 1, 0] = a * np.exp(-2j * np.pi * f * delay)
+    s[:, 0, 0] = s[:, 1, 1] = 0.05
+
+    return SParameterSet(f, s)
+
+
+def test_passivity_matches_svd():
+
+    [f, s, port_imp] = netman.read_touchstone_array(path_ntwk + 'exam_1.s4p')
+
+    [sigma_max, passive, bands] = netman.check_passivity(SParameterSet(f, s))
+
+    np.testing.assert_allclose(sigma_max, np.linalg.svd(s, compute_uv=False)[:, 0], rtol=1e-9)
+
+
+def test_passivity_violation_bands():
+
+    SParams = delay_line(1e-9)
+    band = (SParams.f >= 2e9) & (SParams.f <= 3e9)
+    SParams.s[band] *= 1.5
+
+    [sigma_max, passive, bands] = netman.check_passivity(SParams)
+
+    assert not passive
+    np.testing.assert_array_equal(bands, [[SParams.f[band][0], SParams.f[band][-1]]])
+
+
+def test_reciprocity_error():
+
+    SParams = delay_line(1e-9)
+    [error, reciprocal, bands] = netman.check_reciprocity(SParams)
+    assert reciprocal
+    assert np.max(error) == 0
+
+    SParams.s[:, 0, 1] += 0.1
+    [error, reciprocal, bands] = netman.check_reciprocity(SParams)
+    assert not reciprocal
+    np.testing.assert_allclose(error, 0.1, rtol=1e-9)
+    np.testing.assert_allclose(bands, [[SParams.f[0], SParams.f[-1]]])
+
+
+def test_causality_of_delay_lines():
+
+    assert netman.check_causality(delay_line(1e-9))[1]
+    assert not netman.check_causality(delay_line(-1e-9))[1]
+
+
+def test_qa_Sparam_verdicts():
+
+    result = netman.qa_Sparam(delay_line(1e-9))
+    assert result['valid']
+
+    result = netman.qa_Sparam(delay_line(-1e-9, a=1.2))
+    assert not result['passive'] and not result['causal'] and result['reciprocal']
+    assert not result['valid']
+
+
+def test_qa_directory(tmp_path):
+
+    for name in ['exam_4.s2p', 'exam_5.s4p', 'exam_6.s1p']:
+        shutil.copy(path_ntwk + name, tmp_path / name)
+
+    [results, failed] = netman.qa_directory(tmp_path, workers=1)
+
+    assert sorted(os.path.basename(name) for name in results) == ['exam_4.s2p', 'exam_6.s1p']
+    assert [os.path.basename(name) for name in failed] == ['exam_5.s4p']
+    [f, s, port_imp] = netman.read_touchstone_array(path_ntwk + 'exam_4.s2p')
+    result = results[str(tmp_path / 'exam_4.s2p')]
+    np.testing.assert_array_equal(result['sigma_max'], netman.qa_Sparam(SParameterSet(f, s))['sigma_max'])
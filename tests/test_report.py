@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+Tests of the headless report generator (PDF and HTML).
+"""
+
+# needed packages
+import os
+import re
+import shutil
+
+import pytest
+
+import network_manipulations as netman
+from conftest import path_ntwk
+
+
+@pytest.fixture
+def lot(tmp_path):
+
+    # a 2-port (comparison page), a 1-port (port mismatch) and an empty file
+    lot_dir = tmp_path / 'lot'
+    lot_dir.mkdir()
+    for name in ['exam_4.s2p', 'exam_6.s1p', 'exam_5.s4p']:
+        shutil.copy(path_ntwk + name, lot_dir / name)
+
+    return lot_dir
+
+
+def test_pdf_report(tmp_path, lot):
+
+    output = tmp_path / 'report.pdf'
+
+    [NumPages, pages_per_second, failed] = netman.build_report(lot, output, golden=path_ntwk + 'exam_4.s2p',
+                                                               imp_method='oneport', workers=1)
+
+    # exam_4: S-parameters, comparison, impedance; exam_6: S-parameters, impedance
+    assert NumPages == 5
+    assert list(failed) == ['exam_5.s4p']
+    # plus the note of exam_6 and the error page of exam_5
+    with open(output, 'rb') as file:
+        assert len(re.findall(rb'/Type /Page\b', file.read())) == 7
+
+
+def test_html_report(tmp_path, lot):
+
+    output = tmp_path / 'report.html'
+
+    [NumPages, pages_per_second, failed] = netman.build_report(lot, output, golden=path_ntwk + 'exam_4.s2p',
+                                                               imp_method='oneport', workers=1)
+
+    assert NumPages == 5
+    assert list(failed) == ['exam_5.s4p']
+    with open(output, 'r', encoding='utf-8') as file:
+        index = file.read()
+    assert index.count('<img ') == 5
+    assert 'exam_6.s1p: comparison' not in index
+    assert 'comparison skipped' in index
+    assert len(os.listdir(tmp_path / 'report_files')) == 5
+
+
+def test_report_of_objects(tmp_path):
+
+    [f, s, port_imp] = netman.read_touchstone_array(path_ntwk + 'exam_4.s2p')
+    SParams = netman.SParameterSet(f, s)
+
+    [NumPages, pages_per_second, failed] = netman.build_report([SParams, SParams], tmp_path / 'report.html',
+                                                               workers=1)
+
+    assert [NumPages, failed] == [2, {}]
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+Tests of the frequency grid mapping against np.interp.
+"""
+
+# needed packages
+import numpy as np
+import pytest
+
+import network_manipulations as netman
+from network_manipulations.myclasses import SParameterSet
+from conftest import path_ntwk
+
+
+@pytest.fixture
+def network():
+
+    [f, s, port_imp] = netman.read_touchstone_array(path_ntwk + 'exam_4.s2p')
+
+    return SParameterSet(f, s)
+
+
+def test_interp_Sparam_matches_np_interp(network):
+
+    f_new = np.linspace(network.f[0], network.f[-1], 777)
+
+    SParams = netman.interp_Sparam(network, f_new)
+
+    for row in range(2):
+        for column in range(2):
+            s = network.s[:, row, column]
+            expected = np.interp(f_new, network.f, s.real) + 1j * np.interp(f_new, network.f, s.imag)
+            np.testing.assert_allclose(SParams.s[:, row, column], expected, rtol=1e-9, atol=1e-12)
+
+
+def test_interp_Sparam_stacked_array(network):
+
+    f_new = np.linspace(network.f[0], network.f[-1], 101)
+    s = np.stack([network.s, 2 * network.s])
+
+    s_new = netman.interp_Sparam(s, f_new, f=network.f)
+
+    assert s_new.shape == (2, 101, 2, 2)
+    np.testing.assert_allclose(s_new[1], 2 * netman.interp_Sparam(network, f_new).s, rtol=1e-12)
+
+
+def test_interp_Sparam_range(network):
+
+    f_new = np.array([network.f[0] / 2, network.f[-1]])
+
+    with pytest.raises(Exception):
+        netman.interp_Sparam(network, f_new)
+
+    s_new = netman.interp_Sparam(network, f_new, extrapolate=True).s
+    np.testing.assert_array_equal(s_new[0], network.s[0])
+
+
+def test_align_Sparam_ref(network):
+
+    SRef = SParameterSet(network.f[::3], network.s[::3])
+
+    [SComp_new, SRef_new] = netman.align_Sparam(network, SRef, grid='ref')
+
+    assert SRef_new is SRef
+    np.testing.assert_array_equal(SComp_new.f, SRef.f)
+    np.testing.assert_allclose(SComp_new.s, SRef.s, rtol=1e-9, atol=1e-12)
+
+    with pytest.raises(Exception):
+        netman.align_Sparam(SRef, network, grid='ref')
+
+
+def test_align_Sparam_common(network):
+
+    SRef = SParameterSet(network.f[10:], network.s[10:])
+    SComp = SParameterSet(network.f[:-10], network.s[:-10])
+
+    [SComp_new, SRef_new] = netman.align_Sparam(SComp, SRef, grid='common')
+
+    np.testing.assert_array_equal(SComp_new.f, network.f[10:-10])
+    np.testing.assert_array_equal(SRef_new.f, network.f[10:-10])
+    np.testing.assert_allclose(SComp_new.s, SRef_new.s, rtol=1e-9, atol=1e-12)
+
+    with pytest.raises(ValueError):
+        netman.align_Sparam(SComp, SRef, grid='nearest')
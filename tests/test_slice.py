@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+Tests of the band selection of slice_Sparam against boolean masks.
+"""
+
+# needed packages
+import numpy as np
+import pytest
+
+import network_manipulations as netman
+from conftest import path_ntwk
+
+
+@pytest.fixture
+def network():
+
+    [NumPorts, fLen, f, SParams] = netman.read_touchstone(path_ntwk + 'exam_4.s2p')
+
+    return SParams
+
+
+def test_without_bands_returns_dict(network):
+
+    dict_input = network.to_dict()
+
+    dict_output = netman.slice_Sparam(['S21'], dict_input)
+
+    assert list(dict_output) == ['S21']
+    assert dict_output['S21'] is dict_input['S21']
+
+
+def test_single_band_of_dict(network):
+
+    f = network.f
+    band = (f >= 1e8) & (f <= 5e8)
+
+    [f_output, dict_output] = netman.slice_Sparam(['S11', 'S21'], network.to_dict(), f=f, bands=[1e8, 5e8])
+
+    np.testing.assert_array_equal(f_output, f[band])
+    np.testing.assert_array_equal(dict_output['S21'], network['S21'][band])
+    assert list(dict_output) == ['S11', 'S21']
+
+
+def test_list_of_bands_of_set(network):
+
+    f = network.f
+    bands = [[1e6, 1e7], [1e8, 5e8], [2e9, 3e9]]
+
+    [f_output, dict_output] = netman.slice_Sparam(None, network, bands=bands, stride=2)
+
+    assert len(f_output) == len(dict_output) == 3
+    for [f_start, f_stop], f_part, SPart in zip(bands, f_output, dict_output):
+        idx = np.flatnonzero((f >= f_start) & (f <= f_stop))[::2]
+        np.testing.assert_array_equal(f_part, f[idx])
+        np.testing.assert_array_equal(SPart.s, network.s[idx])
+        np.testing.assert_array_equal(SPart.f, f[idx])
+    # band above the measured range
+    assert len(f_output[2]) == 0
+
+
+def test_band_of_set_is_view(network):
+
+    [f_output, SPart] = netman.slice_Sparam(None, network, bands=[1e8, 5e8])
+
+    assert isinstance(SPart, netman.SParameterSet)
+    assert np.shares_memory(SPart.s, network.s)
+
+
+def test_band_needs_frequency_vector(network):
+
+    with pytest.raises(Exception):
+        netman.slice_Sparam(['S21'], network.to_dict(), bands=[1e8, 5e8])
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+Tests of the columnar result store.
+"""
+
+# needed packages
+import numpy as np
+import pytest
+
+import network_manipulations as netman
+from network_manipulations.myclasses import SParameterSet
+from network_manipulations.store import CHUNK_SIZE
+from conftest import path_ntwk
+
+
+@pytest.fixture
+def networks():
+
+    [f, s, port_imp] = netman.read_touchstone_array(path_ntwk + 'exam_1.s4p')
+    rng = np.random.default_rng(0)
+
+    # more DUTs than one chunk holds
+    return [SParameterSet(f, s * (1 + 0.01 * rng.standard_normal())) for cnt in range(CHUNK_SIZE + 3)]
+
+
+def test_read_matches_added_data(tmp_path, networks):
+
+    with netman.ResultStore(tmp_path / 'store') as store:
+        for cnt, SParams in enumerate(networks):
+            store.add(f"DUT{cnt}", SParams, {'NMSE': -cnt, 'passive': True})
+
+    store = netman.ResultStore(tmp_path / 'store')
+    SParams = networks[-1]
+
+    np.testing.assert_array_equal(store.read(f"DUT{len(networks) - 1}").s, SParams.s)
+    np.testing.assert_allclose(store.read(f"DUT{len(networks) - 1}", 'MM')['Sdd21'],
+                               netman.S_to_MM_nport(SParams)['Sdd21'], rtol=1e-12)
+
+    [duts, values] = store.read_scalar('NMSE', ['DUT2', 'DUT0'])
+    assert duts == ['DUT2', 'DUT0']
+    np.testing.assert_array_equal(values, [-2, 0])
+    np.testing.assert_array_equal(store.read_scalar('passive')[1], 1)
+
+
+def test_read_param_across_duts(tmp_path, networks):
+
+    store = netman.ResultStore(tmp_path / 'store')
+    for cnt, SParams in enumerate(networks):
+        store.add(f"DUT{cnt}", SParams)
+    f = networks[0].f
+    expected = np.stack([SParams['S31'] for SParams in networks])
+
+    [duts, f_out, values] = store.read_param('S31')
+    assert duts == [f"DUT{cnt}" for cnt in range(len(networks))]
+    np.testing.assert_array_equal(values, expected)
+
+    [duts, f_out, values] = store.read_param('S31', duts=['DUT66', 'DUT1'], band=[1e8, 2e8])
+    band = (f >= 1e8) & (f <= 2e8)
+    np.testing.assert_array_equal(f_out, f[band])
+    np.testing.assert_array_equal(values, expected[[66, 1]][:, band])
+
+    f_point = 0.5 * (f[100] + f[101])
+    [duts, f_out, values] = store.read_param('S31', f=f_point)
+    np.testing.assert_allclose(values, 0.5 * (expected[:, 100] + expected[:, 101]), rtol=1e-12)
+
+
+def test_slot_of_moved_dut_is_reused(tmp_path, networks):
+
+    store = netman.ResultStore(tmp_path / 'store')
+    store.add('A', networks[0])
+    store.add('B', networks[1])
+
+    # A moves to another group (2-port), its slot is taken by C
+    [f, s, port_imp] = netman.read_touchstone_array(path_ntwk + 'exam_4.s2p')
+    store.add('A', SParameterSet(f, s))
+    store.add('C', networks[2])
+
+    assert [store._index['duts'][dut_id]['slot'] for dut_id in ['B', 'C']] == [1, 0]
+    np.testing.assert_array_equal(store.read('A').s, s)
+    np.testing.assert_array_equal(store.read('B').s, networks[1].s)
+    np.testing.assert_array_equal(store.read('C').s, networks[2].s)
+
+
+def test_scalars_must_be_numbers(tmp_path, networks):
+
+    store = netman.ResultStore(tmp_path / 'store')
+
+    with pytest.raises(Exception):
+        store.add('A', networks[0], {'verdict': 'passive'})
+
+    store.add('A', networks[0], {'NMSE': None, 'IL': np.float32(1.5)})
+    assert store._index['duts']['A']['scalars'] == {'IL': 1.5}
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+Tests of the time domain transform.
+"""
+
+# needed packages
+import numpy as np
+import pytest
+import skrf as rf
+
+import network_manipulations as netman
+from network_manipulations.myclasses import SParameterSet
+from conftest import path_ntwk
+
+
+'''
+    This function maps the example 2-port onto the linear frequency grid
+    0, 1.5 MHz, ..., 1.5 GHz (the lowpass grid for df = 1.5 MHz).
+
+    Input Parameters:
+        f_start: first frequency point (0 or 1.5 MHz)
+
+    Output Parameters:
+        SParams: SParameterSet on the linear grid
+'''
+def linear_network(f_start=1.5e6):
+
+    [f, s, port_imp] = netman.read_touchstone_array(path_ntwk + 'exam_4.s2p')
+    f_lin = np.arange(int(round(f_start / 1.5e6)), 1001) * 1.5e6
+
+    return SParameterSet(f_lin, netman.interp_Sparam(s, f_lin, f=f, extrapolate=True))
+
+
+@pytest.mark.parametrize('mode, f_start', [('lowpass', 0), ('bandpass', 1.5e6)])
+def test_input_unchanged_on_linear_grid(mode, f_start):
+
+    SParams = linear_network(f_start)
+    s = SParams.s.copy()
+
+    netman.time_response(SParams, mode=mode, df=1.5e6)
+
+    np.testing.assert_array_equal(SParams.s, s)
+
+
+def test_read_only_cached_set(tmp_path):
+
+    SParams = linear_network()
+    rf.Network(f=SParams.f, s=SParams.s, f_unit='Hz').write_touchstone('linear', dir=str(tmp_path))
+    cache = netman.TouchstoneCache(tmp_path / 'cache')
+    cache.load(tmp_path / 'linear.s2p')
+
+    [NumPorts, fLen, f, SCached] = cache.load(tmp_path / 'linear.s2p')
+    assert cache.stats['hits'] == 1
+    assert not SCached.s.flags.writeable
+    s = np.array(SCached.s)
+
+    [time, h] = netman.time_response(SCached, mode='bandpass')
+
+    np.testing.assert_array_equal(SCached.s, s)
+    assert np.isfinite(h).all()
+
+
+def test_step_response_ends_at_dc():
+
+    SParams = linear_network()
+
+    [time, h] = netman.time_response(SParams, response='step', dc=np.array([[0, 1], [1, 0]]), window=None)
+
+    np.testing.assert_allclose(h[-1], [[0, 1], [1, 0]], atol=1e-9)
+
+
+def test_impulse_response_of_delay_line():
+
+    f = np.linspace(1e7, 1e10, 1000)
+    s = np.zeros((len(f), 1, 1), dtype=complex)
+    s[:, 0, 0] = np.exp(-2j * np.pi * f * 2e-9)
+
+    [time, h] = netman.time_response(SParameterSet(f, s), upsample=4)
+
+    assert time[np.argmax(h[:, 0, 0])] == pytest.approx(2e-9, abs=time[1])
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+Tests of the Touchstone reader against scikit-rf.
+"""
+
+# needed packages
+import numpy as np
+import pytest
+import skrf as rf
+
+import network_manipulations as netman
+from conftest import path_ntwk
+
+
+@pytest.mark.parametrize('name', ['exam_1.s4p', 'exam_3.s4p', 'exam_4.s2p', 'exam_6.s1p'])
+def test_read_touchstone_array_matches_skrf(name):
+
+    [f, s, port_imp] = netman.read_touchstone_array(path_ntwk + name)
+    ntwk = rf.Network(path_ntwk + name)
+
+    assert port_imp == 50
+    np.testing.assert_allclose(f, ntwk.f, rtol=1e-12)
+    np.testing.assert_allclose(s, ntwk.s, rtol=1e-12, atol=1e-15)
+
+
+@pytest.mark.parametrize('form', ['ma', 'db'])
+def test_read_touchstone_array_formats(tmp_path, form):
+
+    ntwk = rf.Network(path_ntwk + 'exam_4.s2p')
+    ntwk.write_touchstone('exam_4_' + form, dir=str(tmp_path), form=form)
+
+    [f, s, port_imp] = netman.read_touchstone_array(tmp_path / f"exam_4_{form}.s2p")
+
+    np.testing.assert_allclose(f, ntwk.f, rtol=1e-9)
+    np.testing.assert_allclose(s, ntwk.s, rtol=1e-6, atol=1e-9)
+
+
+def test_read_touchstone_structure():
+
+    [NumPorts, fLen, f, SParams] = netman.read_touchstone(path_ntwk + 'exam_1.s4p')
+    ntwk = rf.Network(path_ntwk + 'exam_1.s4p')
+
+    assert NumPorts == 4
+    assert fLen == len(ntwk.f)
+    np.testing.assert_allclose(SParams['S21'], ntwk.s[:, 1, 0], rtol=1e-12)
+
+
+def test_read_touchstone_empty_file():
+
+    with pytest.raises(Exception):
+        netman.read_touchstone_array(path_ntwk + 'exam_5.s4p')
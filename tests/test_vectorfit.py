@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+Tests of the vector fitting: a known rational model is recovered out of its
+sampled response.
+"""
+
+# needed packages
+import numpy as np
+import pytest
+
+import network_manipulations as netman
+
+
+@pytest.fixture
+def model():
+
+    rng = np.random.default_rng(0)
+    poles = 2 * np.pi * np.array([-0.1e9 + 1j * 1e9, -0.3e9 + 3e9j, -0.5e9 + 7e9j])
+    residues = 2 * np.pi * 1e8 * (rng.standard_normal((3, 2, 2)) + 1j * rng.standard_normal((3, 2, 2)))
+    # reciprocal network
+    residues = (residues + residues.transpose(0, 2, 1)) / 2
+
+    return {'poles': poles,
+            'residues': residues,
+            'd': np.array([[0.1, 0.0], [0.0, 0.1]]),
+            'f_range': np.array([1e7, 1e10])}
+
+
+def test_vector_fit_recovers_model(model):
+
+    f = np.linspace(1e7, 1e10, 1001)
+    SParams = netman.eval_model(model, f)
+
+    fitted = netman.vector_fit(SParams, NumPoles=6, n_iter=10)
+
+    np.testing.assert_allclose(np.sort_complex(fitted['poles']), np.sort_complex(model['poles']), rtol=1e-6)
+    np.testing.assert_allclose(netman.eval_model(fitted, f).s, SParams.s, atol=1e-8)
+    assert fitted['NMSERef'] < 1e-12
+    assert (fitted['poles'].real < 0).all()
+
+
+def test_eval_model_is_conjugate_symmetric(model):
+
+    f = np.linspace(1e7, 1e10, 11)
+
+    s_pos = netman.eval_model(model, f).s
+    s_neg = netman.eval_model(model, -f).s
+
+    np.testing.assert_allclose(s_neg, s_pos.conj(), rtol=1e-12)
+
+
+def test_save_load_model(tmp_path, model):
+
+    netman.save_model(model, tmp_path / 'model.npz')
+    loaded = netman.load_model(tmp_path / 'model.npz')
+
+    assert set(loaded) == set(model)
+    for key in model:
+        np.testing.assert_array_equal(loaded[key], model[key])
+
+
+def test_vector_fit_weight_keyword(model):
+
+    SParams = netman.eval_model(model, np.linspace(1e7, 1e10, 101))
+
+    with pytest.raises(ValueError):
+        netman.vector_fit(SParams, NumPoles=6, weight='log')
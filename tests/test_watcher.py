@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+last change: 17.10.2026
+Author(s): Christoph Maier
+
+Tests of the watch-folder mode: incremental passes and the results table.
+"""
+
+# needed packages
+import csv
+import os
+import shutil
+
+import network_manipulations as netman
+from conftest import path_ntwk
+
+
+def test_scan_processes_only_new_files(tmp_path):
+
+    shutil.copy(path_ntwk + 'exam_4.s2p', tmp_path)
+    watcher = netman.FolderWatcher(tmp_path, settle=0)
+
+    [processed, failed] = watcher.scan()
+    assert len(processed) == 1 and not failed
+
+    [processed, failed] = watcher.scan()
+    assert not processed and watcher.stats['skipped'] == 1
+
+
+def test_results_keep_metrics_of_later_passes(tmp_path):
+
+    # the first pass only has a 2-port, the mixed-mode loss of the 4-port in
+    # the second pass is a new column of the results table
+    shutil.copy(path_ntwk + 'exam_4.s2p', tmp_path)
+    watcher = netman.FolderWatcher(tmp_path, settle=0)
+    watcher.scan()
+    shutil.copy(path_ntwk + 'exam_1.s4p', tmp_path)
+    watcher.scan()
+
+    with open(watcher.results_file, 'r', newline='') as file:
+        rows = {row['file']: row for row in csv.DictReader(file)}
+
+    assert rows['exam_4.s2p']['IL_dd21_dB'] == ''
+    assert float(rows['exam_1.s4p']['IL_dd21_dB']) > 0
+    assert rows['exam_4.s2p']['NumPorts'] == '2'
+
+
+def test_touched_changed_and_removed_files(tmp_path):
+
+    shutil.copy(path_ntwk + 'exam_4.s2p', tmp_path / 'dut.s2p')
+    shutil.copy(path_ntwk + 'exam_6.s1p', tmp_path)
+    watcher = netman.FolderWatcher(tmp_path, settle=0)
+    watcher.scan()
+
+    # only touched: the content hash is the same
+    os.utime(tmp_path / 'dut.s2p', ns=(0, 10**18))
+    [processed, failed] = watcher.scan()
+    assert not processed and watcher.stats['skipped'] == 2
+
+    # overwritten with other data, the old file is removed
+    shutil.copy(path_ntwk + 'exam_5.s4p', tmp_path / 'dut.s2p')
+    os.remove(tmp_path / 'exam_6.s1p')
+    [processed, failed] = watcher.scan()
+    assert list(failed) == [str(tmp_path / 'dut.s2p')]
+    assert list(watcher.results()) == ['dut.s2p']
+
+    # the manifest is read again by a new watcher
+    watcher = netman.FolderWatcher(tmp_path, settle=0)
+    assert watcher.results()['dut.s2p']['error'] == failed[str(tmp_path / 'dut.s2p')]